@@ -0,0 +1,188 @@
+"""Vectorized scoring of technical answers against reference key points.
+
+Answers and the key points in ``questions.QUESTION_KEY_POINTS`` are turned
+into hashed word n-gram vectors (unigrams and bigrams, log-scaled term
+frequency, L2-normalized) in fixed-size NumPy arrays. A cohort is scored
+in batches: each batch of answers is compared against every key point in a
+single matrix product, the pairs that belong together are gathered and the
+similarities are reduced per answer with ``np.bincount``, so there is no
+per-answer Python loop over vectors.
+
+A key point counts as covered when its cosine similarity with the answer
+reaches ``coverage_threshold``; an answer's score is the mean over its key
+points of ``min(similarity / coverage_threshold, 1)``, between 0 and 1.
+Questions without reference key points (model-written or generic ones) are
+scored against the question text itself.
+"""
+
+import re
+import threading
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from questions import QUESTION_KEY_POINTS
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+(?:[.'][a-z0-9+#]+)*|==+|@")
+
+STOP_WORDS = frozenset("""
+a an and are as at be been but by can do does for from has have how i if in into is it its
+it's of on or so such than that the their them then there these they this to was we were
+what when where which while who why will with would you your
+""".split())
+
+
+@lru_cache(maxsize=1 << 16)
+def _stem(word: str) -> str:
+    # Light suffix stripping so "lists"/"list" and "indexes"/"index" share a feature
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith("es") and word[-3] in "sxz":
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed content words of a text"""
+    return [_stem(word) for word in _WORD_RE.findall(text.lower()) if word not in STOP_WORDS]
+
+
+@lru_cache(maxsize=1 << 18)
+def _bucket(feature: str, n_features: int) -> int:
+    # crc32 is stable across processes, unlike the salted built-in hash()
+    return zlib.crc32(feature.encode("utf-8")) % n_features
+
+
+class AnswerScorer:
+    """Scores answers against per-question reference key points"""
+
+    def __init__(self, key_points: Mapping[str, Sequence[str]] = QUESTION_KEY_POINTS,
+                 n_features: int = 1 << 12, coverage_threshold: float = 0.3, batch_size: int = 1024):
+        self.n_features = n_features
+        self.coverage_threshold = coverage_threshold
+        self.batch_size = batch_size
+
+        # All catalog key points in one matrix; each question maps to a row range
+        self._ranges: Dict[str, Tuple[int, int]] = {}
+        texts: List[str] = []
+        for question, points in key_points.items():
+            self._ranges[question] = (len(texts), len(texts) + len(points))
+            texts.extend(points)
+        self._reference = self.vectorize(texts)
+        # Vectors of questions outside the catalog, shared by scoring threads
+        self._fallback: Dict[str, np.ndarray] = {}
+        self._fallback_lock = threading.Lock()
+
+    def vectorize(self, texts: Sequence[str]) -> np.ndarray:
+        """Hashed n-gram vectors for texts, one L2-normalized float32 row each"""
+        rows: List[int] = []
+        cols: List[int] = []
+        n = self.n_features
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            rows.extend([row] * len(features))
+            cols.extend([_bucket(feature, n) for feature in features])
+
+        matrix = np.zeros((len(texts), n), dtype=np.float32)
+        np.add.at(matrix, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+        np.log1p(matrix, out=matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def _reference_rows(self, questions: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Reference matrix for a batch plus (answer index, reference row) pairs"""
+        extra_questions = list(dict.fromkeys(q for q in questions if q not in self._ranges))
+        extra_rows = {q: len(self._reference) + i for i, q in enumerate(extra_questions)}
+        if extra_questions:
+            # Copied out under the lock, so another thread clearing the cache cannot remove them
+            with self._fallback_lock:
+                vectors = {q: self._fallback.get(q) for q in extra_questions}
+            missing = [q for q, vector in vectors.items() if vector is None]
+            if missing:
+                vectors.update(zip(missing, self.vectorize(missing)))
+                with self._fallback_lock:
+                    if len(self._fallback) > 10000:
+                        self._fallback.clear()
+                    self._fallback.update((q, vectors[q]) for q in missing)
+            reference = np.vstack([self._reference] + [vectors[q][None, :] for q in extra_questions])
+        else:
+            reference = self._reference
+
+        answer_index: List[int] = []
+        reference_index: List[int] = []
+        for i, question in enumerate(questions):
+            start, stop = self._ranges.get(question) or (extra_rows[question], extra_rows[question] + 1)
+            answer_index.extend([i] * (stop - start))
+            reference_index.extend(range(start, stop))
+        return reference, np.asarray(answer_index, dtype=np.int64), np.asarray(reference_index, dtype=np.int64)
+
+    def score_batch(self, questions: Sequence[str], answers: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Score aligned question/answer lists
+
+        Returns ``(scores, covered, totals)`` arrays: the 0-1 score, the number
+        of key points covered and the number of key points for each answer.
+        """
+        scores = np.zeros(len(answers), dtype=np.float32)
+        covered = np.zeros(len(answers), dtype=np.int64)
+        totals = np.zeros(len(answers), dtype=np.int64)
+        for start in range(0, len(answers), self.batch_size):
+            stop = min(start + self.batch_size, len(answers))
+            vectors = self.vectorize(answers[start:stop])
+            reference, answer_index, reference_index = self._reference_rows(questions[start:stop])
+
+            # Cosine similarity of every answer against every key point in one product,
+            # then the pairs that belong together are picked out
+            similarity = (vectors @ reference.T)[answer_index, reference_index]
+            credit = np.minimum(similarity / self.coverage_threshold, 1.0)
+            count = np.bincount(answer_index, minlength=stop - start)
+            totals[start:stop] = count
+            covered[start:stop] = np.bincount(answer_index, weights=similarity >= self.coverage_threshold,
+                                              minlength=stop - start)
+            scores[start:stop] = np.bincount(answer_index, weights=credit, minlength=stop - start) / np.maximum(count, 1)
+        return scores, covered, totals
+
+    def score_histories(self, histories: Iterable[Sequence[Tuple[str, str]]]) -> List[Dict]:
+        """Score many conversation histories in one batch
+
+        Each history is a sequence of ``(question, answer)`` text pairs.
+        Returns one ``{"answer_scores": [...], "overall_score": float}`` dict
+        per history, with answer scores aligned to the history entries.
+        """
+        histories = [list(history) for history in histories]
+        questions: List[str] = []
+        answers: List[str] = []
+        for history in histories:
+            for question, answer in history:
+                questions.append(question)
+                answers.append(answer)
+        scores, covered, totals = self.score_batch(questions, answers)
+
+        results = []
+        offset = 0
+        for history in histories:
+            entries = [
+                {"score": round(float(scores[i]), 3), "key_points_covered": int(covered[i]),
+                 "key_points_total": int(totals[i])}
+                for i in range(offset, offset + len(history))
+            ]
+            offset += len(history)
+            overall = round(sum(e["score"] for e in entries) / len(entries), 3) if entries else 0.0
+            results.append({"answer_scores": entries, "overall_score": overall})
+        return results
+
+
+_default_scorer: Optional[AnswerScorer] = None
+
+
+def get_answer_scorer() -> AnswerScorer:
+    """Process-wide scorer over the catalog key points, built on first use"""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = AnswerScorer()
+    return _default_scorer
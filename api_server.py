@@ -0,0 +1,312 @@
+"""Asynchronous HTTP/WebSocket API for running screenings without Streamlit.
+
+Endpoints::
+
+    POST   /sessions                  start a screening, returns the greeting; an
+                                      X-TalentScout-Tenant header picks a configured
+                                      tenant whose model call rate limit it draws from
+    POST   /sessions/{id}/messages    {"text": ...} -> next reply
+    GET    /sessions/{id}/export      candidate data, as the Streamlit download
+    DELETE /sessions/{id}             discard a screening
+    GET    /sessions/{id}/ws          WebSocket chat, one JSON reply per message;
+                                      send {"text": ..., "stream": true} to receive
+                                      {"type": "chunk", "delta": ...} frames first
+    GET    /candidates?q=...&limit=N  search completed screenings, e.g.
+                                      q=postgresql AND (django OR fastapi), 3+ years, Berlin
+    GET    /health                    liveness and live session count
+    GET    /metrics                   Prometheus metrics (stage latency, funnel, failures)
+
+With ``--store`` sessions are also written behind to a durable store, and
+sessions evicted from memory or created before a restart are reloaded from
+it.
+With ``--event-log`` every step is also appended to an event log (see
+event_log.py), which restores sessions the store does not have.
+
+Run with ``python api_server.py --port 8080``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import threading
+import weakref
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from aiohttp import WSMsgType, web
+
+from candidate_index import CandidateIndex, QuerySyntaxError
+from engine import ConversationEngine, HiringAssistant, ScreeningSession
+from event_log import EVENT_LOG_ENV, EventLog
+from llm_questions import question_generator_from_env
+from metrics import CONTENT_TYPE, REGISTRY
+from llm_replies import reply_streamer_from_env
+from scheduler import Overloaded, get_scheduler
+from session_store import InMemorySessionStore, open_session_store
+
+ENGINE_KEY = web.AppKey("engine", ConversationEngine)
+STORE_KEY = web.AppKey("store", InMemorySessionStore)
+LOCKS_KEY = web.AppKey("session_locks", weakref.WeakValueDictionary)
+
+# Header naming the tenant whose model quota a new screening draws from;
+# only tenants configured on the scheduler are accepted
+TENANT_HEADER = "X-TalentScout-Tenant"
+
+
+def _session_payload(session: ScreeningSession, reply: str) -> Dict:
+    return {
+        "session_id": session.session_id,
+        "reply": reply,
+        "stage": session.current_stage,
+        "ended": session.conversation_ended,
+        "completed": session.current_stage == 9,
+    }
+
+
+def _lookup(request: web.Request) -> ScreeningSession:
+    session_id = request.match_info["session_id"]
+    session = request.app[STORE_KEY].get(session_id)
+    if session is None:
+        # Resume sessions persisted before a restart or by another replica
+        session = request.app[ENGINE_KEY].resume(session_id)
+        if session is not None:
+            request.app[STORE_KEY].put(session)
+    if session is None:
+        raise web.HTTPNotFound(text=json.dumps({"error": "unknown or expired session"}),
+                               content_type="application/json")
+    return session
+
+
+def _tenant(request: web.Request) -> Optional[str]:
+    tenant = request.headers.get(TENANT_HEADER)
+    if tenant is None:
+        return None
+    # Clients cannot name new tenants, or each new name would bring a fresh burst
+    scheduler = request.app[ENGINE_KEY].assistant.scheduler
+    if scheduler is None or not scheduler.knows_tenant(tenant):
+        raise web.HTTPBadRequest(text=json.dumps({"error": f"unknown tenant in {TENANT_HEADER} header"}),
+                                 content_type="application/json")
+    return tenant
+
+
+def _session_lock(app: web.Application, session_id: str) -> asyncio.Lock:
+    """Lock serializing the steps of one session, held while it runs off the loop"""
+    lock = app[LOCKS_KEY].get(session_id)
+    if lock is None:
+        lock = app[LOCKS_KEY][session_id] = asyncio.Lock()
+    return lock
+
+
+async def _step(app: web.Application, session: ScreeningSession, text: str) -> Tuple[ScreeningSession, str]:
+    """Run engine.step on the default executor
+
+    A step may wait on a model call (question generation at the tech stack
+    stage), so it never runs on the event loop itself.
+    """
+    async with _session_lock(app, session.session_id):
+        return await asyncio.get_running_loop().run_in_executor(None, app[ENGINE_KEY].step, session, text)
+
+
+async def start_session(request: web.Request) -> web.Response:
+    engine = request.app[ENGINE_KEY]
+    session, reply = await _step(request.app, engine.new_session(_tenant(request)), "")
+    request.app[STORE_KEY].put(session)
+    return web.json_response(_session_payload(session, reply), status=201)
+
+
+async def post_message(request: web.Request) -> web.Response:
+    session = _lookup(request)
+    try:
+        body = await request.json()
+        text = str(body["text"])
+    except (ValueError, KeyError, TypeError):
+        raise web.HTTPBadRequest(text=json.dumps({"error": 'expected {"text": ...}'}),
+                                 content_type="application/json")
+    session, reply = await _step(request.app, session, text)
+    return web.json_response(_session_payload(session, reply))
+
+
+async def export_session(request: web.Request) -> web.Response:
+    session = _lookup(request)
+    try:
+        # Scored on the scheduler as batch work, off the event loop and behind chat traffic
+        data = await asyncio.wrap_future(request.app[ENGINE_KEY].assistant.submit_export(session))
+    except Overloaded as exc:
+        raise web.HTTPServiceUnavailable(text=json.dumps({"error": str(exc)}), content_type="application/json",
+                                         headers={"Retry-After": "5"})
+    return web.json_response(data)
+
+
+async def delete_session(request: web.Request) -> web.Response:
+    session_id = request.match_info["session_id"]
+    request.app[STORE_KEY].delete(session_id)
+    if request.app[ENGINE_KEY].store is not None:
+        request.app[ENGINE_KEY].store.delete(session_id)
+    if request.app[ENGINE_KEY].candidate_index is not None:
+        request.app[ENGINE_KEY].candidate_index.remove(session_id)
+    if request.app[ENGINE_KEY].event_log is not None:
+        request.app[ENGINE_KEY].event_log.delete(session_id)
+    return web.Response(status=204)
+
+
+def _pull(chunks: Iterator[str], lock: threading.Lock) -> Optional[str]:
+    with lock:
+        return next(chunks, None)
+
+
+def _close(chunks: Iterator[str], lock: threading.Lock) -> None:
+    with lock:
+        chunks.close()
+
+
+async def _pull_chunks(chunks: Iterator[str]) -> AsyncIterator[str]:
+    """Yield a step_stream() generator's chunks, pulling each on the default executor
+
+    Chunks may come from a blocking model call, so pulling them off the loop
+    keeps it serving other candidates. When the consumer stops early (the
+    client went away), the generator is closed so no more model output is
+    requested; the lock defers that until a pull still running returns.
+    """
+    loop = asyncio.get_running_loop()
+    lock = threading.Lock()
+    finished = False
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, _pull, chunks, lock)
+            if chunk is None:
+                finished = True
+                return
+            yield chunk
+    finally:
+        if not finished:
+            loop.run_in_executor(None, _close, chunks, lock)
+
+
+async def _stream_reply(ws: web.WebSocketResponse, app: web.Application,
+                        session: ScreeningSession, text: str) -> str:
+    """Forward step_stream() chunks as they arrive and return the full reply"""
+    async with _session_lock(app, session.session_id):
+        parts = []
+        async with contextlib.aclosing(_pull_chunks(app[ENGINE_KEY].step_stream(session, text))) as chunks:
+            async for chunk in chunks:
+                parts.append(chunk)
+                await ws.send_json({"type": "chunk", "delta": chunk})
+        return "".join(parts)
+
+
+async def chat_socket(request: web.Request) -> web.WebSocketResponse:
+    session = _lookup(request)
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    async for message in ws:
+        if message.type != WSMsgType.TEXT:
+            continue
+        # Accept either raw text or {"text": ..., "stream": bool}
+        text, stream = message.data, False
+        with contextlib.suppress(ValueError, TypeError, KeyError, AttributeError):
+            body = json.loads(message.data)
+            text, stream = str(body["text"]), bool(body.get("stream"))
+
+        if stream:
+            reply = await _stream_reply(ws, request.app, session, text)
+            payload = dict(_session_payload(session, reply), type="done")
+        else:
+            session, reply = await _step(request.app, session, text)
+            payload = _session_payload(session, reply)
+        await ws.send_json(payload)
+        if session.conversation_ended:
+            break
+
+    await ws.close()
+    return ws
+
+
+async def search_candidates(request: web.Request) -> web.Response:
+    index = request.app[ENGINE_KEY].candidate_index
+    if index is None:
+        raise web.HTTPNotFound(text=json.dumps({"error": "candidate search is not enabled"}),
+                               content_type="application/json")
+    try:
+        limit = int(request.query.get("limit", 100))
+        result = index.search(request.query.get("q", ""), limit=max(limit, 0))
+    except (QuerySyntaxError, ValueError) as exc:
+        raise web.HTTPBadRequest(text=json.dumps({"error": str(exc)}), content_type="application/json")
+    return web.json_response({"count": result.count, "session_ids": result.session_ids})
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok", "sessions": len(request.app[STORE_KEY])})
+
+
+async def metrics(request: web.Request) -> web.Response:
+    return web.Response(body=REGISTRY.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+
+async def _evict_periodically(app: web.Application, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        app[STORE_KEY].evict_expired()
+
+
+def create_app(engine: Optional[ConversationEngine] = None, ttl_seconds: float = 1800.0,
+               eviction_interval: float = 30.0) -> web.Application:
+    """Build the aiohttp application around a shared engine and session store"""
+    app = web.Application()
+    app[ENGINE_KEY] = engine or ConversationEngine()
+    app[STORE_KEY] = InMemorySessionStore(ttl_seconds)
+    app[LOCKS_KEY] = weakref.WeakValueDictionary()
+
+    async def eviction_task(app: web.Application):
+        task = asyncio.create_task(_evict_periodically(app, eviction_interval))
+        yield
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+    async def close_store(app: web.Application):
+        yield
+        if app[ENGINE_KEY].store is not None:
+            app[ENGINE_KEY].store.close()
+        if app[ENGINE_KEY].event_log is not None:
+            app[ENGINE_KEY].event_log.close()
+
+    app.cleanup_ctx.append(eviction_task)
+    app.cleanup_ctx.append(close_store)
+    app.add_routes([
+        web.post("/sessions", start_session),
+        web.post("/sessions/{session_id}/messages", post_message),
+        web.get("/sessions/{session_id}/export", export_session),
+        web.delete("/sessions/{session_id}", delete_session),
+        web.get("/sessions/{session_id}/ws", chat_socket),
+        web.get("/candidates", search_candidates),
+        web.get("/health", health),
+        web.get("/metrics", metrics),
+    ])
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TalentScout screening API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--ttl", type=float, default=1800.0, help="idle seconds before a session is evicted")
+    parser.add_argument("--store", help="durable session store URL (sqlite:///path.db or file:///abs/dir)")
+    parser.add_argument("--event-log", default=os.environ.get(EVENT_LOG_ENV),
+                        help="directory of the append-only event log of every screening step")
+    args = parser.parse_args()
+    store = open_session_store(args.store) if args.store else None
+    engine = ConversationEngine(
+        HiringAssistant(question_generator=question_generator_from_env(), scheduler=get_scheduler()),
+        store=store,
+        reply_streamer=reply_streamer_from_env(),
+        # Screenings completed before this start are indexed from the durable store
+        candidate_index=CandidateIndex.from_store(store.backend) if store else CandidateIndex(),
+        event_log=EventLog(args.event_log) if args.event_log else None,
+    )
+    web.run_app(create_app(engine, ttl_seconds=args.ttl), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
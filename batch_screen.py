@@ -0,0 +1,193 @@
+"""Offline batch screening of imported candidate transcripts.
+
+Each input line is a JSON object describing one candidate, either as
+profile fields::
+
+    {"candidate_id": "c-1", "full_name": "Jane Doe", "email": "jane@example.com",
+     "phone": "+14155550123", "experience_years": "5 years",
+     "desired_positions": "Backend Engineer", "current_location": "Berlin",
+     "tech_stack": "Python, Django", "technical_answers": ["...", "..."]}
+
+or as a raw chat transcript: ``{"candidate_id": "c-2", "messages": ["Jane Doe", ...]}``.
+
+Records are replayed through the same ``HiringAssistant`` stage machine as
+the live app, in chunks spread over a process pool, and one JSON result per
+candidate is streamed out in input order::
+
+    python batch_screen.py candidates.jsonl results.jsonl --workers 8
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from engine import ConversationEngine, HiringAssistant, ScreeningSession, question_text
+from question_sampler import FrozenExposureStore, QuestionSampler
+
+# Profile fields in the order the stage machine asks for them
+PROFILE_FIELDS = ["full_name", "email", "phone", "experience_years",
+                  "desired_positions", "current_location", "tech_stack"]
+
+# Namespace of the session ids derived from candidate ids
+BATCH_NAMESPACE = uuid.UUID("0f6c3c59-5d4e-4f0a-9d7b-3b1f2a6f8e21")
+
+_engine: Optional[ConversationEngine] = None
+
+
+def batch_engine() -> ConversationEngine:
+    """Engine for replays: exposure balancing is off, so questions depend on the seed alone"""
+    sampler = QuestionSampler(exposure=FrozenExposureStore())
+    return ConversationEngine(HiringAssistant(question_sampler=sampler))
+
+
+def _init_worker() -> None:
+    global _engine
+    _engine = batch_engine()
+
+
+def replay_record(engine: ConversationEngine, record: Dict) -> Tuple[ScreeningSession, List[Dict]]:
+    """Replay one candidate record, returning the session and any rejected inputs
+
+    The session id, which seeds the question draw, is derived from the
+    record's ``candidate_id`` (or its content). With an engine from
+    ``batch_engine()`` a rerun therefore asks the same questions and gives
+    the same scores, whatever the worker count or chunking; only the
+    timestamps differ.
+    """
+    session = engine.new_session()
+    key = record.get("candidate_id")
+    key = str(key) if key is not None else json.dumps(record, sort_keys=True)
+    session.session_id = uuid.uuid5(BATCH_NAMESPACE, key).hex
+    session, _ = engine.step(session, "")
+    rejections = []
+
+    if "messages" in record:
+        for message in record["messages"]:
+            stage = session.current_stage
+            session, reply = engine.step(session, str(message))
+            if session.current_stage == stage and not session.conversation_ended and stage < 8:
+                rejections.append({"stage": stage, "input": message, "reply": reply})
+            if session.conversation_ended or session.current_stage == 9:
+                break
+    else:
+        answers = [record.get(name, "") for name in PROFILE_FIELDS] + list(record.get("technical_answers", []))
+        for name, value in itertools.zip_longest(PROFILE_FIELDS, answers):
+            stage = session.current_stage
+            session, reply = engine.step(session, str(value or ""))
+            if session.current_stage == stage and not session.conversation_ended and stage < 8:
+                # Field records cannot retry, so a rejected field ends the replay
+                rejections.append({"stage": stage, "field": name, "input": value, "reply": reply})
+                break
+            if session.conversation_ended or session.current_stage == 9:
+                break
+    return session, rejections
+
+
+def screen_result(engine: ConversationEngine, record: Dict, session: ScreeningSession,
+                  rejections: List[Dict], scores: Optional[Dict] = None) -> Dict:
+    """Screening result line for a replayed record"""
+    return {
+        "candidate_id": record.get("candidate_id"),
+        "session_id": session.session_id,
+        "completed": session.current_stage == 9,
+        "stage": session.current_stage,
+        "ended": session.conversation_ended,
+        "rejections": rejections,
+        "technical_questions": [question_text(question) for question in session.technical_questions],
+        "export": engine.assistant.export_candidate_data(session, scores),
+    }
+
+
+def screen_chunk(lines: List[str]) -> List[str]:
+    """Worker entry point: screen a chunk of raw JSONL lines
+
+    Answers of the whole chunk are scored in one batch.
+    """
+    replayed = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+            replayed.append((record, *replay_record(_engine, record)))
+        except (ValueError, TypeError, AttributeError) as exc:
+            replayed.append({"error": f"invalid record: {exc}", "input": line.rstrip("\n")[:200]})
+
+    sessions = [item[1] for item in replayed if isinstance(item, tuple)]
+    scores = iter(_engine.assistant.score_answers(sessions))
+    results = []
+    for item in replayed:
+        if isinstance(item, tuple):
+            item = screen_result(_engine, *item, scores=next(scores))
+        results.append(json.dumps(item, ensure_ascii=False))
+    return results
+
+
+def _chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk = []
+    for line in lines:
+        if line.strip():
+            chunk.append(line)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_batch(lines: Iterable[str], out, workers: int = 0, chunk_size: int = 256) -> int:
+    """Screen JSONL lines across a process pool, writing results in input order
+
+    At most a few chunks per worker are in flight, so memory stays bounded
+    however large the input is. Returns the number of records written.
+    """
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    pending: deque = deque()
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+        for chunk in _chunks(lines, chunk_size):
+            pending.append(pool.submit(screen_chunk, chunk))
+            if len(pending) >= workers * 4:
+                written += _drain_one(pending, out)
+        while pending:
+            written += _drain_one(pending, out)
+    return written
+
+
+def _drain_one(pending: deque, out) -> int:
+    results = pending.popleft().result()
+    out.write("\n".join(results))
+    out.write("\n")
+    return len(results)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay candidate transcripts through the screening flow")
+    parser.add_argument("input", help="JSONL file of candidate records, or - for stdin")
+    parser.add_argument("output", help="JSONL file for results, or - for stdout")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="records per work unit")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        count = run_batch(source, sink, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    elapsed = time.perf_counter() - start
+    print(f"Screened {count} candidates in {elapsed:.2f}s ({count / elapsed:,.0f}/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Answer scoring throughput: one batch per cohort versus one call per answer.
+
+Builds a synthetic cohort of completed histories over the template
+questions and scores it with ``AnswerScorer.score_histories`` in one call
+and with one call per answer::
+
+    python benchmarks/bench_answer_scoring.py --candidates 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from answer_scoring import AnswerScorer  # noqa: E402
+from questions import QUESTION_KEY_POINTS  # noqa: E402
+
+FILLER = "I have used this in production and think it works well in most cases".split()
+
+
+def make_cohort(candidates: int, seed: int = 7):
+    rng = random.Random(seed)
+    questions = list(QUESTION_KEY_POINTS)
+    cohort = []
+    for _ in range(candidates):
+        history = []
+        for question in rng.sample(questions, 5):
+            points = rng.sample(QUESTION_KEY_POINTS[question], rng.randint(0, 3))
+            words = " ".join(points).split() + rng.sample(FILLER, 6)
+            rng.shuffle(words)
+            history.append((question, " ".join(words)))
+        cohort.append(history)
+    return cohort
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=2000)
+    args = parser.parse_args()
+
+    cohort = make_cohort(args.candidates)
+    answers = sum(len(history) for history in cohort)
+    scorer = AnswerScorer()
+    scorer.score_histories(cohort[:10])
+
+    start = time.perf_counter()
+    batched = scorer.score_histories(cohort)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single = [[scorer.score_histories([[entry]])[0]["answer_scores"][0] for entry in history] for history in cohort]
+    single_time = time.perf_counter() - start
+
+    assert [r["answer_scores"] for r in batched] == single
+    print(f"answers: {answers}")
+    print(f"batched     {batch_time:.3f}s  {answers / batch_time:,.0f} answers/s")
+    print(f"per answer  {single_time:.3f}s  {answers / single_time:,.0f} answers/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
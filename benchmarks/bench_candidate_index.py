@@ -0,0 +1,69 @@
+"""Candidate index build and query latency at scale.
+
+Indexes synthetic candidates with random stacks, experience and locations,
+then times recruiter queries against the bitset index::
+
+    python benchmarks/bench_candidate_index.py --candidates 1000000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from candidate_index import CandidateIndex  # noqa: E402
+
+STACKS = ["Python, Django, PostgreSQL", "Python, FastAPI, Postgres", "Java, Spring Boot, MySQL",
+          "React, Node.js, MongoDB", "Python, pandas, NumPy, scikit-learn", "Go, Kubernetes, AWS",
+          "JavaScript, Vue.js, Redis", "Django, React, PostgreSQL, Docker", "R, statistics, SQL"]
+EXPERIENCE = ["1 year", "2 years", "3", "4 yrs", "5 years", "6-8 years", "10+", "18 months", "fresher"]
+LOCATIONS = ["Berlin, Germany", "Munich, Germany", "London, UK", "New York, USA", "Bangalore, India",
+             "Berlin", "Toronto, Canada", "Remote"]
+
+QUERIES = [
+    "postgresql AND (django OR fastapi), 3+ years, Berlin",
+    "python, category:data_science",
+    "java OR go, 5+ years",
+    "react AND NOT mongodb, <2 years",
+    "kubernetes, Germany",
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    index = CandidateIndex()
+    start = time.perf_counter()
+    for i in range(args.candidates):
+        index.add(f"s{i}", {"tech_stack": rng.choice(STACKS), "experience_years": rng.choice(EXPERIENCE),
+                            "current_location": rng.choice(LOCATIONS)})
+    index.compact()
+    print(f"indexed {len(index):,} candidates in {time.perf_counter() - start:.1f}s")
+
+    for query in QUERIES:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = index.search(query, limit=50)
+            timings.append(time.perf_counter() - start)
+        print(f"{statistics.median(timings) * 1000:7.2f} ms  {result.count:>9,}  {query}")
+
+    start = time.perf_counter()
+    index.add("late", {"tech_stack": "PostgreSQL, Django", "experience_years": "4 years",
+                       "current_location": "Berlin"})
+    found = "late" in index.search(QUERIES[0], limit=args.candidates).session_ids
+    print(f"incremental add + query: {(time.perf_counter() - start) * 1000:.2f} ms, found={found}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Headless throughput of the screening engine.
+
+Drives complete screenings through ``ConversationEngine.step`` without
+Streamlit and reports sessions and steps per second::
+
+    python benchmarks/bench_engine.py --sessions 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import ConversationEngine  # noqa: E402
+
+SCRIPTED_ANSWERS = [
+    "",
+    "Jane Doe",
+    "jane@example.com",
+    "+14155550123",
+    "5 years",
+    "Software Developer",
+    "Berlin, Germany",
+    "Python, Django, PostgreSQL, AWS",
+] + [f"Answer number {i} to the technical question." for i in range(5)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=2000, help="number of complete screenings")
+    args = parser.parse_args()
+
+    engine = ConversationEngine()
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(args.sessions):
+        session = engine.new_session()
+        for text in SCRIPTED_ANSWERS:
+            session, _ = engine.step(session, text)
+            steps += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"sessions: {args.sessions}  steps: {steps}  elapsed: {elapsed:.2f}s")
+    print(f"{args.sessions / elapsed:,.0f} sessions/s  {steps / elapsed:,.0f} steps/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
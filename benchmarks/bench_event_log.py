@@ -0,0 +1,81 @@
+"""Benchmark the screening event log.
+
+Runs synthetic screenings through ``ConversationEngine`` with and without an
+event log, then times restoring in-progress sessions and streaming the whole
+log back with ``replay``::
+
+    python benchmarks/bench_event_log.py --sessions 20000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import ConversationEngine  # noqa: E402
+from event_log import EventLog, replay  # noqa: E402
+
+INTRO = ["", "Jane Doe", "jane@example.com", "+1 415 555 0123", "5 years", "Backend Engineer",
+         "Berlin, Germany", "Python, Django, PostgreSQL"]
+
+
+def run_screenings(engine: ConversationEngine, count: int, seed: int = 7):
+    """Drive ``count`` screenings, leaving about a third of them unfinished"""
+    rng = random.Random(seed)
+    sessions, steps = [], 0
+    for _ in range(count):
+        session = engine.new_session()
+        answers = rng.randint(0, 8) if rng.random() < 0.33 else 20
+        for text in INTRO + [f"My answer covers the trade-offs in detail, case {n}." for n in range(answers)]:
+            if session.current_stage == 9:
+                break
+            engine.step(session, text)
+            steps += 1
+        sessions.append(session)
+    return sessions, steps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    _, steps = run_screenings(ConversationEngine(), args.sessions)
+    baseline = time.perf_counter() - start
+    print(f"no log       {steps / baseline:>10,.0f} steps/s")
+
+    directory = tempfile.mkdtemp(prefix="talentscout-events-")
+    try:
+        log = EventLog(directory, segment_bytes=8 << 20)
+        start = time.perf_counter()
+        sessions, steps = run_screenings(ConversationEngine(event_log=log), args.sessions)
+        log.flush()
+        logged = time.perf_counter() - start
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"event log    {steps / logged:>10,.0f} steps/s  "
+              f"(+{(logged - baseline) / steps * 1e6:.1f} us/step, {size / 1e6:.1f} MB)")
+
+        open_ids = [session.session_id for session in sessions if session.current_stage != 9]
+        start = time.perf_counter()
+        for session_id in open_ids:
+            log.restore(session_id)
+        elapsed = time.perf_counter() - start
+        print(f"restore      {elapsed / len(open_ids) * 1e6:>10.0f} us/session  ({len(open_ids)} in progress)")
+        log.close()
+
+        start = time.perf_counter()
+        replayed = sum(1 for _ in replay(directory))
+        elapsed = time.perf_counter() - start
+        print(f"replay       {replayed / elapsed:>10,.0f} sessions/s  ({steps / elapsed:,.0f} steps/s)")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Accuracy and speed of exit-intent detection.
+
+Replays a corpus of real candidate answers (``data/exit_intent_corpus.tsv``)
+through the compiled matcher, reports any misclassification, and times it
+against the original substring scan::
+
+    python benchmarks/bench_exit_intent.py
+"""
+
+import os
+import sys
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from exit_intent import DEFAULT_EXIT_MATCHER, DEFAULT_EXIT_PHRASES  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "exit_intent_corpus.tsv")
+
+
+def substring_exit(text: str) -> bool:
+    """The original check: any exit keyword as a substring"""
+    lowered = text.lower().strip()
+    return any(keyword in lowered for keyword in DEFAULT_EXIT_PHRASES)
+
+
+def load_corpus():
+    with open(CORPUS, encoding="utf-8") as handle:
+        for line in handle:
+            if line.startswith("#") or not line.strip():
+                continue
+            stage, expected, text = line.rstrip("\n").split("\t", 2)
+            yield int(stage), expected == "1", text
+
+
+def main() -> int:
+    corpus = list(load_corpus())
+    errors = [(stage, expected, text) for stage, expected, text in corpus
+              if DEFAULT_EXIT_MATCHER.matches(text, stage) != expected]
+    legacy_errors = sum(substring_exit(text) != expected for _, expected, text in corpus)
+
+    for stage, expected, text in errors:
+        print(f"MISCLASSIFIED stage={stage} expected_exit={expected}: {text}")
+    print(f"corpus: {len(corpus)} messages  errors: {len(errors)}  (substring scan: {legacy_errors})")
+
+    rounds = 200
+    compiled = timeit.timeit(lambda: [DEFAULT_EXIT_MATCHER.matches(t, s) for s, _, t in corpus], number=rounds)
+    legacy = timeit.timeit(lambda: [substring_exit(t) for _, _, t in corpus], number=rounds)
+    per_message = 1e6 / (rounds * len(corpus))
+    print(f"us/message  compiled {compiled * per_message:.2f}  substring {legacy * per_message:.2f}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""Cache and request-coalescing behaviour of LLM question generation.
+
+Starts the stub model server in-process, fires many concurrent requests for
+a handful of equivalent tech stacks and reports how many actually reached
+the model, plus cold and warm latency::
+
+    python benchmarks/bench_llm_questions.py --requests 500 --delay 0.3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "tools"))
+
+from llm_questions import LLMQuestionGenerator  # noqa: E402
+from stub_llm_server import serve  # noqa: E402
+
+# Spellings of the same two stacks; each group should cost one model call
+STACKS = [
+    "Python, Django, PostgreSQL",
+    "postgres; django | python",
+    "PYTHON, django, PostgreSQL",
+    "React, Node.js, MongoDB",
+    "reactjs, node, mongo",
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--delay", type=float, default=0.3, help="stub model latency in seconds")
+    args = parser.parse_args()
+
+    server = serve(port=0, delay=args.delay)
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    import openai
+
+    client = openai.OpenAI(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+    generator = LLMQuestionGenerator(client=client)
+
+    def timed(stack: str) -> float:
+        start = time.perf_counter()
+        generator.generate(stack)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(args.threads) as pool:
+        cold = list(pool.map(timed, (STACKS[i % len(STACKS)] for i in range(args.requests))))
+    warm = [timed(STACKS[i % len(STACKS)]) for i in range(args.requests)]
+    server.shutdown()
+
+    print(f"requests: {args.requests * 2}  distinct stacks: 2  model calls: {generator.model_calls}")
+    print(f"cold (concurrent) ms  mean {statistics.mean(cold) * 1000:.1f}  max {max(cold) * 1000:.1f}")
+    print(f"warm (cached) us      mean {statistics.mean(warm) * 1e6:.1f}")
+    return 0 if generator.model_calls == 2 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Benchmark normalizing candidate records in batch.
+
+Checks ``parse_experience`` against known answers, then generates
+synthetic bulk-export records whose free-text fields repeat the way real
+ones do (a few hundred distinct experience and location spellings) and
+times ``normalize_file`` over them under each PII mode::
+
+    python benchmarks/bench_normalization.py --records 100000
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalization import PII_MODES, Normalizer, PIIPolicy, normalize_file, parse_experience  # noqa: E402
+
+EXPERIENCE = ["{} years", "{}+ yrs", "{}-{} years", "around {} years", "{} months", "fresher", "since 20{:02d}"]
+
+_YEAR = date.today().year
+# Experience text and the (low, high) years it should parse to
+EXPERIENCE_CASES = [
+    ("5 years", (5.0, 5.0)), ("3-5 yrs", (3.0, 5.0)), ("10+", (10.0, 10.0)),
+    ("eighteen months", (1.5, 1.5)), ("fresher", (0.0, 0.0)), ("2015", None),
+    ("since 2015", (_YEAR - 2015.0,) * 2), ("Since March 2015", (_YEAR - 2015.0,) * 2),
+    ("2018 - present", (_YEAR - 2018.0,) * 2), ("2015-2020", (5.0, 5.0)),
+    ("5 years, until end of 2020", (5.0, 5.0)), ("worked 4 years since 2019", (4.0, 4.0)),
+]
+CITIES = ["berlin", "new york", "nyc", "san francisco", "bangalore", "london", "São Paulo", "austin"]
+COUNTRIES = ["germany", "usa", "us", "india", "uk", "brasil", "United States"]
+
+
+def synthetic_records(count: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        low = rng.randint(0, 15)
+        info = {
+            "full_name": f"Candidate {i}",
+            "email": f"candidate{i}@Example.com",
+            "phone": f"({rng.randint(200, 999)}) 555-{rng.randint(0, 9999):04d}",
+            "experience_years": rng.choice(EXPERIENCE).format(low, low + rng.randint(1, 4)),
+            "desired_positions": "Backend Engineer",
+            "current_location": f"{rng.choice(CITIES)},  {rng.choice(COUNTRIES)}",
+            "tech_stack": "Python, Django",
+            "session_start": "2024-01-01 12:00:00",
+        }
+        qa = [{"question": "Explain Python decorators.",
+               "answer": "Wrappers around functions; reach me at +1 415 555 0123.",
+               "timestamp": "2024-01-01 12:05:00"}] * 3
+        lines.append(json.dumps({"session_id": str(i), "candidate_info": info, "technical_qa": qa}))
+    return "\n".join(lines) + "\n"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    errors = [(text, expected, parse_experience(text)) for text, expected in EXPERIENCE_CASES
+              if parse_experience(text) != expected]
+    for text, expected, parsed in errors:
+        print(f"MISPARSED {text!r}: expected {expected}, got {parsed}")
+    print(f"experience cases: {len(EXPERIENCE_CASES)}  errors: {len(errors)}")
+
+    data = synthetic_records(args.records)
+    print(f"{'pii':>8} {'records/s':>12} {'us/record':>10}")
+    for mode in PII_MODES:
+        normalizer = Normalizer(PIIPolicy(mode, b"benchmark-key" if mode == "hash" else None))
+        start = time.perf_counter()
+        normalize_file(io.StringIO(data), io.StringIO(), normalizer)
+        elapsed = time.perf_counter() - start
+        print(f"{mode:>8} {args.records / elapsed:>12,.0f} {elapsed / args.records * 1e6:>10.1f}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""Benchmark question sampling as the question bank grows.
+
+Builds synthetic banks with 10 to 100k questions per technology and times
+``QuestionSampler.sample`` for a four-technology plan, with the in-memory
+and SQLite exposure stores. Selection cost should stay flat as the bank
+grows, since each candidate only draws O(k) questions::
+
+    python benchmarks/bench_question_sampler.py --candidates 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QuestionBank  # noqa: E402
+from question_sampler import InMemoryExposureStore, QuestionSampler, SQLiteExposureStore  # noqa: E402
+from role_profiles import RoleProfiles  # noqa: E402
+
+TECHS = ["python", "django", "postgresql", "aws"]
+
+
+def synthetic_bank(per_tech: int) -> QuestionBank:
+    return QuestionBank.from_templates(
+        {tech: [f"{tech} question {i}: explain topic {i} in depth." for i in range(per_tech)] for tech in TECHS}
+    )
+
+
+def run(per_tech: int, store_name: str, candidates: int, directory: str) -> float:
+    bank = synthetic_bank(per_tech)
+    plan = RoleProfiles(bank=bank).plan("general", tuple(sorted(TECHS)), "mid")
+    store = (InMemoryExposureStore() if store_name == "memory"
+             else SQLiteExposureStore(os.path.join(directory, f"exposure-{per_tech}.db")))
+    sampler = QuestionSampler(bank=bank, exposure=store)
+    start = time.perf_counter()
+    for seed in range(candidates):
+        sampler.sample(plan, seed)
+    elapsed = time.perf_counter() - start
+    store.close()
+    return elapsed / candidates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'questions/tech':>15} {'store':>8} {'us/candidate':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for per_tech in (10, 1_000, 100_000):
+            for store_name in ("memory", "sqlite"):
+                seconds = run(per_tech, store_name, args.candidates, directory)
+                print(f"{per_tech:>15} {store_name:>8} {seconds * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Bytes sent to the browser per rerun as the Q&A history grows.
+
+Builds the markdown ForwardMsgs the chat page emits on a rerun, for the
+legacy three-calls-per-message rendering and for the pre-rendered message
+blocks, and runs them through Streamlit's message-cache logic with the
+browser holding everything from earlier reruns::
+
+    python benchmarks/bench_render_bytes.py --max-history 30
+"""
+
+import argparse
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from streamlit import config  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.runtime.forward_msg_cache import create_reference_msg, populate_hash_if_needed  # noqa: E402
+
+from chat_render import render_chat_message  # noqa: E402
+
+QUESTION = "Explain the difference between list and tuple in Python and when you would use each."
+ANSWER = ("Lists are mutable sequences, so you can append or change items in place; tuples are "
+          "immutable, hashable when their items are, and a good fit for fixed records or dict keys. "
+          "I use tuples for return values and lists for collections that grow.")
+
+DEFAULT_MIN_CACHED = 10 * 1000
+
+
+def legacy_bodies(history: int):
+    for i in range(history):
+        yield '<div class="chat-message bot-message">'
+        yield f"**🤖 Question {i+1}:** {QUESTION}"
+        yield "</div>"
+        yield '<div class="chat-message user-message">'
+        yield f"**👤 Your Answer:** {ANSWER} ({i})"
+        yield "</div>"
+
+
+def fragment_bodies(history: int):
+    for i in range(history):
+        yield render_chat_message("bot", f"🤖 Question {i+1}:", QUESTION)
+        yield render_chat_message("user", "👤 Your Answer:", f"{ANSWER} ({i})")
+
+
+def sent_bytes(bodies, browser_cache: set) -> int:
+    """Serialized size of one rerun's messages given what the browser already caches"""
+    total = 0
+    for body in bodies:
+        msg = ForwardMsg()
+        msg.delta.new_element.markdown.body = body
+        msg.delta.new_element.markdown.allow_html = True
+        populate_hash_if_needed(msg)
+        if msg.metadata.cacheable:
+            if msg.hash in browser_cache:
+                msg = create_reference_msg(msg)
+            else:
+                browser_cache.add(msg.hash)
+        total += msg.ByteSize()
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-history", type=int, default=30)
+    args = parser.parse_args()
+
+    config.get_config_options(force_reparse=True)
+    min_cached = int(config.get_option("global.minCachedMessageSize"))
+
+    legacy_cache: set = set()
+    fragment_cache: set = set()
+    print(f"minCachedMessageSize: legacy {DEFAULT_MIN_CACHED}  fragments {min_cached}")
+    print(f"{'history':>8} {'legacy bytes':>13} {'fragment bytes':>15}")
+    for history in range(1, args.max_history + 1):
+        config.set_option("global.minCachedMessageSize", DEFAULT_MIN_CACHED)
+        legacy = sent_bytes(legacy_bodies(history), legacy_cache)
+        config.set_option("global.minCachedMessageSize", min_cached)
+        fragments = sent_bytes(fragment_bodies(history), fragment_cache)
+        if history in (1, 2, 5, 10, 20) or history == args.max_history:
+            print(f"{history:>8} {legacy:>13} {fragments:>15}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Per-rerun CPU cost of the Streamlit app across many interleaved sessions.
+
+Each simulated session is an independent ``AppTest`` driven through the
+screening flow. Sessions take turns, so shared process-wide caches are
+exercised the way concurrent users exercise them on a single replica.
+
+Compare two revisions by pointing ``--app`` at an exported copy::
+
+    git show <rev>:app.py > /tmp/app_before.py
+    python benchmarks/bench_rerun.py --app /tmp/app_before.py
+    python benchmarks/bench_rerun.py
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTED_ANSWERS = [
+    "Jane Doe",
+    "jane@example.com",
+    "+14155550123",
+    "5 years",
+    "Software Developer",
+    "Berlin, Germany",
+    "Python, Django, PostgreSQL, AWS",
+    "Tuples are immutable, lists are mutable.",
+    "A decorator wraps a function to add behaviour around it.",
+]
+
+
+def timed_run(app: AppTest, samples: list) -> None:
+    """Run one rerun and record its CPU time in milliseconds"""
+    start = time.process_time()
+    app.run()
+    samples.append((time.process_time() - start) * 1000)
+
+
+def send(app: AppTest, text: str, samples: list) -> None:
+    """Type an answer and press Send, recording both reruns it triggers"""
+    app.text_input[0].set_value(text)
+    timed_run(app, samples)
+    app.button[0].click()
+    timed_run(app, samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(REPO_ROOT, "app.py"), help="app script to benchmark")
+    parser.add_argument("--sessions", type=int, default=20, help="number of interleaved sessions")
+    parser.add_argument("--turns", type=int, default=len(SCRIPTED_ANSWERS), help="answers per session")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    apps = [AppTest.from_file(args.app, default_timeout=30) for _ in range(args.sessions)]
+    samples: list = []
+
+    for app in apps:
+        timed_run(app, samples)
+    for turn in range(args.turns):
+        for app in apps:
+            if app.text_input:
+                send(app, SCRIPTED_ANSWERS[turn % len(SCRIPTED_ANSWERS)], samples)
+
+    samples.sort()
+    print(f"app: {args.app}")
+    print(f"sessions: {args.sessions}  reruns: {len(samples)}")
+    print(f"cpu ms/rerun  mean {statistics.mean(samples):.2f}  "
+          f"p50 {samples[len(samples) // 2]:.2f}  p99 {samples[int(len(samples) * 0.99)]:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
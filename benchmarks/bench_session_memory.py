@@ -0,0 +1,118 @@
+"""Bytes per live session for compact and legacy session records.
+
+Holds ``--sessions`` completed screenings in memory, once with the slotted
+``CandidateInfo``/``AnswerRecord`` representation and once with the former
+layout (plain dataclass, per-answer dicts with formatted timestamps and
+decoded question text), and reports allocated bytes per session::
+
+    python benchmarks/bench_session_memory.py --sessions 100000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from engine import ConversationEngine, format_timestamp, question_text  # noqa: E402
+
+PROFILE = ["", "Jane Doe", "jane.doe@example.com", "+14155550123", "5 years",
+           "Software Developer", "Berlin, Germany", "Python, Django, SQL"]
+
+
+@dataclass
+class LegacyCandidateInfo:
+    full_name: str = ""
+    email: str = ""
+    phone: str = ""
+    experience_years: str = ""
+    desired_positions: str = ""
+    current_location: str = ""
+    tech_stack: str = ""
+    session_start: str = ""
+
+
+@dataclass
+class LegacySession:
+    candidate_info: LegacyCandidateInfo
+    conversation_history: List[Dict[str, str]] = field(default_factory=list)
+    current_stage: int = 0
+    technical_questions: List[str] = field(default_factory=list)
+    current_question_index: int = 0
+    conversation_ended: bool = False
+    session_id: str = ""
+
+
+def answer(i: int, k: int) -> str:
+    return f"Candidate {i} answer {k}: I would start by measuring, then fix the slowest part first."
+
+
+def compact_sessions(engine: ConversationEngine, count: int) -> list:
+    sessions = []
+    for i in range(count):
+        session = engine.new_session()
+        for text in PROFILE:
+            engine.step(session, "".join(text))
+        k = 0
+        while session.current_stage == 8:
+            engine.step(session, answer(i, k))
+            k += 1
+        sessions.append(session)
+    return sessions
+
+
+def legacy_sessions(template, count: int) -> list:
+    sessions = []
+    for i in range(count):
+        info = LegacyCandidateInfo(*("".join(text) for text in PROFILE[1:]),
+                                   session_start=format_timestamp(template.candidate_info.session_start))
+        sessions.append(LegacySession(
+            candidate_info=info,
+            conversation_history=[
+                {"question": question_text(record.question), "answer": answer(i, k),
+                 "timestamp": format_timestamp(record.answered_at)}
+                for k, record in enumerate(template.conversation_history)
+            ],
+            current_stage=9,
+            technical_questions=[question_text(q) for q in template.technical_questions],
+            current_question_index=len(template.technical_questions),
+            session_id=template.session_id[:31] + str(i % 10),
+        ))
+    return sessions
+
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del sessions
+    return used
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100000)
+    args = parser.parse_args()
+
+    engine = ConversationEngine()
+    template = compact_sessions(engine, 1)[0]
+    compact = measure(lambda: compact_sessions(engine, args.sessions))
+    legacy = measure(lambda: legacy_sessions(template, args.sessions))
+
+    print(f"sessions: {args.sessions:,} (completed, {len(template.conversation_history)} answers each)")
+    print(f"legacy   {legacy / args.sessions:8.0f} bytes/session  {legacy / 2**20:7.1f} MiB total")
+    print(f"compact  {compact / args.sessions:8.0f} bytes/session  {compact / 2**20:7.1f} MiB total")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
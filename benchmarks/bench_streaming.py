@@ -0,0 +1,64 @@
+"""Time-to-first-token versus full-reply latency for streamed replies.
+
+Runs technical answers through ``ConversationEngine.step_stream`` against
+the stub model server with per-token delay and compares when the first
+chunk arrives with when the complete reply is available::
+
+    python benchmarks/bench_streaming.py --answers 20 --token-delay 0.03
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, "tools"))
+
+from engine import ConversationEngine  # noqa: E402
+from llm_replies import LLMReplyStreamer  # noqa: E402
+from stub_llm_server import serve  # noqa: E402
+
+PROFILE = ["", "Jane Doe", "jane@example.com", "+14155550123", "5 years",
+           "Software Developer", "Berlin, Germany", "Python, Django, PostgreSQL"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=20, help="technical answers to time")
+    parser.add_argument("--delay", type=float, default=0.2, help="stub latency before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.03, help="stub delay between tokens")
+    args = parser.parse_args()
+
+    server = serve(port=0, delay=args.delay, token_delay=args.token_delay)
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    import openai
+
+    client = openai.OpenAI(base_url=f"http://127.0.0.1:{server.server_port}/v1")
+    engine = ConversationEngine(reply_streamer=LLMReplyStreamer(client=client))
+
+    first, full = [], []
+    while len(full) < args.answers:
+        session = engine.new_session()
+        for text in PROFILE:
+            engine.step(session, text)
+        while session.current_stage == 8 and len(full) < args.answers:
+            start = time.perf_counter()
+            chunks = engine.step_stream(session, "A reasonably detailed answer.")
+            next(chunks)
+            first.append(time.perf_counter() - start)
+            for _ in chunks:
+                pass
+            full.append(time.perf_counter() - start)
+    server.shutdown()
+
+    print(f"answers: {len(full)}")
+    print(f"time to first chunk ms  mean {statistics.mean(first) * 1000:.1f}  max {max(first) * 1000:.1f}")
+    print(f"time to full reply ms   mean {statistics.mean(full) * 1000:.1f}  max {max(full) * 1000:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Load generator for the screening API server.
+
+Runs many concurrent candidates through complete screenings against a
+running ``api_server.py`` and reports per-step latency percentiles::
+
+    python api_server.py --port 8080 &
+    python benchmarks/load_api.py --url http://127.0.0.1:8080 --sessions 2000 --concurrency 500
+    python benchmarks/load_api.py --ws ...   # drive the chat over WebSockets instead
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import aiohttp
+
+SCRIPTED_ANSWERS = [
+    "Jane Doe",
+    "jane@example.com",
+    "+14155550123",
+    "5 years",
+    "Software Developer",
+    "Berlin, Germany",
+    "Python, Django, PostgreSQL, AWS",
+] + [f"Answer number {i} to the technical question." for i in range(5)]
+
+
+async def run_http(client: aiohttp.ClientSession, url: str, latencies: list) -> None:
+    start = time.perf_counter()
+    async with client.post(f"{url}/sessions") as response:
+        session_id = (await response.json())["session_id"]
+    latencies.append(time.perf_counter() - start)
+
+    for text in SCRIPTED_ANSWERS:
+        start = time.perf_counter()
+        async with client.post(f"{url}/sessions/{session_id}/messages", json={"text": text}) as response:
+            reply = await response.json()
+        latencies.append(time.perf_counter() - start)
+        if reply["completed"] or reply["ended"]:
+            break
+
+
+async def run_ws(client: aiohttp.ClientSession, url: str, latencies: list) -> None:
+    async with client.post(f"{url}/sessions") as response:
+        session_id = (await response.json())["session_id"]
+
+    async with client.ws_connect(f"{url}/sessions/{session_id}/ws") as ws:
+        for text in SCRIPTED_ANSWERS:
+            start = time.perf_counter()
+            await ws.send_json({"text": text})
+            reply = await ws.receive_json()
+            latencies.append(time.perf_counter() - start)
+            if reply["completed"] or reply["ended"]:
+                break
+
+
+def percentile(samples: list, fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+async def main_async(args) -> None:
+    latencies: list = []
+    limit = asyncio.Semaphore(args.concurrency)
+    runner = run_ws if args.ws else run_http
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+
+    async with aiohttp.ClientSession(connector=connector) as client:
+        async def one_candidate():
+            async with limit:
+                await runner(client, args.url, latencies)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_candidate() for _ in range(args.sessions)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"transport: {'websocket' if args.ws else 'http'}  sessions: {args.sessions}  "
+          f"concurrency: {args.concurrency}")
+    print(f"steps: {len(latencies)}  elapsed: {elapsed:.2f}s  {len(latencies) / elapsed:,.0f} steps/s")
+    print(f"latency ms  p50 {percentile(latencies, 0.50) * 1000:.2f}  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f}  max {latencies[-1] * 1000:.2f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--sessions", type=int, default=1000, help="candidates to screen")
+    parser.add_argument("--concurrency", type=int, default=200, help="candidates in flight at once")
+    parser.add_argument("--ws", action="store_true", help="chat over WebSockets instead of REST")
+    asyncio.run(main_async(parser.parse_args()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Micro-benchmark suite for the hiring assistant hot paths, with baselines.
+
+Each benchmark times one operation with calibrated repeats (best of
+``--repeat`` runs, like ``timeit``), compares it with the recorded
+baseline and exits non-zero when any benchmark is slower than the baseline
+by more than ``--threshold``::
+
+    python benchmarks/regression.py                  # compare with baseline.json
+    python benchmarks/regression.py -k exit          # only matching benchmarks
+    python benchmarks/regression.py --save-baseline  # record new baselines
+
+Baselines are machine specific. Record them on the machine that runs the
+comparison, and commit ``benchmarks/baseline.json`` updates alongside
+intentional performance changes so they show up in review.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from engine import HiringAssistant, ScreeningSession  # noqa: E402
+from questions import QUESTION_TEMPLATES, TECH_CATEGORIES  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# name -> setup function returning the operation to time
+BENCHMARKS: Dict[str, Callable[[], Callable[[], None]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup: Callable[[], Callable[[], None]]):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def synthetic_stacks(length: int, count: int = 50, seed: int = 11) -> List[str]:
+    """Comma-separated tech stacks of ``length`` entries, mixing known and unknown names"""
+    rng = random.Random(seed + length)
+    known = list(QUESTION_TEMPLATES) + [tech for techs in TECH_CATEGORIES.values() for tech in techs]
+    unknown = ["in-house tooling", "Excel", "Jira", "our own ORM", "Bash", "Figma"]
+    return [", ".join(rng.choice(known if rng.random() < 0.8 else unknown) for _ in range(length))
+            for _ in range(count)]
+
+
+def _cycle(assistant_call, inputs):
+    def run():
+        for item in inputs:
+            assistant_call(item)
+    run.per_call = len(inputs)
+    return run
+
+
+for _length in (1, 4, 16):
+    @benchmark(f"generate_technical_questions[{_length} techs]")
+    def _questions(length=_length):
+        return _cycle(HiringAssistant().generate_technical_questions, synthetic_stacks(length))
+
+
+@benchmark("validate_email")
+def _email():
+    emails = ["jane.doe@example.com", "j@x.io", "first.last+tag@sub.domain.co.uk", "not-an-email",
+              "missing@tld", "@example.com", "spaces in@example.com", "UPPER@EXAMPLE.COM"]
+    return _cycle(HiringAssistant().validate_email, emails)
+
+
+@benchmark("validate_phone")
+def _phone():
+    phones = ["+14155550123", "(415) 555-0123", "+44 20 7946 0958", "12345", "+91-98765-43210",
+              "phone: unknown", "0044 20 7946 0958", "+1 (415) 555-0123 ext 9"]
+    return _cycle(HiringAssistant().validate_phone, phones)
+
+
+@benchmark("check_exit_intent")
+def _exit():
+    from bench_exit_intent import load_corpus
+
+    corpus = list(load_corpus())
+    assistant = HiringAssistant()
+
+    def run():
+        for stage, _, text in corpus:
+            assistant.check_exit_intent(text, stage)
+    run.per_call = len(corpus)
+    return run
+
+
+@benchmark("full_conversation")
+def _conversation():
+    # A plain ScreeningSession stands in for Streamlit's session state
+    answers = ["", "Jane Doe", "not-an-email", "jane@example.com", "+14155550123", "5 years",
+               "Software Developer", "Berlin, Germany", "Python, Django, PostgreSQL, AWS"]
+    answers += [f"Answer number {i} to the technical question." for i in range(5)]
+    assistant = HiringAssistant()
+
+    def run():
+        session = ScreeningSession()
+        for text in answers:
+            assistant.process_user_input(session, text)
+        assert session.current_stage == 9
+    return run
+
+
+def measure(operation: Callable[[], None], repeat: int, min_time: float) -> float:
+    """Best seconds per operation over ``repeat`` calibrated runs"""
+    per_call = getattr(operation, "per_call", 1)
+    operation()  # warm caches and lazy loads outside the timed runs
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            operation()
+        best = min(best, time.perf_counter() - start)
+    return best / (number * per_call)
+
+
+def load_baseline(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="record results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown versus baseline before failing (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed run")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    recorded = baseline.get("results", {})
+    if recorded and baseline.get("python") != platform.python_version():
+        print(f"note: baseline recorded on Python {baseline.get('python')}, "
+              f"running {platform.python_version()}", file=sys.stderr)
+
+    results: Dict[str, float] = {}
+    regressions = []
+    print(f"{'benchmark':<44} {'us/op':>10} {'baseline':>10} {'change':>8}")
+    for name, setup in BENCHMARKS.items():
+        if args.pattern and args.pattern not in name:
+            continue
+        seconds = measure(setup(), args.repeat, args.min_time)
+        results[name] = seconds
+        reference = recorded.get(name)
+        if reference:
+            change = seconds / reference - 1
+            flag = "  REGRESSION" if change > args.threshold else ""
+            if flag:
+                regressions.append(name)
+            print(f"{name:<44} {seconds * 1e6:>10.2f} {reference * 1e6:>10.2f} {change:>+8.1%}{flag}")
+        else:
+            print(f"{name:<44} {seconds * 1e6:>10.2f} {'-':>10} {'':>8}")
+
+    if args.save_baseline:
+        merged = dict(recorded, **results)
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": merged}, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}: "
+              + ", ".join(regressions), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
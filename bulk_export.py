@@ -0,0 +1,200 @@
+"""Streaming bulk export of completed screenings.
+
+Completed sessions are read from a durable session store page by page,
+turned into export records and written out as they arrive, so memory use is
+independent of how many screenings are exported::
+
+    python bulk_export.py --store sqlite:///sessions.db --format ndjson \\
+        --output screenings.ndjson.gz --compression gzip --cursor-file export.cursor
+
+With ``--cursor-file`` only sessions changed since the previous successful
+export are written, and the cursor is advanced once the export completes.
+With ``--pii redact`` or ``--pii hash`` names, emails and phone numbers are
+masked or pseudonymized (see normalization.py).
+Parquet output needs ``pyarrow`` and zstd compression of text formats needs
+``zstandard``.
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+from dataclasses import fields
+from typing import Dict, IO, Iterable, Iterator, List, Optional
+
+from engine import CandidateInfo, HiringAssistant, ScreeningSession
+from normalization import PII_MODE_ENV, PII_MODES, normalizer_from_env
+from scheduler import BATCH
+from session_store import Cursor, SessionStore, open_backend
+
+FORMATS = ("ndjson", "csv", "parquet")
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+CSV_COLUMNS = ["session_id"] + [f.name for f in fields(CandidateInfo)] + [
+    "experience_min_years", "experience_max_years", "session_completed", "questions_answered", "overall_score", "technical_qa", "answer_scores", "export_timestamp"
+]
+
+
+def export_records(store: SessionStore, assistant: HiringAssistant, since: Optional[Cursor] = None,
+                   progress: Optional[Dict] = None, score_batch_size: int = 1000) -> Iterator[Dict]:
+    """Yield export records for completed sessions changed after ``since``
+
+    Answers are scored ``score_batch_size`` sessions at a time. When the
+    assistant has a scheduler, as inside a server process, each batch is
+    scored there as batch work that waits behind interactive chat.
+    ``progress["cursor"]`` tracks the position of the last record yielded.
+    """
+    batch: List = []
+    for cursor, snapshot in store.iter_snapshots(since=since, completed_only=True):
+        batch.append((cursor, ScreeningSession.from_dict(snapshot)))
+        if len(batch) >= score_batch_size:
+            yield from _export_batch(batch, assistant, progress)
+            batch = []
+    if batch:
+        yield from _export_batch(batch, assistant, progress)
+
+
+def _export_batch(batch: List, assistant: HiringAssistant, progress: Optional[Dict]) -> Iterator[Dict]:
+    sessions = [session for _, session in batch]
+    if assistant.scheduler is None:
+        scores = assistant.score_answers(sessions)
+    else:
+        scores = assistant.scheduler.run(assistant.score_answers, sessions, kind="bulk_export",
+                                         tenant=None, priority=BATCH, block=True)
+    for (cursor, session), session_scores in zip(batch, scores):
+        record = assistant.export_candidate_data(session, session_scores)
+        record["session_id"] = session.session_id
+        if progress is not None:
+            progress["cursor"] = cursor
+            progress["count"] = progress.get("count", 0) + 1
+        yield record
+
+
+def flatten_record(record: Dict) -> Dict:
+    """Flatten an export record into one CSV row"""
+    row = {"session_id": record["session_id"]}
+    row.update(record["candidate_info"])
+    row["session_completed"] = record["session_completed"]
+    row["questions_answered"] = len(record["technical_qa"])
+    row["overall_score"] = record["overall_score"]
+    row["technical_qa"] = json.dumps(record["technical_qa"], ensure_ascii=False)
+    row["answer_scores"] = json.dumps(record["answer_scores"])
+    row["export_timestamp"] = record["export_timestamp"]
+    return row
+
+
+def open_output(path: str, compression: str) -> IO[str]:
+    """Open a text output stream, optionally compressed"""
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    if compression == "zstd":
+        import zstandard
+
+        raw = open(path, "wb")
+        stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def write_ndjson(records: Iterable[Dict], out: IO[str]) -> None:
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n")
+
+
+def write_csv(records: Iterable[Dict], out: IO[str]) -> None:
+    writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(flatten_record(record))
+
+
+def write_parquet(records: Iterable[Dict], path: str, compression: str, row_group_size: int = 10000) -> None:
+    """Write flattened records as Parquet, one row group per ``row_group_size`` records"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"questions_answered": pa.int64(), "session_completed": pa.bool_(), "overall_score": pa.float64(),
+             "experience_min_years": pa.float64(), "experience_max_years": pa.float64()}
+    schema = pa.schema([(name, types.get(name, pa.string())) for name in CSV_COLUMNS])
+    codec = {"none": "NONE", "gzip": "GZIP", "zstd": "ZSTD"}[compression]
+    batch: List[Dict] = []
+    with pq.ParquetWriter(path, schema, compression=codec) as writer:
+        for record in records:
+            batch.append(flatten_record(record))
+            if len(batch) >= row_group_size:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+
+def read_cursor(path: Optional[str]) -> Optional[Cursor]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if "position" not in data:
+        # Cursors saved as wall-clock updated_at predate the change sequence;
+        # exporting everything once more is safer than guessing a position
+        return None
+    return (data["position"], data["session_id"])
+
+
+def write_cursor(path: str, cursor: Cursor) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump({"position": cursor[0], "session_id": cursor[1]}, handle)
+    os.replace(tmp_path, path)
+
+
+def run_export(store: SessionStore, output: str, fmt: str = "ndjson", compression: str = "none",
+               cursor_file: Optional[str] = None, assistant: Optional[HiringAssistant] = None) -> int:
+    """Export completed sessions to ``output`` and return how many were written"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r}; expected one of {FORMATS}")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unsupported compression {compression!r}; expected one of {COMPRESSIONS}")
+
+    progress: Dict = {}
+    records = export_records(store, assistant or HiringAssistant(), read_cursor(cursor_file), progress)
+    if fmt == "parquet":
+        write_parquet(records, output, compression)
+    else:
+        with open_output(output, compression) as out:
+            (write_csv if fmt == "csv" else write_ndjson)(records, out)
+
+    if cursor_file and "cursor" in progress:
+        write_cursor(cursor_file, progress["cursor"])
+    return progress.get("count", 0)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export completed screenings in bulk")
+    parser.add_argument("--store", required=True, help="session store URL (sqlite:///path.db or file:///abs/dir)")
+    parser.add_argument("--output", required=True, help="output file")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--compression", choices=COMPRESSIONS, default="none")
+    parser.add_argument("--cursor-file", help="only export sessions changed since the cursor stored here")
+    parser.add_argument("--pii", choices=PII_MODES,
+                        help=f"names, emails and phones in clear, redacted or hashed (default: ${PII_MODE_ENV} or clear)")
+    args = parser.parse_args(argv)
+
+    try:
+        assistant = HiringAssistant(normalizer=normalizer_from_env(args.pii))
+    except ValueError as exc:
+        parser.error(str(exc))
+    store = open_backend(args.store)
+    try:
+        count = run_export(store, args.output, args.format, args.compression, args.cursor_file, assistant)
+    finally:
+        store.close()
+    print(f"Exported {count} completed screenings to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
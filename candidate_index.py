@@ -0,0 +1,282 @@
+"""Searchable index of screened candidates.
+
+Free-text candidate fields are normalized once, when a screening completes,
+into an inverted index whose posting lists are Python ints used as bitsets
+(bit ``n`` set means candidate ``n`` matches):
+
+* tech stacks are resolved through ``TECH_MATCHER`` to canonical names, and
+  each technology also posts to its ``TECH_CATEGORIES`` category
+* ``experience_years`` is parsed into a numeric range and bucketed by whole
+  years
+* ``current_location`` is split on commas into lowercase place names, with
+  aliases such as "NYC" resolved (see normalization.py)
+
+Queries combine bitsets with ``&``, ``|`` and ``~``, so evaluating one costs
+a few big-int operations regardless of how many candidates match::
+
+    index = CandidateIndex.from_store(SQLiteSessionStore("sessions.db"))
+    hits = index.search("postgresql AND (django OR fastapi), 3+ years, Berlin")
+    hits.count, hits.session_ids[:20]
+
+Clauses separated by commas are ANDed. A clause is an experience filter
+(``3+ years``, ``2-5 years``, ``<2 years``) or a boolean expression of terms
+with ``AND``, ``OR``, ``NOT`` and parentheses. A term is a technology,
+``category:<name>``, ``location:<place>`` or ``tech:<name>``; bare terms
+that are not technologies or categories are treated as locations. Adjacent
+words without an operator are ANDed ("python django"), except that a run
+of words naming one technology, category or indexed location stays one
+term ("machine learning", "new york").
+"""
+
+import re
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from normalization import location_key, location_keys, parse_experience
+from questions import TECH_CATEGORIES
+from tech_matcher import TECH_MATCHER
+
+# Experience is bucketed by whole years; anything above this lands in the last bucket
+MAX_YEARS = 50
+
+_NUM = r"\d+(?:\.\d+)?"
+_EXPERIENCE_CLAUSE_RE = re.compile(
+    rf"^(?:(?P<min>{_NUM})\s*\+|(?P<lo>{_NUM})\s*(?:-|–|to)\s*(?P<hi>{_NUM})"
+    rf"|(?:<|under|less than)\s*(?P<lt>{_NUM}))\s*(?:years?|yrs?|y)?(?:\s+(?:of\s+)?experience)?$"
+)
+_QUERY_TOKEN_RE = re.compile(r"\(|\)|[^\s()]+")
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+@dataclass
+class SearchResult:
+    count: int
+    session_ids: List[str]
+
+
+class QuerySyntaxError(ValueError):
+    """Raised for queries that cannot be parsed"""
+
+
+class CandidateIndex:
+    """Inverted bitset index over completed screenings
+
+    Thread-safe; ``add`` may be called from the request threads that
+    complete screenings while searches run.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._session_ids: List[str] = []
+        self._doc_of: Dict[str, int] = {}
+        self._deleted = 0
+        # Posting bitsets, plus ids added since a key was last read
+        self._bitsets: Dict[str, int] = {}
+        self._pending: Dict[str, List[int]] = {}
+        self._category_of = {tech: category for category, techs in TECH_CATEGORIES.items() for tech in techs}
+
+    @classmethod
+    def from_store(cls, store) -> "CandidateIndex":
+        """Build an index over every completed session in a durable store"""
+        index = cls()
+        for _, snapshot in store.iter_snapshots(completed_only=True):
+            index.add(snapshot["session_id"], snapshot["candidate_info"])
+        index.compact()
+        return index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._doc_of)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._doc_of
+
+    def keys_for(self, candidate_info) -> List[str]:
+        """Index keys for a candidate (a CandidateInfo or its dict form)"""
+        info = candidate_info if isinstance(candidate_info, dict) else asdict(candidate_info)
+        keys = []
+        for tech in TECH_MATCHER.find(info.get("tech_stack", "")):
+            keys.append(f"tech:{tech}")
+            category = self._category_of.get(tech)
+            if category:
+                keys.append(f"category:{category}")
+        experience = parse_experience(info.get("experience_years", ""))
+        if experience is not None:
+            keys.append(f"years:{min(int(experience[0]), MAX_YEARS)}")
+        keys.extend(f"location:{place}" for place in location_keys(info.get("current_location", "")))
+        return list(dict.fromkeys(keys))
+
+    def add(self, session_id: str, candidate_info) -> None:
+        """Index a completed screening, replacing any earlier entry for the session"""
+        keys = self.keys_for(candidate_info)
+        with self._lock:
+            self.remove(session_id)
+            doc = len(self._session_ids)
+            self._session_ids.append(session_id)
+            self._doc_of[session_id] = doc
+            for key in keys:
+                self._pending.setdefault(key, []).append(doc)
+
+    def remove(self, session_id: str) -> None:
+        """Drop a session from search results"""
+        with self._lock:
+            doc = self._doc_of.pop(session_id, None)
+            if doc is not None:
+                self._deleted |= 1 << doc
+
+    def _bitset(self, key: str) -> int:
+        """Posting bitset for a key, folding in ids added since it was last read"""
+        pending = self._pending.pop(key, None)
+        if pending:
+            # One big-int OR per key instead of one per added candidate
+            delta = bytearray(pending[-1] // 8 + 1)
+            for doc in pending:
+                delta[doc >> 3] |= 1 << (doc & 7)
+            self._bitsets[key] = self._bitsets.get(key, 0) | int.from_bytes(delta, "little")
+        return self._bitsets.get(key, 0)
+
+    def compact(self) -> None:
+        """Fold every pending posting into its bitset, e.g. after a bulk load"""
+        with self._lock:
+            for key in list(self._pending):
+                self._bitset(key)
+
+    def _live(self) -> int:
+        return ((1 << len(self._session_ids)) - 1) & ~self._deleted
+
+    def _years_at_least(self, years: float) -> int:
+        bits = 0
+        for bucket in range(max(int(-(-years // 1)), 0), MAX_YEARS + 1):
+            bits |= self._bitset(f"years:{bucket}")
+        return bits
+
+    def _years_below(self, years: float) -> int:
+        bits = 0
+        for bucket in range(0, min(int(-(-years // 1)), MAX_YEARS + 1)):
+            bits |= self._bitset(f"years:{bucket}")
+        return bits
+
+    def _key(self, term: str) -> str:
+        """Posting key a query term looks up"""
+        prefix, _, value = term.partition(":")
+        if value and prefix in ("tech", "category", "location"):
+            if prefix == "tech":
+                found = TECH_MATCHER.find(value)
+                value = found[0] if found else value.lower()
+            elif prefix == "location":
+                value = location_key(value)
+            return f"{prefix}:{value}"
+
+        lowered = term.lower()
+        tech = TECH_MATCHER.lookup(lowered)
+        if tech is not None:
+            return f"tech:{tech}"
+        if lowered.replace(" ", "_") in TECH_CATEGORIES:
+            return f"category:{lowered.replace(' ', '_')}"
+        return f"location:{location_key(lowered)}"
+
+    def _words(self, words: List[str]) -> int:
+        """Bitset of a run of words: the longest leading run naming a known key, ANDed with the rest"""
+        bits = self._live()
+        start = 0
+        while start < len(words):
+            end = len(words)
+            while True:
+                key = self._key(" ".join(words[start:end]))
+                # Technologies and categories resolve exactly; a place must be indexed
+                if end - start == 1 or not key.startswith("location:") or key in self._bitsets or key in self._pending:
+                    break
+                end -= 1
+            bits &= self._bitset(key)
+            start = end
+        return bits
+
+    def _experience(self, match: "re.Match") -> int:
+        if match.group("min") is not None:
+            return self._years_at_least(float(match.group("min")))
+        if match.group("lt") is not None:
+            return self._years_below(float(match.group("lt")))
+        low, high = sorted((float(match.group("lo")), float(match.group("hi"))))
+        return self._years_at_least(low) & ~self._years_at_least(high + 1)
+
+    def _expression(self, tokens: List[str]) -> int:
+        position = 0
+
+        def peek() -> Optional[str]:
+            return tokens[position] if position < len(tokens) else None
+
+        def take() -> str:
+            nonlocal position
+            position += 1
+            return tokens[position - 1]
+
+        def parse_or() -> int:
+            bits = parse_and()
+            while peek() is not None and peek().upper() == "OR":
+                take()
+                bits |= parse_and()
+            return bits
+
+        def parse_and() -> int:
+            bits = parse_not()
+            while peek() is not None and peek() != ")" and peek().upper() != "OR":
+                if peek().upper() == "AND":
+                    take()
+                bits &= parse_not()
+            return bits
+
+        def parse_not() -> int:
+            if peek() is not None and peek().upper() == "NOT":
+                take()
+                return self._live() & ~parse_not()
+            return parse_atom()
+
+        def parse_atom() -> int:
+            token = peek()
+            if token is None or token == ")" or token.upper() in _OPERATORS:
+                raise QuerySyntaxError(f"expected a term at {token or 'end of query'!r}")
+            take()
+            if token == "(":
+                bits = parse_or()
+                if peek() != ")":
+                    raise QuerySyntaxError("missing closing parenthesis")
+                take()
+                return bits
+            words = [token]
+            while peek() is not None and peek() not in "()" and peek().upper() not in _OPERATORS:
+                words.append(take())
+            return self._words(words)
+
+        bits = parse_or()
+        if position != len(tokens):
+            raise QuerySyntaxError(f"unexpected {tokens[position]!r}")
+        return bits
+
+    def match_bits(self, query: str) -> int:
+        """Bitset of live candidates matching a query"""
+        with self._lock:
+            bits = self._live()
+            for clause in query.split(","):
+                clause = clause.strip()
+                if not clause:
+                    continue
+                experience = _EXPERIENCE_CLAUSE_RE.match(clause.lower())
+                if experience:
+                    bits &= self._experience(experience)
+                else:
+                    bits &= self._expression(_QUERY_TOKEN_RE.findall(clause))
+            return bits
+
+    def search(self, query: str, limit: int = 100) -> SearchResult:
+        """Count the candidates matching a query and return up to ``limit`` session ids"""
+        bits = self.match_bits(query)
+        count = bits.bit_count()
+        session_ids = []
+        # Scan the binary digits, least significant first, for the first ``limit`` set bits
+        digits = bin(bits)[:1:-1]
+        doc = digits.find("1")
+        while doc != -1 and len(session_ids) < limit:
+            session_ids.append(self._session_ids[doc])
+            doc = digits.find("1", doc + 1)
+        return SearchResult(count, session_ids)
@@ -0,0 +1,20 @@
+"""Pre-rendered HTML fragments for chat messages.
+
+Each message renders to one self-contained HTML block, memoized by content.
+The blocks live in an imported module rather than in ``app.py`` because
+Streamlit re-executes the app script on every rerun, which would discard
+the cache. Identical blocks also hash identically, so Streamlit's message
+cache (see ``.streamlit/config.toml``) sends already-seen messages to the
+browser as short references instead of their full body.
+"""
+
+import html
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def render_chat_message(role: str, label: str, text: str) -> str:
+    """Return the HTML block for one message; ``role`` is "bot" or "user" """
+    body = html.escape(text).replace("\n", "<br>")
+    return (f'<div class="chat-message {role}-message">'
+            f'<strong>{html.escape(label)}</strong> {body}</div>')
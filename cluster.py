@@ -0,0 +1,578 @@
+"""Shared-nothing screening workers behind a session-affine router.
+
+Each worker is an ``api_server`` process holding its own sessions in
+memory. The router owns a consistent hash ring of workers and forwards
+every ``/sessions/{id}`` request to the worker the session id hashes to, so
+a candidate keeps talking to the process that holds their state, whichever
+router replica or load balancer path their requests take.
+
+When a worker joins or leaves, only the sessions whose owner changes move.
+The router stops forwarding and waits for in-flight requests. It exports
+the moving sessions from their old worker as a snapshot document, imports
+them on the new owner and swaps in the new ring. A snapshot document is
+``{"format": SNAPSHOT_FORMAT, "sessions": [ScreeningSession.to_dict(), ...]}``,
+so it carries candidate info, stage, questions, question index and answers.
+
+Run a local cluster and change its membership::
+
+    python cluster.py router --port 8080 --workers 3
+    curl -X POST http://127.0.0.1:8080/cluster/workers          # start and join a worker
+    curl -X DELETE http://127.0.0.1:8080/cluster/workers/127.0.0.1:8102
+    python tools/cluster_check.py                                # end-to-end check
+
+Router endpoints, besides the screening API of ``api_server``::
+
+    GET    /cluster                   workers and their session counts
+    POST   /cluster/workers           start a local worker, or join {"url": ...}
+    DELETE /cluster/workers/{name}    hand a worker's sessions over and stop it
+
+Sessions only live in worker memory: a worker that dies without leaving
+loses its sessions, and idle sessions still expire after ``--ttl``.
+"""
+
+import argparse
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import json
+import os
+import socket
+import sys
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+from aiohttp import WSMsgType, web
+
+from api_server import (ENGINE_KEY, STORE_KEY, TENANT_HEADER, _pull_chunks, _session_lock, _session_payload, _step,
+                        _tenant, create_app)
+from candidate_index import CandidateIndex
+from engine import ConversationEngine, HiringAssistant, ScreeningSession
+from llm_questions import question_generator_from_env
+from llm_replies import reply_streamer_from_env
+from metrics import CONTENT_TYPE, MIGRATED_SESSIONS, REGISTRY
+from scheduler import get_scheduler
+
+SNAPSHOT_FORMAT = "talentscout-sessions/1"
+
+_JSON = "application/json"
+# Error when the ring is empty, e.g. while the last worker is replaced
+NO_WORKERS = "no workers in the cluster"
+
+
+def dump_snapshots(sessions: Iterable[ScreeningSession]) -> Dict:
+    """Snapshot document for handing sessions to another worker"""
+    return {"format": SNAPSHOT_FORMAT, "sessions": [session.to_dict() for session in sessions]}
+
+
+def load_snapshots(document: Dict) -> List[ScreeningSession]:
+    """Sessions of a snapshot document; ValueError for other documents"""
+    if not isinstance(document, dict) or document.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"expected a {SNAPSHOT_FORMAT} snapshot document")
+    return [ScreeningSession.from_dict(snapshot) for snapshot in document.get("sessions", [])]
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes
+
+    Adding or removing one of n workers moves about 1/n of the sessions.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 160):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self.nodes: List[str] = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def copy(self) -> "HashRing":
+        return HashRing(self.nodes, self.replicas)
+
+    def node_for(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("the ring has no nodes")
+        index = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._owners[index]
+
+
+# --- worker ---------------------------------------------------------------
+
+def _json_error(exc_class, message: str):
+    return exc_class(text=json.dumps({"error": message}), content_type=_JSON)
+
+
+async def create_owned_session(request: web.Request) -> web.Response:
+    """Start a screening under an id chosen by the router"""
+    body = await request.json()
+    session_id = str(body.get("session_id", ""))
+    if not session_id or len(session_id) > 64:
+        raise _json_error(web.HTTPBadRequest, "expected {\"session_id\": ...}")
+    if request.app[STORE_KEY].get(session_id) is not None:
+        raise _json_error(web.HTTPConflict, "session exists")
+    engine = request.app[ENGINE_KEY]
+    session = engine.new_session(_tenant(request))
+    session.session_id = session_id
+    session, reply = await _step(request.app, session, "")
+    request.app[STORE_KEY].put(session)
+    return web.json_response(_session_payload(session, reply), status=201)
+
+
+async def stream_message(request: web.Request) -> web.StreamResponse:
+    """Apply a message and stream the reply as NDJSON chunk lines, then a done line"""
+    session = request.app[STORE_KEY].get(request.match_info["session_id"])
+    if session is None:
+        raise _json_error(web.HTTPNotFound, "unknown or expired session")
+    text = str((await request.json()).get("text", ""))
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    async with _session_lock(request.app, session.session_id):
+        parts = []
+        # Closing the chunks stops the model call when the router goes away mid-reply
+        async with contextlib.aclosing(_pull_chunks(request.app[ENGINE_KEY].step_stream(session, text))) as chunks:
+            async for chunk in chunks:
+                parts.append(chunk)
+                await response.write(json.dumps({"type": "chunk", "delta": chunk}).encode("utf-8") + b"\n")
+    done = dict(_session_payload(session, "".join(parts)), type="done")
+    await response.write(json.dumps(done).encode("utf-8") + b"\n")
+    await response.write_eof()
+    return response
+
+
+async def list_sessions(request: web.Request) -> web.Response:
+    return web.json_response({"session_ids": request.app[STORE_KEY].session_ids()})
+
+
+async def export_sessions(request: web.Request) -> web.Response:
+    """Hand sessions over: return their snapshots and forget them here"""
+    body = await request.json()
+    store, engine = request.app[STORE_KEY], request.app[ENGINE_KEY]
+    sessions = []
+    for session_id in body.get("session_ids", []):
+        # Wait for a step in flight so the snapshot includes it
+        async with _session_lock(request.app, session_id):
+            session = store.get(session_id)
+            if session is None:
+                continue
+            sessions.append(session)
+            store.delete(session_id)
+        if engine.candidate_index is not None:
+            engine.candidate_index.remove(session_id)
+    return web.json_response(dump_snapshots(sessions))
+
+
+async def import_sessions(request: web.Request) -> web.Response:
+    try:
+        sessions = load_snapshots(await request.json())
+    except (ValueError, KeyError, TypeError) as exc:
+        raise _json_error(web.HTTPBadRequest, str(exc))
+    store, engine = request.app[STORE_KEY], request.app[ENGINE_KEY]
+    for session in sessions:
+        store.put(session)
+        if engine.candidate_index is not None and session.current_stage == 9:
+            engine.candidate_index.add(session.session_id, session.candidate_info)
+    return web.json_response({"imported": len(sessions)})
+
+
+def create_worker_app(engine: Optional[ConversationEngine] = None, ttl_seconds: float = 1800.0) -> web.Application:
+    """The screening API plus the router-facing routes used for ownership and hand-over"""
+    app = create_app(engine, ttl_seconds=ttl_seconds)
+    app.add_routes([
+        web.post("/_cluster/sessions", create_owned_session),
+        web.get("/_cluster/sessions", list_sessions),
+        web.post("/_cluster/sessions/{session_id}/stream", stream_message),
+        web.post("/_cluster/export", export_sessions),
+        web.post("/_cluster/import", import_sessions),
+    ])
+    return app
+
+
+# --- router ---------------------------------------------------------------
+
+def _free_port(host: str) -> int:
+    with contextlib.closing(socket.socket()) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class Router:
+    """Routes sessions to workers by consistent hash and rebalances on membership changes"""
+
+    def __init__(self, host: str = "127.0.0.1", ttl_seconds: float = 1800.0, startup_timeout: float = 30.0):
+        self.host = host
+        self.ttl_seconds = ttl_seconds
+        self.startup_timeout = startup_timeout
+        self.ring = HashRing()
+        self.workers: Dict[str, str] = {}
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
+        self.client: Optional[aiohttp.ClientSession] = None
+        # Requests wait at the gate while sessions move between workers
+        self._gate = asyncio.Condition()
+        self._inflight = 0
+        self._rebalancing = False
+        self._membership = asyncio.Lock()
+
+    async def start(self) -> None:
+        self.client = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None, sock_connect=5))
+
+    async def close(self) -> None:
+        for name in list(self.processes):
+            await self._stop_process(name)
+        if self.client is not None:
+            await self.client.close()
+
+    @contextlib.asynccontextmanager
+    async def routed(self, session_id: str):
+        """Hold a session's owner URL for the duration of one forwarded request"""
+        async with self._gate:
+            await self._gate.wait_for(lambda: not self._rebalancing)
+            self._inflight += 1
+        try:
+            try:
+                url = self.workers[self.ring.node_for(session_id)]
+            except LookupError:
+                raise _json_error(web.HTTPServiceUnavailable, NO_WORKERS) from None
+            yield url
+        finally:
+            async with self._gate:
+                self._inflight -= 1
+                self._gate.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def _paused(self):
+        async with self._gate:
+            await self._gate.wait_for(lambda: not self._rebalancing)
+            self._rebalancing = True
+            await self._gate.wait_for(lambda: self._inflight == 0)
+        try:
+            yield
+        finally:
+            async with self._gate:
+                self._rebalancing = False
+                self._gate.notify_all()
+
+    async def _call(self, method: str, url: str, payload=None):
+        async with self.client.request(method, url, json=payload) as response:
+            if response.status >= 400:
+                raise web.HTTPBadGateway(text=json.dumps({"error": f"{url}: {await response.text()}"}),
+                                         content_type=_JSON)
+            return await response.json()
+
+    async def _move(self, source: str, moves: Dict[str, List[str]], reason: str) -> None:
+        """Export sessions from a worker and import them on their new owners"""
+        for target, session_ids in moves.items():
+            document = await self._call("POST", f"{self.workers[source]}/_cluster/export",
+                                        {"session_ids": session_ids})
+            try:
+                await self._call("POST", f"{self.workers[target]}/_cluster/import", document)
+            except Exception:
+                # Give the sessions back rather than lose them
+                await self._call("POST", f"{self.workers[source]}/_cluster/import", document)
+                raise
+            MIGRATED_SESSIONS.labels(reason).inc(len(document["sessions"]))
+
+    async def _session_ids(self, name: str) -> List[str]:
+        return (await self._call("GET", f"{self.workers[name]}/_cluster/sessions"))["session_ids"]
+
+    async def join(self, name: str, url: str) -> int:
+        """Add a running worker and move the sessions it now owns; returns how many moved"""
+        async with self._membership, self._paused():
+            ring = self.ring.copy()
+            ring.add(name)
+            self.workers[name] = url
+            moved: List[Tuple[str, List[str]]] = []
+            try:
+                for source in self.ring.nodes:
+                    moving = [sid for sid in await self._session_ids(source) if ring.node_for(sid) == name]
+                    if moving:
+                        await self._move(source, {name: moving}, "join")
+                        moved.append((source, moving))
+            except Exception:
+                # Return what already moved, so the old ring stays valid
+                for source, session_ids in moved:
+                    await self._move(name, {source: session_ids}, "rollback")
+                del self.workers[name]
+                raise
+            self.ring = ring
+            return sum(len(session_ids) for _, session_ids in moved)
+
+    async def leave(self, name: str) -> int:
+        """Hand a worker's sessions to the remaining workers and remove it; returns how many moved"""
+        async with self._membership, self._paused():
+            if name not in self.workers:
+                raise KeyError(name)
+            ring = self.ring.copy()
+            ring.remove(name)
+            session_ids = await self._session_ids(name)
+            if session_ids and not ring.nodes:
+                raise web.HTTPConflict(text=json.dumps({"error": "cannot remove the last worker holding sessions"}),
+                                       content_type=_JSON)
+            moves: Dict[str, List[str]] = {}
+            for session_id in session_ids:
+                moves.setdefault(ring.node_for(session_id), []).append(session_id)
+            moved: List[Tuple[str, List[str]]] = []
+            try:
+                for target, moving in moves.items():
+                    await self._move(name, {target: moving}, "leave")
+                    moved.append((target, moving))
+            except Exception:
+                # Take back what already moved, so the old ring stays valid
+                for target, moving in moved:
+                    await self._move(target, {name: moving}, "rollback")
+                raise
+            self.ring = ring
+            del self.workers[name]
+        await self._stop_process(name)
+        return len(session_ids)
+
+    async def spawn(self, port: Optional[int] = None) -> Tuple[str, str]:
+        """Start a local worker process and wait until it is healthy"""
+        port = port or _free_port(self.host)
+        name, url = f"{self.host}:{port}", f"http://{self.host}:{port}"
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), "worker", "--host", self.host, "--port", str(port),
+            "--ttl", str(self.ttl_seconds),
+        )
+        self.processes[name] = process
+        deadline = asyncio.get_running_loop().time() + self.startup_timeout
+        while True:
+            with contextlib.suppress(aiohttp.ClientError):
+                async with self.client.get(f"{url}/health") as response:
+                    if response.status == 200:
+                        return name, url
+            if process.returncode is not None or asyncio.get_running_loop().time() > deadline:
+                await self._stop_process(name)
+                raise RuntimeError(f"worker {name} did not start")
+            await asyncio.sleep(0.1)
+
+    async def _stop_process(self, name: str) -> None:
+        process = self.processes.pop(name, None)
+        if process is not None and process.returncode is None:
+            process.terminate()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(process.wait(), 10)
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+
+ROUTER_KEY = web.AppKey("router", Router)
+
+
+# Router request handlers
+
+def _router(request: web.Request) -> Router:
+    return request.app[ROUTER_KEY]
+
+
+def _relay(status: int, body: bytes, content_type: Optional[str]) -> web.Response:
+    return web.Response(status=status, body=body, headers={"Content-Type": content_type or _JSON})
+
+
+async def route_start(request: web.Request) -> web.Response:
+    router = _router(request)
+    session_id = uuid.uuid4().hex
+    async with router.routed(session_id) as url:
+        headers = {TENANT_HEADER: request.headers[TENANT_HEADER]} if TENANT_HEADER in request.headers else None
+        async with router.client.post(f"{url}/_cluster/sessions", json={"session_id": session_id},
+                                      headers=headers) as response:
+            return _relay(response.status, await response.read(), response.content_type)
+
+
+async def route_session(request: web.Request) -> web.Response:
+    """Forward a /sessions/{id}/... request to the session's worker"""
+    router = _router(request)
+    body = await request.read()
+    async with router.routed(request.match_info["session_id"]) as url:
+        async with router.client.request(request.method, url + request.rel_url.path_qs, data=body,
+                                         headers={"Content-Type": request.content_type}) as response:
+            return _relay(response.status, await response.read(), response.content_type)
+
+
+async def route_socket(request: web.Request) -> web.WebSocketResponse:
+    """WebSocket chat relayed message by message, so a session can move between messages"""
+    router = _router(request)
+    session_id = request.match_info["session_id"]
+    ws = web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+
+    async for message in ws:
+        if message.type != WSMsgType.TEXT:
+            continue
+        text, stream = message.data, False
+        with contextlib.suppress(ValueError, TypeError, KeyError, AttributeError):
+            body = json.loads(message.data)
+            text, stream = str(body["text"]), bool(body.get("stream"))
+
+        payload = None
+        try:
+            async with router.routed(session_id) as url:
+                if stream:
+                    async with router.client.post(f"{url}/_cluster/sessions/{session_id}/stream",
+                                                  json={"text": text}) as response:
+                        if response.status != 200:
+                            payload = {"type": "error", "error": await response.text()}
+                        else:
+                            async for line in response.content:
+                                frame = json.loads(line)
+                                if frame.get("type") == "done":
+                                    payload = frame
+                                else:
+                                    await ws.send_json(frame)
+                else:
+                    async with router.client.post(f"{url}/sessions/{session_id}/messages",
+                                                  json={"text": text}) as response:
+                        payload = await response.json()
+        except web.HTTPServiceUnavailable:
+            payload = {"type": "error", "error": NO_WORKERS}
+        payload = payload or {"type": "error", "error": "worker closed the stream without a reply"}
+        await ws.send_json(payload)
+        if payload.get("ended") or "error" in payload:
+            break
+
+    await ws.close()
+    return ws
+
+
+async def search_candidates(request: web.Request) -> web.Response:
+    """Fan a candidate search out to every worker and merge the results"""
+    router = _router(request)
+    try:
+        limit = max(int(request.query.get("limit", "100")), 0)
+    except ValueError:
+        raise _json_error(web.HTTPBadRequest, "limit must be an integer")
+    params = {"q": request.query.get("q", ""), "limit": str(limit)}
+
+    async def search(url: str) -> Tuple[int, bytes, Optional[str]]:
+        # Read each reply in full, so no response is left open when another fails
+        async with router.client.get(f"{url}/candidates", params=params) as response:
+            return response.status, await response.read(), response.content_type
+
+    results = await asyncio.gather(*(search(url) for url in list(router.workers.values())))
+    count, session_ids = 0, []
+    for status, body, content_type in results:
+        if status != 200:
+            return _relay(status, body, content_type)
+        result = json.loads(body)
+        count += result["count"]
+        session_ids.extend(result["session_ids"])
+    return web.json_response({"count": count, "session_ids": session_ids[:limit]})
+
+
+async def cluster_status(request: web.Request) -> web.Response:
+    router = _router(request)
+    workers = {}
+    for name, url in list(router.workers.items()):
+        health = await router._call("GET", f"{url}/health")
+        workers[name] = {"url": url, "sessions": health["sessions"]}
+    return web.json_response({"workers": workers, "ring_replicas": router.ring.replicas})
+
+
+async def add_worker(request: web.Request) -> web.Response:
+    router = _router(request)
+    body = await request.json() if request.can_read_body else {}
+    if body.get("url"):
+        url = body["url"].rstrip("/")
+        name = url.split("://", 1)[-1]
+    else:
+        name, url = await router.spawn()
+    try:
+        moved = await router.join(name, url)
+    except BaseException:
+        # A worker started for this join is not left running outside the ring
+        await router._stop_process(name)
+        raise
+    return web.json_response({"worker": name, "url": url, "migrated": moved}, status=201)
+
+
+async def remove_worker(request: web.Request) -> web.Response:
+    try:
+        moved = await _router(request).leave(request.match_info["name"])
+    except KeyError:
+        raise _json_error(web.HTTPNotFound, "unknown worker")
+    return web.json_response({"migrated": moved})
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok", "workers": len(_router(request).workers)})
+
+
+async def metrics(request: web.Request) -> web.Response:
+    return web.Response(body=REGISTRY.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+
+def create_router_app(workers: int = 2, host: str = "127.0.0.1", ttl_seconds: float = 1800.0) -> web.Application:
+    """Router application that starts ``workers`` local worker processes"""
+    app = web.Application()
+    router = Router(host, ttl_seconds)
+    app[ROUTER_KEY] = router
+
+    async def lifecycle(app: web.Application):
+        await router.start()
+        for _ in range(workers):
+            await router.join(*await router.spawn())
+        yield
+        await router.close()
+
+    app.cleanup_ctx.append(lifecycle)
+    app.add_routes([
+        web.post("/sessions", route_start),
+        web.get("/sessions/{session_id}/ws", route_socket),
+        web.route("*", "/sessions/{session_id}", route_session),
+        web.route("*", "/sessions/{session_id}/{tail:.*}", route_session),
+        web.get("/candidates", search_candidates),
+        web.get("/cluster", cluster_status),
+        web.post("/cluster/workers", add_worker),
+        web.delete("/cluster/workers/{name}", remove_worker),
+        web.get("/health", health),
+        web.get("/metrics", metrics),
+    ])
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="TalentScout screening cluster")
+    parser.add_argument("role", choices=["router", "worker"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=2, help="local workers started by the router")
+    parser.add_argument("--ttl", type=float, default=1800.0, help="idle seconds before a session is evicted")
+    args = parser.parse_args(argv)
+
+    if args.role == "router":
+        app = create_router_app(args.workers, args.host, args.ttl)
+    else:
+        engine = ConversationEngine(
+            HiringAssistant(question_generator=question_generator_from_env(), scheduler=get_scheduler()),
+            reply_streamer=reply_streamer_from_env(),
+            candidate_index=CandidateIndex(),
+        )
+        app = create_worker_app(engine, ttl_seconds=args.ttl)
+    web.run_app(app, host=args.host, port=args.port, print=print if args.role == "router" else None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,610 @@
+"""Headless screening engine.
+
+The conversation state machine works on a plain ``ScreeningSession`` object
+and has no Streamlit dependency, so it can be driven from the Streamlit UI,
+other front ends, batch jobs or load tests alike.
+"""
+
+import logging
+import re
+import sys
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from exit_intent import DEFAULT_EXIT_MATCHER, ExitIntentMatcher
+from metrics import EXIT_INTENTS, QUESTION_GENERATION_SECONDS, STAGE_SECONDS, STAGE_TRANSITIONS, VALIDATION_FAILURES
+from normalization import canonical_location, get_normalizer, normalize_email, validate_email, validate_phone
+from question_bank import get_question_bank
+from questions import TECH_CATEGORIES
+from scheduler import BATCH, DEFAULT_TENANT, Overloaded
+
+logger = logging.getLogger(__name__)
+
+# Static acknowledgement of a technical answer; replaced by model output when streaming
+ANSWER_ACKNOWLEDGEMENT = "Thank you for your answer!"
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# A question is referenced by its question bank id, or held as text when it
+# does not come from the bank (model-generated or generic questions). Ids are
+# positions in the bank this process loaded, so snapshots store the text.
+QuestionRef = Union[int, str]
+
+
+@dataclass(slots=True)
+class CandidateInfo:
+    """Data class to store candidate information"""
+    full_name: str = ""
+    email: str = ""
+    phone: str = ""
+    experience_years: str = ""
+    desired_positions: str = ""
+    current_location: str = ""
+    tech_stack: str = ""
+    session_start: int = 0  # epoch seconds
+
+
+class AnswerRecord(NamedTuple):
+    """One technical answer, kept compact while the session is live"""
+    question: QuestionRef
+    answer: str
+    answered_at: int  # epoch seconds
+
+
+def _now() -> str:
+    """Current local time in the format used throughout exported data"""
+    return datetime.now().strftime(TIMESTAMP_FORMAT)
+
+
+def _timestamp() -> int:
+    return int(time.time())
+
+
+def format_timestamp(timestamp: int) -> str:
+    """Format epoch seconds as local time for export"""
+    return datetime.fromtimestamp(timestamp).strftime(TIMESTAMP_FORMAT)
+
+
+def _parse_timestamp(value: Union[int, str]) -> int:
+    # Snapshots written before timestamps were stored as ints hold formatted strings
+    if isinstance(value, str):
+        return int(datetime.strptime(value, TIMESTAMP_FORMAT).timestamp()) if value else 0
+    return int(value)
+
+
+def question_text(question: QuestionRef) -> str:
+    """Resolve a question reference to its text"""
+    return question if isinstance(question, str) else get_question_bank().text(question)
+
+
+def _load_question(question: QuestionRef) -> QuestionRef:
+    # Restored sessions share one copy of each question text; ints come from
+    # snapshots written before questions were stored as text
+    return sys.intern(question) if isinstance(question, str) else question
+
+
+@dataclass(slots=True)
+class ScreeningSession:
+    """Mutable state of a single candidate's screening conversation"""
+    candidate_info: CandidateInfo = field(default_factory=lambda: CandidateInfo(session_start=_timestamp()))
+    conversation_history: List[AnswerRecord] = field(default_factory=list)
+    current_stage: int = 0
+    technical_questions: List[QuestionRef] = field(default_factory=list)
+    current_question_index: int = 0
+    conversation_ended: bool = False
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # Tenant whose model quota the session's generated questions and replies draw from
+    tenant: str = DEFAULT_TENANT
+
+    def to_dict(self) -> Dict:
+        """Plain, JSON-serializable snapshot of the session
+
+        Questions are stored as text, so a snapshot stays valid when the
+        question bank is rebuilt or replaced.
+        """
+        return {
+            "candidate_info": asdict(self.candidate_info),
+            "conversation_history": [[question_text(record.question), record.answer, record.answered_at]
+                                     for record in self.conversation_history],
+            "current_stage": self.current_stage,
+            "technical_questions": [question_text(question) for question in self.technical_questions],
+            "current_question_index": self.current_question_index,
+            "conversation_ended": self.conversation_ended,
+            "session_id": self.session_id,
+            "tenant": self.tenant,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ScreeningSession":
+        """Rebuild a session from a to_dict() snapshot, including older dict-history snapshots"""
+        data = dict(data)
+        info = dict(data["candidate_info"])
+        info["session_start"] = _parse_timestamp(info.get("session_start", 0))
+        data["candidate_info"] = CandidateInfo(**info)
+        data["conversation_history"] = [
+            AnswerRecord(_load_question(entry["question"]), entry["answer"], _parse_timestamp(entry["timestamp"]))
+            if isinstance(entry, dict) else AnswerRecord(_load_question(entry[0]), entry[1], entry[2])
+            for entry in data.get("conversation_history", [])
+        ]
+        data["technical_questions"] = [_load_question(question) for question in data.get("technical_questions", [])]
+        return cls(**data)
+
+
+class HiringAssistant:
+    """Main class for the Hiring Assistant chatbot"""
+    
+    def __init__(self, question_generator=None, exit_intent: Optional[ExitIntentMatcher] = None,
+                 answer_scorer=None, role_profiles=None, question_sampler=None, scheduler=None,
+                 tenant: str = DEFAULT_TENANT, generation_timeout: float = 5.0, normalizer=None):
+        # Optional LLMQuestionGenerator (see llm_questions.py) tried before the templates
+        self.question_generator = question_generator
+        # Optional WorkScheduler (see scheduler.py) bounding model calls and exports,
+        # rate limited per tenant; without one model calls run inline
+        self.scheduler = scheduler
+        # Tenant of sessions started without one
+        self.tenant = tenant
+        # Seconds to wait for generated questions before asking template ones
+        self.generation_timeout = generation_timeout
+        # RoleProfiles (see role_profiles.py) planning template questions for every tenant;
+        # without one each tenant's are loaded by get_role_profiles(tenant)
+        self._role_profiles = role_profiles
+        # QuestionSampler (see question_sampler.py) drawing each candidate's questions from the plan
+        self._question_sampler = question_sampler
+        # AnswerScorer (see answer_scoring.py); the shared catalog scorer is loaded on first export
+        self._answer_scorer = answer_scorer
+        # Normalizer (see normalization.py) canonicalizing phones and applying the export PII policy
+        self._normalizer = normalizer
+        
+        self.conversation_stages = {
+            "greeting": 0,
+            "name": 1,
+            "email": 2,
+            "phone": 3,
+            "experience": 4,
+            "position": 5,
+            "location": 6,
+            "tech_stack": 7,
+            "technical_questions": 8,
+            "completed": 9
+        }
+        self.stage_names = {number: name for name, number in self.conversation_stages.items()}
+        
+        # Tech stack categories for better question generation
+        self.tech_categories = TECH_CATEGORIES
+        
+        # Conversation ending keywords, compiled into a per-stage matcher
+        self.exit_intent = exit_intent or DEFAULT_EXIT_MATCHER
+        self.exit_keywords = self.exit_intent.phrases
+    
+    def validate_email(self, email: str) -> bool:
+        """Validate email format"""
+        return validate_email(email)
+    
+    def validate_phone(self, phone: str) -> bool:
+        """Validate phone number format"""
+        return validate_phone(phone)
+    
+    def check_exit_intent(self, user_input: str, stage: Optional[int] = None) -> bool:
+        """Check if user wants to end the conversation at the given stage"""
+        return self.exit_intent.matches(user_input, stage)
+    
+    def generate_greeting(self) -> str:
+        """Generate initial greeting message"""
+        return """
+        🤖 **Hello! Welcome to TalentScout's AI Hiring Assistant!**
+        
+        I'm here to help streamline your application process. I'll be gathering some basic information about you and then asking a few technical questions based on your expertise.
+        
+        This conversation will take about 5-10 minutes and will help us better understand your background and skills.
+        
+        Ready to get started? Please tell me your **full name**.
+        
+        *(You can type 'exit' or 'bye' at any time to end our conversation)*
+        """
+    
+    def generate_technical_questions(self, tech_stack: str, desired_positions: str = "",
+                                     experience_years: str = "", seed=None) -> List[str]:
+        """Generate technical questions based on the candidate's tech stack"""
+        return [question_text(question) for question in
+                self.select_technical_questions(tech_stack, desired_positions, experience_years, seed)]
+
+    def select_technical_questions(self, tech_stack: str, desired_positions: str = "",
+                                   experience_years: str = "", seed=None,
+                                   cohort: Optional[str] = None, tenant: Optional[str] = None) -> List[QuestionRef]:
+        """Pick technical questions for a tech stack, as question bank ids where possible
+
+        Template questions follow ``tenant``'s role profile matching
+        ``desired_positions`` and the seniority implied by the title or
+        ``experience_years``. They are
+        drawn at random under ``seed`` (the session id in a conversation), without
+        repeats, favouring questions the ``cohort`` has seen least. A model
+        call for generated questions counts against ``tenant``'s rate limit.
+        """
+        start = time.perf_counter()
+        if self.question_generator is not None:
+            try:
+                generated = self._generate_questions(tech_stack, tenant or self.tenant)
+                if generated:
+                    QUESTION_GENERATION_SECONDS.observe(time.perf_counter() - start, "llm")
+                    return list(dict.fromkeys(generated))[:5]
+            except Overloaded as exc:
+                logger.warning("LLM question generation shed (%s); falling back to templates", exc.reason)
+            except Exception:
+                logger.exception("LLM question generation failed; falling back to templates")
+        
+        # Precompiled, cached plan for the candidate's role, stack and seniority
+        plan = self.profiles_for(tenant).plan_for(desired_positions, tech_stack, experience_years)
+        questions: List[QuestionRef] = self.question_sampler.sample(plan, seed, cohort)
+        
+        # If no specific questions found, generate generic ones based on the tech stack
+        if not questions:
+            technologies = [tech.strip() for tech in re.split(r'[,;|\n]', tech_stack.lower())]
+            questions = [
+                f"Can you explain your experience with {technologies[0] if technologies else 'your primary technology'}?",
+                "Describe a challenging technical problem you've solved recently.",
+                "How do you stay updated with the latest trends in your tech stack?",
+                "What best practices do you follow in your development process?",
+                "How do you approach debugging and troubleshooting in your projects?"
+            ]
+        
+        QUESTION_GENERATION_SECONDS.observe(time.perf_counter() - start, "templates")
+        return questions[:5]  # Return maximum 5 questions
+    
+    def _generate_questions(self, tech_stack: str, tenant: str) -> List[str]:
+        if self.scheduler is None:
+            return self.question_generator.generate(tech_stack)
+        # Cached question sets need no model call, so they skip the queue
+        cached = self.question_generator.cached(tech_stack)
+        if cached is not None:
+            return cached
+        # A call still running at the timeout finishes in the background and
+        # fills the cache for the next candidate with this stack
+        return self.scheduler.run(self.question_generator.generate, tech_stack, kind="llm_questions",
+                                  tenant=tenant, timeout=self.generation_timeout)
+
+    def process_user_input(self, session: ScreeningSession, user_input: str) -> str:
+        """Process user input based on the session's current conversation stage"""
+        stage, ended = session.current_stage, session.conversation_ended
+        start = time.perf_counter()
+        reply = self._advance(session, user_input)
+        elapsed = time.perf_counter() - start
+
+        # Stage latency and funnel metrics (see metrics.py)
+        stage_name = self.stage_names.get(stage, str(stage))
+        STAGE_SECONDS.labels(stage_name).observe(elapsed)
+        if session.conversation_ended and not ended:
+            EXIT_INTENTS.labels(stage_name).inc()
+        elif session.current_stage != stage:
+            STAGE_TRANSITIONS.labels(stage_name, self.stage_names.get(session.current_stage, "unknown")).inc()
+        elif 1 <= stage <= 7:
+            # Profile stages only stay put when the input was rejected
+            VALIDATION_FAILURES.labels(stage_name).inc()
+        return reply
+
+    def _advance(self, session: ScreeningSession, user_input: str) -> str:
+        if self.check_exit_intent(user_input, session.current_stage):
+            session.conversation_ended = True
+            return self.generate_goodbye_message()
+        
+        current_stage = session.current_stage
+        candidate_info = session.candidate_info
+        
+        # Start with greeting if this is the first interaction
+        if current_stage == 0 and not user_input.strip():
+            session.current_stage = 1
+            return self.generate_greeting()
+        
+        elif current_stage == 1:  # Name collection
+            if len(user_input.strip()) < 2:
+                return "Please provide your full name (at least 2 characters)."
+            candidate_info.full_name = user_input.strip()
+            session.current_stage = 2
+            return f"Nice to meet you, {candidate_info.full_name}! 👋\n\nNow, could you please provide your **email address**?"
+        
+        elif current_stage == 2:  # Email collection
+            if not self.validate_email(user_input.strip()):
+                return "Please provide a valid email address (e.g., john@example.com)."
+            candidate_info.email = normalize_email(user_input)
+            session.current_stage = 3
+            return "Thank you! Now, please provide your **phone number**."
+        
+        elif current_stage == 3:  # Phone collection
+            # Stored in E.164 form when the country is known (see Normalizer.phone)
+            phone = self.normalizer.phone(user_input)
+            if phone is None:
+                return "Please provide a valid phone number (e.g., +1234567890 or 123-456-7890)."
+            candidate_info.phone = phone
+            session.current_stage = 4
+            return "Great! How many **years of experience** do you have in your field?"
+        
+        elif current_stage == 4:  # Experience collection
+            if not user_input.strip():
+                return "Please provide your years of experience (e.g., '3 years' or '0-1 year')."
+            candidate_info.experience_years = user_input.strip()
+            session.current_stage = 5
+            return "What **position(s)** are you interested in? (e.g., 'Software Developer', 'Data Scientist', 'Full Stack Developer')"
+        
+        elif current_stage == 5:  # Position collection
+            if not user_input.strip():
+                return "Please specify the position(s) you're interested in."
+            candidate_info.desired_positions = user_input.strip()
+            session.current_stage = 6
+            return "What is your **current location**? (City, State/Country)"
+        
+        elif current_stage == 6:  # Location collection
+            location = canonical_location(user_input)
+            if not location:
+                return "Please provide your current location."
+            candidate_info.current_location = location
+            session.current_stage = 7
+            return """Perfect! Now for the technical part. 
+            
+Please list your **tech stack** - the programming languages, frameworks, databases, and tools you're proficient in.
+
+*For example: "Python, Django, PostgreSQL, React, AWS, Docker"*"""
+        
+        elif current_stage == 7:  # Tech stack collection
+            if not user_input.strip():
+                return "Please provide your tech stack (programming languages, frameworks, tools, etc.)."
+            candidate_info.tech_stack = user_input.strip()
+            
+            # Generate technical questions
+            questions = self.select_technical_questions(
+                candidate_info.tech_stack, candidate_info.desired_positions, candidate_info.experience_years,
+                seed=session.session_id, tenant=session.tenant,
+            )
+            session.technical_questions = questions
+            session.current_question_index = 0
+            session.current_stage = 8
+            
+            return f"""Excellent! Based on your tech stack: **{candidate_info.tech_stack}**
+
+I'll now ask you {len(questions)} technical questions to assess your proficiency. Don't worry - just answer to the best of your ability!
+
+**Question 1 of {len(questions)}:**
+{question_text(questions[0])}"""
+        
+        elif current_stage == 8:  # Technical questions
+            questions = session.technical_questions
+            current_q_index = session.current_question_index
+            
+            # Store the answer
+            session.conversation_history.append(
+                AnswerRecord(questions[current_q_index], user_input, _timestamp())
+            )
+            
+            current_q_index += 1
+            session.current_question_index = current_q_index
+            
+            if current_q_index < len(questions):
+                return f"""{ANSWER_ACKNOWLEDGEMENT}
+
+**Question {current_q_index + 1} of {len(questions)}:**
+{question_text(questions[current_q_index])}"""
+            else:
+                session.current_stage = 9
+                return self.generate_completion_message(session)
+        
+        return "I didn't understand that. Could you please try again?"
+    
+    def generate_completion_message(self, session: ScreeningSession) -> str:
+        """Generate completion message"""
+        candidate_info = session.candidate_info
+        return f"""🎉 **Congratulations, {candidate_info.full_name}!** 
+
+You've successfully completed the initial screening process with TalentScout's AI Hiring Assistant.
+
+**Here's a summary of what we collected:**
+- **Name:** {candidate_info.full_name}
+- **Email:** {candidate_info.email}
+- **Phone:** {candidate_info.phone}
+- **Experience:** {candidate_info.experience_years}
+- **Desired Position(s):** {candidate_info.desired_positions}
+- **Location:** {candidate_info.current_location}
+- **Tech Stack:** {candidate_info.tech_stack}
+- **Technical Questions Answered:** {len(session.technical_questions)}
+
+**Next Steps:**
+1. Our recruitment team will review your responses within 2-3 business days
+2. If your profile matches our current openings, we'll reach out via email or phone
+3. You may be invited for a detailed technical interview or assessment
+
+Thank you for your time and interest in TalentScout! We appreciate your effort in completing this screening process.
+
+*You can now close this window or type 'exit' to end our conversation.*"""
+    
+    def generate_goodbye_message(self) -> str:
+        """Generate goodbye message"""
+        return """👋 **Thank you for using TalentScout's AI Hiring Assistant!**
+
+We appreciate your time. If you'd like to complete the screening process later, please feel free to start a new session.
+
+Have a great day! 🌟"""
+    
+    def profiles_for(self, tenant: Optional[str] = None):
+        """Role profiles planning ``tenant``'s questions (by default the assistant's tenant)"""
+        if self._role_profiles is not None:
+            return self._role_profiles
+        from role_profiles import get_role_profiles
+
+        return get_role_profiles(tenant or self.tenant)
+
+    @property
+    def role_profiles(self):
+        return self.profiles_for(self.tenant)
+
+    @property
+    def question_sampler(self):
+        if self._question_sampler is None:
+            from question_sampler import get_question_sampler
+
+            self._question_sampler = get_question_sampler()
+        return self._question_sampler
+
+    @property
+    def normalizer(self):
+        if self._normalizer is None:
+            self._normalizer = get_normalizer()
+        return self._normalizer
+
+    @property
+    def answer_scorer(self):
+        if self._answer_scorer is None:
+            from answer_scoring import get_answer_scorer
+
+            self._answer_scorer = get_answer_scorer()
+        return self._answer_scorer
+
+    def score_answers(self, sessions: List[ScreeningSession]) -> List[Dict]:
+        """Score the technical answers of many sessions in one batch"""
+        return self.answer_scorer.score_histories(
+            [(question_text(record.question), record.answer) for record in s.conversation_history]
+            for s in sessions
+        )
+
+    def export_candidate_data(self, session: ScreeningSession, scores: Optional[Dict] = None) -> Dict:
+        """Export candidate data for download
+
+        ``scores`` is this session's entry from score_answers(); when omitted
+        the session's answers are scored on their own. Fields are normalized,
+        with numeric experience added, and names, emails and phone numbers
+        follow the normalizer's PII policy.
+        """
+        if scores is None:
+            scores = self.score_answers([session])[0]
+        candidate_info = self.normalizer.candidate(asdict(session.candidate_info))
+        candidate_info["session_start"] = format_timestamp(session.candidate_info.session_start)
+        scrub = self.normalizer.pii.scrub
+        return {
+            "candidate_info": candidate_info,
+            "technical_qa": [
+                {"question": question_text(record.question), "answer": scrub(record.answer),
+                 "timestamp": format_timestamp(record.answered_at)}
+                for record in session.conversation_history
+            ],
+            "answer_scores": scores["answer_scores"],
+            "overall_score": scores["overall_score"],
+            "session_completed": session.current_stage == 9,
+            "export_timestamp": _now()
+        }
+
+    def submit_export(self, session: ScreeningSession, timeout: Optional[float] = 30.0) -> Future:
+        """Run export_candidate_data() as batch work, behind interactive chat
+
+        The future fails with ``Overloaded`` when the scheduler sheds the
+        export. Without a scheduler the export runs at once.
+        """
+        if self.scheduler is None:
+            future: Future = Future()
+            future.set_result(self.export_candidate_data(session))
+            return future
+        # Exports use no model quota, so only the queue bounds them
+        return self.scheduler.submit(self.export_candidate_data, session, kind="export", tenant=None,
+                                     priority=BATCH, timeout=timeout)
+
+
+class ConversationEngine:
+    """Drives screening sessions through the HiringAssistant stage machine"""
+
+    def __init__(self, assistant: Optional[HiringAssistant] = None, store=None, reply_streamer=None,
+                 candidate_index=None, first_chunk_timeout: float = 3.0, event_log=None):
+        self.assistant = assistant or HiringAssistant()
+        # Optional session store (see session_store.py); written on every stage transition
+        self.store = store
+        # Optional LLMReplyStreamer (see llm_replies.py) used by step_stream()
+        self.reply_streamer = reply_streamer
+        # Seconds to wait for a streamed reply to start, when the assistant has a scheduler
+        self.first_chunk_timeout = first_chunk_timeout
+        # Optional CandidateIndex (see candidate_index.py); updated as screenings complete
+        self.candidate_index = candidate_index
+        # Optional EventLog (see event_log.py); records what every step changed
+        self.event_log = event_log
+
+    def new_session(self, tenant: Optional[str] = None) -> ScreeningSession:
+        """Create a fresh session positioned before the greeting, under ``tenant`` or the assistant's"""
+        return ScreeningSession(tenant=tenant or self.assistant.tenant)
+
+    def resume(self, session_id: str) -> Optional[ScreeningSession]:
+        """Load a session persisted earlier, from the store or else the event log"""
+        session = self.store.get(session_id) if self.store is not None else None
+        if session is None and self.event_log is not None:
+            session = self.event_log.restore(session_id)
+        return session
+
+    def step(self, session: ScreeningSession, text: str) -> Tuple[ScreeningSession, str]:
+        """Apply one candidate message and return the session with the assistant's reply
+
+        The session is updated in place and returned for convenience.
+        """
+        before = (session.current_stage, session.current_question_index, session.conversation_ended)
+        mark = self.event_log.mark(session) if self.event_log is not None else None
+        reply = self.assistant.process_user_input(session, text)
+        if mark is not None:
+            self.event_log.record(session, mark)
+        if before != (session.current_stage, session.current_question_index, session.conversation_ended):
+            if self.store is not None:
+                self.store.put(session)
+            if self.candidate_index is not None and session.current_stage == 9 and before[0] != 9:
+                self.candidate_index.add(session.session_id, session.candidate_info)
+        return session, reply
+
+    def end(self, session: ScreeningSession) -> ScreeningSession:
+        """End the conversation at the candidate's request, recording it like a step"""
+        if session.conversation_ended:
+            return session
+        mark = self.event_log.mark(session) if self.event_log is not None else None
+        session.conversation_ended = True
+        if mark is not None:
+            self.event_log.record(session, mark)
+        if self.store is not None:
+            self.store.put(session)
+        return session
+
+    def step_stream(self, session: ScreeningSession, text: str) -> Iterator[str]:
+        """Like step(), but yield the reply in chunks as they become available
+
+        The session is advanced before the first chunk. When a reply streamer
+        is configured, the acknowledgement of a technical answer is produced
+        by the model and streamed token by token ahead of the next question.
+        """
+        answered = len(session.conversation_history)
+        session, reply = self.step(session, text)
+        if self.reply_streamer is None or len(session.conversation_history) == answered:
+            yield reply
+            return
+
+        record = session.conversation_history[-1]
+        streamed = False
+        try:
+            for chunk in self._acknowledgement(question_text(record.question), record.answer, session.tenant):
+                streamed = True
+                yield chunk
+        except Overloaded as exc:
+            logger.warning("Streaming acknowledgement shed (%s); using the static reply", exc.reason)
+        except Exception:
+            logger.exception("Streaming acknowledgement failed; using the static reply")
+        if not streamed:
+            yield reply
+            return
+        if reply.startswith(ANSWER_ACKNOWLEDGEMENT):
+            reply = reply[len(ANSWER_ACKNOWLEDGEMENT):].lstrip("\n")
+        yield "\n\n" + reply
+
+    def _acknowledgement(self, question: str, answer: str, tenant: str) -> Iterator[str]:
+        chunks = self.reply_streamer.acknowledge(question, answer)
+        scheduler = self.assistant.scheduler
+        if scheduler is None:
+            yield from chunks
+            return
+        # The scheduler bounds opening the stream and waiting for its first
+        # token, the part that queues at the provider; the rest streams here
+        first = scheduler.run(next, chunks, None, kind="llm_replies", tenant=tenant,
+                              timeout=self.first_chunk_timeout)
+        if first is None:
+            return
+        yield first
+        yield from chunks
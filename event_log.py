@@ -0,0 +1,587 @@
+"""Append-only event log of screening transitions, for audit and replay.
+
+``ConversationEngine.step`` records every state change of a session as one
+NDJSON event holding only what changed (stage, candidate fields, assigned
+questions, new answers). Events go to numbered segment files
+(``events-000001.ndjson``, ...), written behind on a background thread
+through a buffered binary writer, so the request path only encodes a line.
+
+Every session starts with a snapshot record of its full state, and gets a
+fresh one after ``snapshot_every`` events or once its last snapshot is
+``rebase_segments`` segments old. An in-memory index keeps the file
+positions of each session's last snapshot and the events after it, so
+``restore`` reads O(events since snapshot) records whatever the log size.
+
+``compact`` writes snapshots of idle sessions into a fresh segment, drops
+finished screenings from the index and records a checkpoint: opening the
+log only scans segments from the checkpoint on, and ``prune=True`` deletes
+the segments before it. Without pruning the log keeps the full history,
+and ``replay`` streams it from disk, rebuilding each screening in order
+and holding only sessions still in progress::
+
+    TALENTSCOUT_EVENT_LOG=/var/lib/talentscout/events streamlit run app.py
+    python event_log.py replay /var/lib/talentscout/events --verify
+    python event_log.py show /var/lib/talentscout/events <session_id>
+
+One process writes a log directory at a time.
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import fields
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from engine import AnswerRecord, CandidateInfo, ScreeningSession, question_text
+
+logger = logging.getLogger(__name__)
+
+# Environment variable holding the event log directory used by the app and API server
+EVENT_LOG_ENV = "TALENTSCOUT_EVENT_LOG"
+
+CHECKPOINT_FILE = "CHECKPOINT"
+LOCK_FILE = "LOCK"
+_SEGMENT_RE = re.compile(r"^events-(\d{6})\.ndjson$")
+_INFO_FIELDS = tuple(f.name for f in fields(CandidateInfo))
+
+# Position of a record: (segment number, byte offset)
+Location = Tuple[int, int]
+
+
+def segment_name(number: int) -> str:
+    return f"events-{number:06d}.ndjson"
+
+
+def list_segments(directory: str) -> List[int]:
+    """Numbers of the segment files in a log directory, in order"""
+    numbers = []
+    for name in os.listdir(directory):
+        match = _SEGMENT_RE.match(name)
+        if match:
+            numbers.append(int(match.group(1)))
+    return sorted(numbers)
+
+
+def read_checkpoint(directory: str) -> int:
+    """First segment needed to restore sessions (1 until the log is compacted)"""
+    try:
+        with open(os.path.join(directory, CHECKPOINT_FILE), encoding="utf-8") as handle:
+            return int(json.load(handle)["segment"])
+    except FileNotFoundError:
+        return 1
+
+
+def mark_state(session: ScreeningSession) -> Tuple:
+    """Cheap summary of a session taken before a step, for ``diff_state``"""
+    info = session.candidate_info
+    return (session.current_stage, session.current_question_index, session.conversation_ended,
+            tuple(getattr(info, name) for name in _INFO_FIELDS), len(session.conversation_history),
+            session.technical_questions, len(session.technical_questions))
+
+
+def diff_state(session: ScreeningSession, mark: Tuple) -> Dict:
+    """Fields of the session changed since ``mark``, as event fields"""
+    stage, index, ended, info, answered, questions, asked = mark
+    event: Dict = {}
+    if session.current_stage != stage:
+        event["stage"] = session.current_stage
+    if session.current_question_index != index:
+        event["index"] = session.current_question_index
+    if session.conversation_ended != ended:
+        event["ended"] = session.conversation_ended
+    candidate_info = session.candidate_info
+    changed = {name: getattr(candidate_info, name) for name, old in zip(_INFO_FIELDS, info)
+               if getattr(candidate_info, name) != old}
+    if changed:
+        event["info"] = changed
+    if session.technical_questions is not questions or len(session.technical_questions) != asked:
+        event["questions"] = [question_text(question) for question in session.technical_questions]
+    if len(session.conversation_history) > answered:
+        # Question text, as in snapshots, so events survive a rebuilt question bank
+        event["answers"] = [[question_text(record.question), record.answer, record.answered_at]
+                            for record in session.conversation_history[answered:]]
+    return event
+
+
+def apply_event(session: ScreeningSession, event: Dict) -> ScreeningSession:
+    """Apply a step event to a session in place"""
+    if "stage" in event:
+        session.current_stage = event["stage"]
+    if "index" in event:
+        session.current_question_index = event["index"]
+    if "ended" in event:
+        session.conversation_ended = event["ended"]
+    for name, value in event.get("info", {}).items():
+        setattr(session.candidate_info, name, value)
+    if "questions" in event:
+        session.technical_questions = [sys.intern(question) for question in event["questions"]]
+    if "answers" in event:
+        session.conversation_history.extend(AnswerRecord(sys.intern(question), answer, answered_at)
+                                            for question, answer, answered_at in event["answers"])
+    return session
+
+
+def _finished(session: ScreeningSession) -> bool:
+    return session.current_stage == 9 or session.conversation_ended
+
+
+def iter_records(directory: str, start_segment: int = 1) -> Iterator[Dict]:
+    """Stream every record from ``start_segment`` on, in write order"""
+    loads = json.loads
+    for number in list_segments(directory):
+        if number < start_segment:
+            continue
+        with open(os.path.join(directory, segment_name(number)), "rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break  # torn write at the end of the log
+                yield loads(line)
+
+
+def replay(directory: str, on_mismatch: Optional[Callable[[ScreeningSession, Dict], None]] = None
+           ) -> Iterator[ScreeningSession]:
+    """Rebuild every screening in the log by streaming its events from disk
+
+    Sessions are yielded as they finish, then those still in progress at
+    the end of the log. Only unfinished sessions are held in memory. When a
+    snapshot record disagrees with the state rebuilt from the events before
+    it, ``on_mismatch(rebuilt, record)`` is called.
+    """
+    sessions: Dict[str, ScreeningSession] = {}
+    for record in iter_records(directory):
+        session_id, kind = record["sid"], record["type"]
+        if kind == "snapshot":
+            session = sessions.get(session_id)
+            if on_mismatch is not None and session is not None and session.to_dict() != record["state"]:
+                on_mismatch(session, record)
+            session = sessions[session_id] = ScreeningSession.from_dict(record["state"])
+        elif kind == "step":
+            session = sessions.get(session_id)
+            if session is None:
+                continue  # its earlier events were pruned
+            apply_event(session, record)
+        else:
+            sessions.pop(session_id, None)
+            continue
+        if _finished(session):
+            yield sessions.pop(session_id)
+    yield from sessions.values()
+
+
+class _Tail:
+    """Index entry: a session's event count and the records needed to restore it"""
+
+    __slots__ = ("count", "finished", "locations")
+
+    def __init__(self):
+        self.count = 0
+        self.finished = False
+        # Last snapshot first, then the events after it
+        self.locations: List[Location] = []
+
+
+class EventLog:
+    """Segmented, write-behind event log with per-session snapshots"""
+
+    def __init__(self, directory: str, segment_bytes: int = 64 << 20, snapshot_every: int = 32,
+                 rebase_segments: int = 4, compact_every: int = 8, flush_interval: float = 1.0,
+                 max_buffer: int = 1 << 20, fsync: bool = False):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.snapshot_every = snapshot_every
+        self.rebase_segments = rebase_segments
+        # Segments written between automatic compactions; 0 disables them
+        self.compact_every = compact_every
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._lock_handle = self._acquire_directory()
+
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._tails: Dict[str, _Tail] = {}
+        self._buffer: List[Tuple[int, bytes]] = []
+        self._buffered = 0
+        self._writer = None
+        self._writer_segment = 0
+        self.checkpoint = read_checkpoint(directory)
+        self._segment, self._size = self._load()
+        self._flushed: Location = (self._segment, self._size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _acquire_directory(self):
+        handle = open(os.path.join(self.directory, LOCK_FILE), "a")
+        try:
+            import fcntl
+        except ImportError:  # no advisory locks on this platform
+            return handle
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            raise RuntimeError(f"Event log {self.directory} is open in another process") from None
+        return handle
+
+    def _load(self) -> Location:
+        """Rebuild the index from the segments after the checkpoint; returns the write position"""
+        segments = [number for number in list_segments(self.directory) if number >= self.checkpoint]
+        for number in segments:
+            path = os.path.join(self.directory, segment_name(number))
+            offset = 0
+            with open(path, "rb") as handle:
+                for line in handle:
+                    if not line.endswith(b"\n"):
+                        break
+                    self._index(json.loads(line), (number, offset))
+                    offset += len(line)
+            if offset < os.path.getsize(path):
+                # Drop a record torn by a crash mid-write
+                os.truncate(path, offset)
+        if not segments:
+            return (self.checkpoint, 0)
+        return (segments[-1], os.path.getsize(os.path.join(self.directory, segment_name(segments[-1]))))
+
+    def _index(self, record: Dict, location: Location) -> None:
+        session_id, kind = record["sid"], record["type"]
+        if kind == "delete":
+            self._tails.pop(session_id, None)
+            return
+        tail = self._tails.get(session_id)
+        if kind == "snapshot":
+            if tail is None:
+                tail = self._tails[session_id] = _Tail()
+            tail.locations = [location]
+            state = record["state"]
+            tail.finished = state["current_stage"] == 9 or state["conversation_ended"]
+        elif tail is not None:
+            tail.locations.append(location)
+            tail.finished = tail.finished or record.get("stage") == 9 or bool(record.get("ended"))
+        else:
+            return
+        tail.count = record["n"]
+
+    def __len__(self) -> int:
+        return len(self._tails)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._tails
+
+    # -- writing -------------------------------------------------------------
+
+    @staticmethod
+    def mark(session: ScreeningSession) -> Tuple:
+        """Summary of a session before a step; pass it to ``record`` afterwards"""
+        return mark_state(session)
+
+    def record(self, session: ScreeningSession, mark: Tuple) -> None:
+        """Log the changes a step made to ``session`` since ``mark``, if any"""
+        event = diff_state(session, mark)
+        if not event:
+            return
+        session_id = session.session_id
+        now = int(time.time())
+        with self._cond:
+            tail = self._tails.get(session_id)
+            if tail is None:
+                # First event of a new session, or of one resumed from elsewhere
+                tail = self._tails[session_id] = _Tail()
+                self._snapshot(session, tail, now)
+            else:
+                tail.count += 1
+                event.update(sid=session_id, n=tail.count, ts=now, type="step")
+                tail.locations.append(self._append(event))
+                finished = _finished(session)
+                # Finished screenings take no more events, so they are not re-snapshotted
+                if not finished and (len(tail.locations) > self.snapshot_every
+                                     or tail.locations[0][0] <= self._segment - self.rebase_segments):
+                    self._snapshot(session, tail, now)
+                tail.finished = finished
+
+    def delete(self, session_id: str) -> None:
+        """Log that a session was discarded; it can no longer be restored"""
+        with self._cond:
+            tail = self._tails.pop(session_id, None)
+            count = tail.count + 1 if tail is not None else 1
+            self._append({"sid": session_id, "n": count, "ts": int(time.time()), "type": "delete"})
+
+    def _snapshot(self, session: ScreeningSession, tail: _Tail, now: int) -> None:
+        tail.count += 1
+        tail.finished = _finished(session)
+        tail.locations = [self._append({"sid": session.session_id, "n": tail.count, "ts": now,
+                                        "type": "snapshot", "state": session.to_dict()})]
+
+    def _append(self, record: Dict) -> Location:
+        """Encode a record into the write buffer and return its position; caller holds the lock"""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        if self._size >= self.segment_bytes:
+            self._segment, self._size = self._segment + 1, 0
+        location = (self._segment, self._size)
+        self._size += len(line)
+        self._buffer.append((self._segment, line))
+        self._buffered += len(line)
+        if self._buffered >= self.max_buffer:
+            self._cond.notify()
+        return location
+
+    def flush(self) -> None:
+        """Write every buffered record to its segment now
+
+        If a write fails, the segments are cut back to the last flushed
+        position, the records are queued again ahead of newer ones and the
+        error is raised.
+        """
+        with self._flush_lock:
+            with self._cond:
+                buffer, self._buffer, self._buffered = self._buffer, [], 0
+            if not buffer:
+                return
+            try:
+                for segment, line in buffer:
+                    if segment != self._writer_segment:
+                        if self._writer is not None:
+                            self._writer.close()
+                            self._writer = None
+                        self._writer = open(os.path.join(self.directory, segment_name(segment)), "ab",
+                                            buffering=1 << 20)
+                        self._writer_segment = segment
+                    self._writer.write(line)
+                self._writer.flush()
+                if self.fsync:
+                    os.fsync(self._writer.fileno())
+                self._flushed = (self._writer_segment, self._writer.tell())
+            except BaseException:
+                self._rewind(buffer)
+                raise
+
+    def _rewind(self, buffer: List[Tuple[int, bytes]]) -> None:
+        """Undo a partly written batch and queue it again; caller holds the flush lock"""
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except OSError:
+                pass  # its buffered bytes are cut off below anyway
+            self._writer, self._writer_segment = None, 0
+        # Index positions were assigned when the records were buffered, so
+        # the retry must write them at exactly the same offsets
+        flushed_segment, flushed_size = self._flushed
+        for segment in sorted({segment for segment, _ in buffer}):
+            path = os.path.join(self.directory, segment_name(segment))
+            try:
+                with open(path, "r+b") as handle:
+                    handle.truncate(flushed_size if segment == flushed_segment else 0)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                logger.exception("Could not cut back event log segment %s", path)
+        with self._cond:
+            self._buffer[:0] = buffer
+            self._buffered += sum(len(line) for _, line in buffer)
+
+    def _run(self) -> None:
+        failed = False
+        while True:
+            with self._cond:
+                # After a failed write, wait out the interval even if the buffer is full
+                if not self._closed and (failed or self._buffered < self.max_buffer):
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            try:
+                self.flush()
+                failed = False
+            except Exception:
+                failed = True
+                if closed:
+                    logger.exception("Event log write failed at close; %d bytes not saved", self._buffered)
+                else:
+                    logger.exception("Event log write failed; retrying in %.1fs", self.flush_interval)
+            if closed:
+                return
+            if not failed and self.compact_every and self._segment - self.checkpoint >= self.compact_every:
+                try:
+                    self.compact()
+                except Exception:
+                    logger.exception("Event log compaction failed")
+
+    # -- reading -------------------------------------------------------------
+
+    def _read(self, locations: List[Location]) -> List[Dict]:
+        records = []
+        handle, opened = None, 0
+        try:
+            for segment, offset in locations:
+                if segment != opened:
+                    if handle is not None:
+                        handle.close()
+                    handle = open(os.path.join(self.directory, segment_name(segment)), "rb")
+                    opened = segment
+                handle.seek(offset)
+                records.append(json.loads(handle.readline()))
+        finally:
+            if handle is not None:
+                handle.close()
+        return records
+
+    def restore(self, session_id: str) -> Optional[ScreeningSession]:
+        """Rebuild a session from its last snapshot and the events after it
+
+        Returns None for sessions the log does not index: unknown, deleted,
+        or finished before the last compaction (``replay`` still has those).
+        """
+        with self._cond:
+            tail = self._tails.get(session_id)
+            if tail is None:
+                return None
+            locations = list(tail.locations)
+        if locations[-1] >= self._flushed:
+            self.flush()
+        records = self._read(locations)
+        session = ScreeningSession.from_dict(records[0]["state"])
+        for event in records[1:]:
+            apply_event(session, event)
+        return session
+
+    def history(self, session_id: str) -> Iterator[Dict]:
+        """Every record of one session still on disk, by scanning the whole log"""
+        self.flush()
+        for record in iter_records(self.directory):
+            if record["sid"] == session_id:
+                yield record
+
+    # -- compaction ----------------------------------------------------------
+
+    def compact(self, prune: bool = False) -> int:
+        """Move every open session's restore point past the older segments
+
+        Sessions whose last snapshot sits in an older segment get a new one
+        in a fresh segment, and finished screenings leave the index. The
+        first segment still needed is recorded as the checkpoint and
+        returned; with ``prune`` the segments before it are deleted.
+        """
+        with self._compact_lock:
+            self.flush()
+            with self._cond:
+                if self._size:
+                    self._segment, self._size = self._segment + 1, 0
+                start = self._segment
+                stale = []
+                for session_id, tail in list(self._tails.items()):
+                    if tail.locations[0][0] >= start:
+                        continue
+                    if tail.finished:
+                        del self._tails[session_id]
+                    else:
+                        stale.append((session_id, list(tail.locations)))
+
+            for session_id, locations in stale:
+                session = ScreeningSession.from_dict(self._read(locations[:1])[0]["state"])
+                for event in self._read(locations[1:]):
+                    apply_event(session, event)
+                with self._cond:
+                    tail = self._tails.get(session_id)
+                    # Sessions that moved on meanwhile are rebased by a later compaction
+                    if tail is not None and tail.locations == locations:
+                        self._snapshot(session, tail, int(time.time()))
+
+            self.flush()
+            with self._cond:
+                checkpoint = min((tail.locations[0][0] for tail in self._tails.values()), default=start)
+            path = os.path.join(self.directory, CHECKPOINT_FILE)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as handle:
+                json.dump({"segment": checkpoint}, handle)
+            os.replace(f"{path}.tmp", path)
+            self.checkpoint = checkpoint
+            if prune:
+                for number in list_segments(self.directory):
+                    if number < checkpoint:
+                        os.remove(os.path.join(self.directory, segment_name(number)))
+            return checkpoint
+
+    def close(self) -> None:
+        """Flush buffered records and stop the writer thread"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+        self._lock_handle.close()
+
+
+def event_log_from_env() -> Optional[EventLog]:
+    """Open the log in TALENTSCOUT_EVENT_LOG when set, otherwise None"""
+    directory = os.environ.get(EVENT_LOG_ENV)
+    return EventLog(directory) if directory else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse  # the app imports this module; only the CLI needs argparse
+
+    parser = argparse.ArgumentParser(description="Inspect, replay and compact a screening event log")
+    commands = parser.add_subparsers(dest="command", required=True)
+    replay_parser = commands.add_parser("replay", help="rebuild every screening from the log")
+    replay_parser.add_argument("directory")
+    replay_parser.add_argument("--verify", action="store_true",
+                               help="check each snapshot against the state rebuilt from the events")
+    replay_parser.add_argument("--output", help="write the rebuilt sessions as NDJSON to this file")
+    show_parser = commands.add_parser("show", help="print the records of one session")
+    show_parser.add_argument("directory")
+    show_parser.add_argument("session_id")
+    compact_parser = commands.add_parser("compact", help="snapshot open sessions and checkpoint the log")
+    compact_parser.add_argument("directory")
+    compact_parser.add_argument("--prune", action="store_true", help="delete segments before the checkpoint")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        for record in iter_records(args.directory):
+            if record["sid"] == args.session_id:
+                print(json.dumps(record, ensure_ascii=False))
+        return 0
+
+    if args.command == "compact":
+        log = EventLog(args.directory, compact_every=0)
+        try:
+            checkpoint = log.compact(prune=args.prune)
+        finally:
+            log.close()
+        print(f"Checkpoint at segment {checkpoint}; {len(log)} open sessions indexed")
+        return 0
+
+    mismatches: List[str] = []
+    counts = {"sessions": 0, "completed": 0, "ended": 0}
+    out = open(args.output, "w", encoding="utf-8") if args.output else None
+    start = time.perf_counter()
+    try:
+        on_mismatch = (lambda session, record: mismatches.append(session.session_id)) if args.verify else None
+        for session in replay(args.directory, on_mismatch):
+            counts["sessions"] += 1
+            counts["completed"] += session.current_stage == 9
+            counts["ended"] += session.conversation_ended
+            if out is not None:
+                out.write(json.dumps(session.to_dict(), ensure_ascii=False))
+                out.write("\n")
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {counts['sessions']} sessions ({counts['completed']} completed, "
+          f"{counts['ended']} ended early) in {elapsed:.2f}s")
+    if args.verify:
+        print(f"{len(mismatches)} snapshot mismatches" + (f": {', '.join(mismatches[:10])}" if mismatches else ""))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Exit-intent detection for candidate messages.
+
+Exit phrases are compiled once into word-boundary regular expressions, so
+"end" no longer fires on "backend" and "stop" no longer fires on "desktop".
+Each conversation stage uses one of four modes:
+
+* ``"word"``: an exit phrase anywhere in the message, as whole words
+* ``"whole"``: the message is essentially only an exit phrase ("bye",
+  "ok, stop please"); used for short free-text answers such as the tech
+  stack, where words like "end" or "stop" appear legitimately
+* ``"exact"``: the message is only exit phrases, with at most an "ok" or
+  "please" around them ("bye", "ok bye"); used for names ("John Thanks")
+  and technical answers ("The end."), which may be any words at all
+* ``"off"``: never treat the message as an exit request
+"""
+
+import re
+from typing import Iterable, Mapping, Optional
+
+DEFAULT_EXIT_PHRASES = ["bye", "goodbye", "exit", "quit", "end", "stop", "thank you", "thanks"]
+
+# Stages with free-text answers: name (1), experience (4), position (5),
+# location (6), tech stack (7), technical answers (8)
+DEFAULT_STAGE_MODES = {1: "exact", 4: "whole", 5: "whole", 6: "whole", 7: "whole", 8: "exact"}
+
+# Words that may surround an exit phrase in "whole" mode ("ok bye now", "please stop")
+FILLER_WORDS = ["ok", "okay", "please", "now", "then", "so", "i", "want", "to", "would", "like",
+                "let's", "lets", "can", "we", "just", "and", "the", "chat", "conversation", "for"]
+
+# Words that may surround an exit phrase in "exact" mode ("ok bye", "bye now")
+INTERJECTIONS = ["ok", "okay", "please", "now"]
+
+MODES = ("word", "whole", "exact", "off")
+
+
+def _alternation(phrases: Iterable[str]) -> str:
+    # Longest first so "thank you" wins over a shorter overlapping phrase
+    ordered = sorted({p.strip().lower() for p in phrases if p.strip()}, key=len, reverse=True)
+    return "|".join(r"\s+".join(map(re.escape, phrase.split())) for phrase in ordered)
+
+
+class ExitIntentMatcher:
+    """Precompiled exit-intent matcher with per-stage modes"""
+
+    def __init__(self, phrases: Iterable[str] = DEFAULT_EXIT_PHRASES,
+                 stage_modes: Optional[Mapping[int, str]] = None, default_mode: str = "word"):
+        stage_modes = DEFAULT_STAGE_MODES if stage_modes is None else stage_modes
+        for mode in list(stage_modes.values()) + [default_mode]:
+            if mode not in MODES:
+                raise ValueError(f"Unknown exit intent mode {mode!r}; expected one of {MODES}")
+        self.phrases = list(phrases)
+        self.stage_modes = dict(stage_modes)
+        self.default_mode = default_mode
+
+        phrases_re = _alternation(self.phrases)
+        filler_re = _alternation(FILLER_WORDS)
+        # Hyphens, dots and @ count as word characters so "end-to-end", "stop.js"
+        # and "end@example.com" are not exits
+        self._word = re.compile(rf"(?<![\w\-.@])(?:{phrases_re})(?![\w\-@]|\.\w)", re.IGNORECASE)
+        self._whole = re.compile(
+            rf"^\W*(?:(?:{filler_re})\W+)*(?:{phrases_re})(?:\W+(?:{filler_re}|{phrases_re}))*\W*$",
+            re.IGNORECASE,
+        )
+        interjection_re = _alternation(INTERJECTIONS)
+        self._exact = re.compile(
+            rf"^\W*(?:(?:{interjection_re})\W+)*(?:{phrases_re})(?:\W+(?:{interjection_re}|{phrases_re}))*\W*$",
+            re.IGNORECASE,
+        )
+
+    def mode_for(self, stage: Optional[int]) -> str:
+        """Return the matching mode used at a conversation stage"""
+        return self.stage_modes.get(stage, self.default_mode)
+
+    def matches(self, text: str, stage: Optional[int] = None) -> bool:
+        """Check whether a message asks to end the conversation at the given stage"""
+        mode = self.mode_for(stage)
+        if mode == "word":
+            return self._word.search(text) is not None
+        if mode == "whole":
+            return self._whole.match(text) is not None
+        if mode == "exact":
+            return self._exact.match(text) is not None
+        return False
+
+
+# Built once at import and shared by every session
+DEFAULT_EXIT_MATCHER = ExitIntentMatcher()
@@ -0,0 +1,193 @@
+"""Optional LLM-backed technical question generation.
+
+Generated question sets are cached by a content hash of the normalized tech
+stack (LRU with TTL), and concurrent requests for the same stack share a
+single in-flight model call, so a common stack reaches the model once per
+TTL no matter how many candidates list it. An empty or unparseable answer
+is only cached for ``empty_ttl`` seconds, so one bad response does not send
+every candidate with that stack to the templates for the whole TTL.
+
+Enable it with ``TALENTSCOUT_LLM_QUESTIONS=1``. The OpenAI client reads
+``OPENAI_API_KEY`` and ``OPENAI_BASE_URL`` as usual; point the latter at
+``tools/stub_llm_server.py`` to run without a real model.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from question_bank import get_question_bank
+
+LLM_QUESTIONS_ENV = "TALENTSCOUT_LLM_QUESTIONS"
+LLM_MODEL_ENV = "TALENTSCOUT_LLM_MODEL"
+DEFAULT_MODEL = "gpt-4o-mini"
+
+_NUMBERING_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+SYSTEM_PROMPT = (
+    "You are a technical interviewer screening job candidates. "
+    "Ask clear, specific questions that can be answered in a few sentences."
+)
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 86400.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value``, expiring after ``ttl`` seconds instead of the cache's own when given"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def normalize_stack(tech_stack: str) -> Tuple[str, ...]:
+    """Canonical, order-independent form of a tech stack
+
+    Known technologies are resolved through the bank's matcher; segments
+    with no known technology are kept as lowercase text.
+    """
+    matcher = get_question_bank().matcher
+    techs = set()
+    for segment in re.split(r"[,;|\n]", tech_stack.lower()):
+        segment = " ".join(segment.split())
+        if not segment:
+            continue
+        found = matcher.find(segment)
+        techs.update(found if found else [segment])
+    return tuple(sorted(techs))
+
+
+def parse_questions(text: str) -> List[str]:
+    """Split a model reply into one question per non-empty line"""
+    questions = []
+    for line in text.splitlines():
+        line = _NUMBERING_RE.sub("", line).strip()
+        if line:
+            questions.append(line)
+    return questions
+
+
+class LLMQuestionGenerator:
+    """Generates question sets with a chat model, cached per normalized stack"""
+
+    def __init__(self, client=None, model: str = DEFAULT_MODEL, max_questions: int = 5,
+                 cache_size: int = 1024, ttl: float = 86400.0, timeout: float = 20.0,
+                 empty_ttl: float = 30.0):
+        self._client = client
+        self.model = model
+        self.max_questions = max_questions
+        self.timeout = timeout
+        self.cache = TTLCache(cache_size, ttl)
+        # Seconds an empty model answer is cached; 0 asks the model again every time
+        self.empty_ttl = empty_ttl
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.model_calls = 0
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use"""
+        if self._client is None:
+            import openai
+
+            self._client = openai.OpenAI(timeout=self.timeout)
+        return self._client
+
+    def cache_key(self, techs: Tuple[str, ...]) -> str:
+        """Content address of a request: model, question count and normalized stack"""
+        payload = "\x1f".join((self.model, str(self.max_questions)) + techs)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def cached(self, tech_stack: str) -> Optional[List[str]]:
+        """Questions for a tech stack if no model call is needed, otherwise None"""
+        techs = normalize_stack(tech_stack)
+        if not techs:
+            return []
+        cached = self.cache.get(self.cache_key(techs))
+        return list(cached) if cached is not None else None
+
+    def generate(self, tech_stack: str) -> List[str]:
+        """Return questions for a tech stack, calling the model at most once per stack"""
+        techs = normalize_stack(tech_stack)
+        if not techs:
+            return []
+        key = self.cache_key(techs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return list(future.result(timeout=self.timeout))
+
+        try:
+            questions = self._call_model(techs)
+            if questions:
+                self.cache.set(key, tuple(questions))
+            elif self.empty_ttl > 0:
+                self.cache.set(key, (), ttl=self.empty_ttl)
+            future.set_result(tuple(questions))
+            return questions
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _call_model(self, techs: Tuple[str, ...]) -> List[str]:
+        with self._lock:
+            self.model_calls += 1
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": (
+                    f"Write {self.max_questions} technical interview questions for a candidate "
+                    f"whose tech stack is: {', '.join(techs)}. "
+                    "Return one question per line with no numbering or extra text."
+                )},
+            ],
+            temperature=0.7,
+        )
+        return parse_questions(response.choices[0].message.content or "")[:self.max_questions]
+
+
+def question_generator_from_env() -> Optional[LLMQuestionGenerator]:
+    """Build a generator when TALENTSCOUT_LLM_QUESTIONS is enabled, otherwise None"""
+    if os.environ.get(LLM_QUESTIONS_ENV, "").lower() not in ("1", "true", "yes"):
+        return None
+    return LLMQuestionGenerator(model=os.environ.get(LLM_MODEL_ENV, DEFAULT_MODEL))
@@ -0,0 +1,64 @@
+"""Optional model-written replies, streamed token by token.
+
+Enable with ``TALENTSCOUT_LLM_REPLIES=1``. The acknowledgement after each
+technical answer is then written by a chat model and rendered while it is
+generated, so the candidate waits for the first token rather than the whole
+reply. Like ``llm_questions.py`` it uses the standard ``OPENAI_*`` variables
+and works against ``tools/stub_llm_server.py``.
+"""
+
+import os
+from typing import Iterator, Optional
+
+from llm_questions import DEFAULT_MODEL, LLM_MODEL_ENV
+
+LLM_REPLIES_ENV = "TALENTSCOUT_LLM_REPLIES"
+
+ACKNOWLEDGE_PROMPT = (
+    "You are a friendly technical interviewer. In one or two sentences, thank the "
+    "candidate for their answer and note one strength of it. Do not reveal the correct "
+    "answer and do not ask a new question."
+)
+
+
+class LLMReplyStreamer:
+    """Streams short model-written replies from a chat completions API"""
+
+    def __init__(self, client=None, model: str = DEFAULT_MODEL, timeout: float = 20.0,
+                 max_tokens: int = 80):
+        self._client = client
+        self.model = model
+        self.timeout = timeout
+        self.max_tokens = max_tokens
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use"""
+        if self._client is None:
+            import openai
+
+            self._client = openai.OpenAI(timeout=self.timeout)
+        return self._client
+
+    def acknowledge(self, question: str, answer: str) -> Iterator[str]:
+        """Yield an acknowledgement of a technical answer as it is generated"""
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": ACKNOWLEDGE_PROMPT},
+                {"role": "user", "content": f"Question: {question}\nAnswer: {answer}"},
+            ],
+            max_tokens=self.max_tokens,
+            temperature=0.3,
+            stream=True,
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+def reply_streamer_from_env() -> Optional[LLMReplyStreamer]:
+    """Build a streamer when TALENTSCOUT_LLM_REPLIES is enabled, otherwise None"""
+    if os.environ.get(LLM_REPLIES_ENV, "").lower() not in ("1", "true", "yes"):
+        return None
+    return LLMReplyStreamer(model=os.environ.get(LLM_MODEL_ENV, DEFAULT_MODEL))
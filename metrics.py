@@ -0,0 +1,326 @@
+"""Lightweight in-process metrics with Prometheus text exposition.
+
+Counters, gauges and histograms are plain dicts keyed by label values
+behind a per-metric lock, and timers use ``time.perf_counter``, so
+recording a sample costs a few microseconds. ``REGISTRY.render()``
+produces the Prometheus text format served by ``GET /metrics`` on the API
+server, or by a background HTTP server for the Streamlit app when
+``TALENTSCOUT_METRICS_PORT`` is set::
+
+    TALENTSCOUT_METRICS_PORT=9108 streamlit run app.py
+    curl http://127.0.0.1:9108/metrics
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+METRICS_PORT_ENV = "TALENTSCOUT_METRICS_PORT"
+METRICS_HOST_ENV = "TALENTSCOUT_METRICS_HOST"
+METRICS_PANEL_ENV = "TALENTSCOUT_METRICS_PANEL"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "_values", "_key")
+
+    def __init__(self, lock: threading.Lock, values: Dict, key: Tuple[str, ...]):
+        self._lock, self._values, self._key = lock, values, key
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[self._key] = self._values.get(self._key, 0.0) + amount
+
+
+class Counter:
+    """Monotonic counter with optional labels
+
+    ``labels(...)`` returns a child bound to one label set; hot paths keep
+    children around instead of passing labels on every increment.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._children: Dict[Tuple[str, ...], _CounterChild] = {}
+
+    def labels(self, *labels: str) -> _CounterChild:
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children.setdefault(labels, _CounterChild(self._lock, self._values, labels))
+        return child
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.labels(*labels).inc(amount)
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> Iterator[str]:
+        for labels, value in sorted(self.samples().items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class _GaugeChild:
+    __slots__ = ("_lock", "_values", "_key")
+
+    def __init__(self, lock: threading.Lock, values: Dict, key: Tuple[str, ...]):
+        self._lock, self._values, self._key = lock, values, key
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._values[self._key] = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[self._key] = self._values.get(self._key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+
+class Gauge(Counter):
+    """Value that can go up and down, such as a queue depth"""
+
+    kind = "gauge"
+
+    def labels(self, *labels: str) -> _GaugeChild:
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children.setdefault(labels, _GaugeChild(self._lock, self._values, labels))
+        return child
+
+    def set(self, value: float, *labels: str) -> None:
+        self.labels(*labels).set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_buckets", "_counts", "_sum")
+
+    def __init__(self, lock: threading.Lock, buckets: Tuple[float, ...]):
+        self._lock = lock
+        self._buckets = buckets
+        # One count per bucket, the last one for +Inf
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of a with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], _HistogramChild] = {}
+
+    def labels(self, *labels: str) -> _HistogramChild:
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children.setdefault(labels, _HistogramChild(self._lock, self.buckets))
+        return child
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.labels(*labels).observe(value)
+
+    def time(self, *labels: str):
+        """Observe the duration of a with-block"""
+        return self.labels(*labels).time()
+
+    def _snapshot(self) -> List[Tuple[Tuple[str, ...], List[int], float]]:
+        with self._lock:
+            return sorted((labels, list(child._counts), child._sum) for labels, child in self._children.items())
+
+    def count(self, *labels: str) -> int:
+        child = self._children.get(labels)
+        return sum(child._counts) if child else 0
+
+    def quantile(self, q: float, *labels: str) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket it falls in"""
+        child = self._children.get(labels)
+        if child is None:
+            return None
+        with self._lock:
+            counts = list(child._counts)
+        total = sum(counts)
+        if not total:
+            return None
+        rank, seen = q * total, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def render(self) -> Iterator[str]:
+        for labels, counts, total in self._snapshot():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Registry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+FUNNEL_STAGES = ["greeting", "name", "email", "phone", "experience", "position", "location",
+                 "tech_stack", "technical_questions", "completed"]
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "talentscout_stage_seconds", "Time to process one candidate message, by conversation stage", ["stage"])
+STAGE_TRANSITIONS = REGISTRY.counter(
+    "talentscout_stage_transitions_total", "Conversation stage transitions", ["from_stage", "to_stage"])
+VALIDATION_FAILURES = REGISTRY.counter(
+    "talentscout_validation_failures_total", "Candidate inputs rejected by stage validation", ["stage"])
+EXIT_INTENTS = REGISTRY.counter(
+    "talentscout_exit_intents_total", "Conversations ended by exit intent, by stage", ["stage"])
+QUESTION_GENERATION_SECONDS = REGISTRY.histogram(
+    "talentscout_question_generation_seconds", "Time to select technical questions, by source", ["source"])
+RENDER_SECONDS = REGISTRY.histogram(
+    "talentscout_render_seconds", "Streamlit script run time, by page section", ["section"])
+SCHEDULER_QUEUE_DEPTH = REGISTRY.gauge(
+    "talentscout_scheduler_queue_depth", "Work items waiting for a scheduler worker, by priority", ["priority"])
+SCHEDULER_SHED = REGISTRY.counter(
+    "talentscout_scheduler_shed_total", "Work refused or dropped by the scheduler, by kind and reason",
+    ["kind", "reason"])
+SCHEDULER_WAIT_SECONDS = REGISTRY.histogram(
+    "talentscout_scheduler_wait_seconds", "Time work waited in the scheduler queue, by kind", ["kind"])
+MIGRATED_SESSIONS = REGISTRY.counter(
+    "talentscout_migrated_sessions_total", "Sessions handed between cluster workers, by membership change",
+    ["reason"])
+
+
+def funnel() -> List[Tuple[str, int]]:
+    """Number of stage entries per conversation stage, in funnel order"""
+    entered: Dict[str, float] = {}
+    for (_, to_stage), value in STAGE_TRANSITIONS.samples().items():
+        entered[to_stage] = entered.get(to_stage, 0.0) + value
+    return [(stage, int(entered.get(stage, 0))) for stage in FUNNEL_STAGES[1:]]
+
+
+def make_handler(registry: Registry):
+    # http.server is only needed when a metrics port is configured
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0].rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def start_http_server(port: int, host: str = "127.0.0.1", registry: Registry = REGISTRY) -> "ThreadingHTTPServer":
+    """Serve ``GET /metrics`` on a daemon thread and return the server"""
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), make_handler(registry))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def metrics_server_from_env() -> Optional["ThreadingHTTPServer"]:
+    """Start the metrics HTTP server if TALENTSCOUT_METRICS_PORT is set"""
+    port = os.environ.get(METRICS_PORT_ENV)
+    if not port:
+        return None
+    return start_http_server(int(port), os.environ.get(METRICS_HOST_ENV, "127.0.0.1"))
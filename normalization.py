@@ -0,0 +1,375 @@
+"""Normalization of candidate input: validation, canonical forms and PII.
+
+One precompiled pipeline shared by the stage machine, the candidate index
+and the exporters:
+
+* ``validate_email`` and ``validate_phone`` use module-level compiled
+  patterns
+* ``parse_experience`` turns free text ("3-5 yrs", "eighteen months",
+  "fresher") into a numeric range of years
+* ``to_e164`` canonicalizes phone numbers that carry a country code.
+  Ten-digit numbers written without one only get a country code when the
+  deployment sets ``TALENTSCOUT_DEFAULT_COUNTRY_CODE``; otherwise they
+  are kept as the digits entered
+* ``canonical_location`` collapses spacing and separators, capitalizes
+  place names and resolves common aliases ("nyc, usa" -> "New York, United
+  States"); ``location_keys`` gives the lowercase forms the index searches
+* ``PIIPolicy`` leaves names, emails and phones in clear, redacts them or
+  replaces them with keyed HMAC-SHA256 pseudonyms in exports
+  (``TALENTSCOUT_PII_MODE``, ``TALENTSCOUT_PII_HASH_KEY``)
+
+Free-text values repeat heavily across candidates ("5 years", "Berlin,
+Germany"), so parsing is memoized and normalizing a record with warm
+caches costs a few dict lookups. ``normalize_file`` streams the pipeline
+over NDJSON, either batch screening input or bulk export records::
+
+    TALENTSCOUT_PII_HASH_KEY=... python normalization.py screenings.ndjson normalized.ndjson --pii hash
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import re
+import sys
+from datetime import date
+from functools import lru_cache
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+COUNTRY_CODE_ENV = "TALENTSCOUT_DEFAULT_COUNTRY_CODE"
+PII_MODE_ENV = "TALENTSCOUT_PII_MODE"
+PII_HASH_KEY_ENV = "TALENTSCOUT_PII_HASH_KEY"
+
+# No country is assumed for numbers written without a code unless configured
+DEFAULT_COUNTRY_CODE: Optional[str] = None
+PII_MODES = ("clear", "redact", "hash")
+PII_FIELDS = ("full_name", "email", "phone")
+
+EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+PHONE_RE = re.compile(r"^\+?[1-9]\d{9,14}$")
+_PHONE_SEPARATORS_RE = re.compile(r"[\s\-\(\)]")
+# Emails and phone numbers written inside free-text answers
+_EMAIL_IN_TEXT_RE = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+_PHONE_IN_TEXT_RE = re.compile(r"\+?\(?\d[\d\s().-]{8,}\d")
+# Every digit but the last two
+_MASKED_DIGIT_RE = re.compile(r"\d(?=(?:\D*\d){2})")
+_PHONE_PUNCTUATION = str.maketrans("", "", " \t\n\r\f\v().-+")
+
+_NUM = r"\d+(?:\.\d+)?"
+_NUMBER = rf"({_NUM})"
+_EXPERIENCE_RANGE_RE = re.compile(rf"{_NUMBER}\s*(?:-|–|to)\s*{_NUMBER}")
+_EXPERIENCE_NUMBER_RE = re.compile(rf"{_NUMBER}\s*(\+)?\s*(years?|yrs?|y|months?|mos?)?\b")
+# Numbers from here on are calendar years ("since 2015"), not years of experience
+_FIRST_YEAR = 1900
+_YEAR = r"((?:19|20)\d{2})"
+_EXPERIENCE_SINCE_RE = re.compile(
+    rf"\b(?:since|from|starting|started(?: in)?)\s+(?:[a-z]+\.?\s+)?{_YEAR}\b"
+    rf"|\b{_YEAR}\s*(?:-|–|to)\s*(?:present|now|today|date)\b"
+)
+_EXPERIENCE_NONE_RE = re.compile(r"\b(?:none|no experience|fresher|fresh graduate|entry[- ]level|beginner)\b")
+_WORD_NUMBERS = {"zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+                 "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12,
+                 "fifteen": 15, "eighteen": 18, "twenty": 20}
+_WORD_NUMBER_RE = re.compile(r"\b(" + "|".join(_WORD_NUMBERS) + r")\b")
+
+_LOCATION_SEPARATORS_RE = re.compile(r"[,;/|]")
+# Words kept lowercase inside place names ("Rio de Janeiro", "Frankfurt am Main")
+_PLACE_PARTICLES = {"de", "da", "do", "dos", "das", "del", "la", "le", "am", "an", "der", "upon", "on"}
+
+# Lowercase spellings of places, mapped to their canonical names
+LOCATION_ALIASES = {
+    "usa": "United States", "us": "United States", "u.s.": "United States", "u.s.a.": "United States",
+    "united states of america": "United States", "america": "United States",
+    "uk": "United Kingdom", "u.k.": "United Kingdom", "great britain": "United Kingdom",
+    "england": "United Kingdom", "uae": "United Arab Emirates",
+    "deutschland": "Germany", "brasil": "Brazil", "españa": "Spain", "espana": "Spain",
+    "nyc": "New York", "new york city": "New York", "ny": "New York",
+    "sf": "San Francisco", "la": "Los Angeles", "dc": "Washington", "washington dc": "Washington",
+    "washington d.c.": "Washington", "bangalore": "Bengaluru", "bombay": "Mumbai",
+    "madras": "Chennai", "calcutta": "Kolkata", "gurgaon": "Gurugram", "munich": "München",
+    "muenchen": "München", "cologne": "Köln", "koeln": "Köln", "sao paulo": "São Paulo",
+}
+
+
+def validate_email(email: str) -> bool:
+    """Whether ``email`` looks like an email address"""
+    return EMAIL_RE.match(email) is not None
+
+
+def validate_phone(phone: str) -> bool:
+    """Whether ``phone`` has 10 to 15 digits, ignoring spaces, dashes and parentheses"""
+    return PHONE_RE.match(_PHONE_SEPARATORS_RE.sub("", phone)) is not None
+
+
+def normalize_email(email: str) -> str:
+    """Email with surrounding spaces removed and the domain lowercased"""
+    local, at, domain = email.strip().rpartition("@")
+    return f"{local}{at}{domain.lower()}" if at else email.strip()
+
+
+@lru_cache(maxsize=4096)
+def to_e164(phone: str, default_country_code: Optional[str] = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """E.164 form of a phone number ("+1 (415) 555-0123" -> "+14155550123"), or None
+
+    Numbers with a leading ``+`` or more than ten digits are taken to
+    include their country code; ten-digit numbers get ``default_country_code``.
+    None when the number is invalid, or has ten digits and no default is given.
+    """
+    cleaned = _PHONE_SEPARATORS_RE.sub("", phone.strip())
+    if PHONE_RE.match(cleaned) is None:
+        return None
+    digits = cleaned.lstrip("+")
+    if not cleaned.startswith("+") and len(digits) == 10:
+        if not default_country_code:
+            return None
+        digits = default_country_code + digits
+    return "+" + digits if len(digits) <= 15 else None
+
+
+def parse_experience(text: str) -> Optional[Tuple[float, float]]:
+    """Parse free-text experience into a (low, high) range of years
+
+    "5 years" -> (5, 5), "3-5 yrs" -> (3, 5), "10+" -> (10, 10),
+    "18 months" -> (1.5, 1.5), "fresher" -> (0, 0). Calendar years count
+    as time elapsed: "since 2015" and "2015 - present" give the years since
+    then and "2015-2020" gives (5, 5). Other year-like numbers are ignored.
+    None when no number is found.
+    """
+    return _parse_experience(text, date.today().year)
+
+
+@lru_cache(maxsize=4096)
+def _parse_experience(text: str, current_year: int) -> Optional[Tuple[float, float]]:
+    text = text.lower().strip()
+    text = _WORD_NUMBER_RE.sub(lambda m: str(_WORD_NUMBERS[m.group(1)]), text)
+    for match in _EXPERIENCE_RANGE_RE.finditer(text):
+        low, high = float(match.group(1)), float(match.group(2))
+        if low >= _FIRST_YEAR and high >= _FIRST_YEAR:
+            span = abs(high - low)
+            return (span, span)
+        if max(low, high) < _FIRST_YEAR:
+            return (min(low, high), max(low, high))
+    # A number with a unit ("4 years") wins over "since 2019"; a bare number does not
+    bare = None
+    for match in _EXPERIENCE_NUMBER_RE.finditer(text):
+        years = float(match.group(1))
+        if years >= _FIRST_YEAR:
+            continue
+        if not match.group(3):
+            bare = years if bare is None else bare
+            continue
+        if match.group(3).startswith("mo"):
+            years /= 12
+        return (years, years)
+    match = _EXPERIENCE_SINCE_RE.search(text)
+    if match:
+        years = float(max(current_year - int(match.group(1) or match.group(2)), 0))
+        return (years, years)
+    if bare is not None:
+        return (bare, bare)
+    if _EXPERIENCE_NONE_RE.search(text):
+        return (0.0, 0.0)
+    return None
+
+
+def _place_name(place: str) -> str:
+    """Canonical spelling of one place: alias target, or words capitalized"""
+    alias = LOCATION_ALIASES.get(place.lower())
+    if alias:
+        return alias
+    if len(place) == 2 and place.isalpha():
+        # State and country codes: "ca" -> "CA"
+        return place.upper()
+    # Lowercase and shouted words are capitalized; "NY" or "McAllen" are kept as written
+    words = [word.capitalize() if word.islower() or (word.isupper() and len(word) > 3) else word
+             for word in place.split()]
+    return " ".join([words[0]] + [word.lower() if word.lower() in _PLACE_PARTICLES else word
+                                  for word in words[1:]])
+
+
+@lru_cache(maxsize=4096)
+def canonical_location(text: str) -> str:
+    """Canonical form of a location ("berlin ,  germany" -> "Berlin, Germany")"""
+    places = (" ".join(part.split()) for part in _LOCATION_SEPARATORS_RE.split(text))
+    return ", ".join(dict.fromkeys(_place_name(place) for place in places if place))
+
+
+def location_key(place: str) -> str:
+    """Lowercase search key of one place, resolving aliases ("NYC" -> "new york")"""
+    place = " ".join(place.split())
+    return LOCATION_ALIASES.get(place.lower(), place).lower()
+
+
+@lru_cache(maxsize=4096)
+def location_keys(text: str) -> Tuple[str, ...]:
+    """Search keys of the places in a location ("Berlin, Germany" -> berlin, germany)"""
+    places = (part for part in _LOCATION_SEPARATORS_RE.split(text) if part.strip())
+    return tuple(dict.fromkeys(location_key(place) for place in places))
+
+
+def _mask_phone(match: "re.Match") -> str:
+    # Runs of fewer than ten digits are dates, years or versions rather than phone numbers
+    return "[phone]" if len(match.group().translate(_PHONE_PUNCTUATION)) >= 10 else match.group()
+
+
+class PIIPolicy:
+    """How names, emails and phone numbers appear in exports
+
+    ``clear`` exports them as collected, ``redact`` masks them (initials,
+    first letter and domain of the email, last two digits of the phone) and
+    ``hash`` replaces them with keyed HMAC-SHA256 pseudonyms of their
+    normalized form, so one candidate can be joined across exports without
+    revealing who they are. Outside ``clear``, emails and phone numbers
+    written into technical answers are masked as well.
+    """
+
+    def __init__(self, mode: str = "clear", key: Optional[bytes] = None):
+        if mode not in PII_MODES:
+            raise ValueError(f"Unsupported PII mode {mode!r}; expected one of {PII_MODES}")
+        if mode == "hash" and not key:
+            # Unkeyed hashes of emails and phone numbers are reversed by guessing
+            raise ValueError(f"Hashing PII needs a secret key; set {PII_HASH_KEY_ENV}")
+        self.mode = mode
+        self.key = key
+
+    @property
+    def clear(self) -> bool:
+        return self.mode == "clear"
+
+    def pseudonym(self, value: str) -> str:
+        """Keyed, stable pseudonym of a normalized value"""
+        return hmac.new(self.key, value.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+    def apply(self, info: Dict) -> Dict:
+        """Apply the policy to the PII fields of a candidate dict, in place"""
+        if self.clear:
+            return info
+        name, email, phone = (info.get(field) or "" for field in PII_FIELDS)
+        if self.mode == "hash":
+            info["full_name"] = self.pseudonym(" ".join(name.lower().split())) if name else ""
+            info["email"] = self.pseudonym(normalize_email(email).lower()) if email else ""
+            info["phone"] = self.pseudonym(to_e164(phone) or phone) if phone else ""
+        else:
+            info["full_name"] = " ".join(f"{word[0]}." for word in name.split())
+            local, at, domain = email.rpartition("@")
+            info["email"] = f"{local[:1]}***@{domain}" if at else ("***" if email else "")
+            info["phone"] = _MASKED_DIGIT_RE.sub("*", phone)
+        return info
+
+    def scrub(self, text: str) -> str:
+        """Mask emails and phone numbers written in free text"""
+        if self.clear:
+            return text
+        text = _EMAIL_IN_TEXT_RE.sub("[email]", text)
+        return _PHONE_IN_TEXT_RE.sub(_mask_phone, text)
+
+
+class Normalizer:
+    """Canonical candidate records under a PII policy"""
+
+    def __init__(self, pii: Optional[PIIPolicy] = None, default_country_code: Optional[str] = DEFAULT_COUNTRY_CODE):
+        self.pii = pii or PIIPolicy()
+        # Country code for ten-digit numbers written without one; None keeps them as entered
+        self.default_country_code = default_country_code or None
+
+    def phone(self, phone: str) -> Optional[str]:
+        """E.164 form of a valid phone number, its digits as entered if the country is unknown, else None"""
+        if not validate_phone(phone):
+            return None
+        return to_e164(phone, self.default_country_code) or _PHONE_SEPARATORS_RE.sub("", phone.strip())
+
+    def candidate(self, info: Dict) -> Dict:
+        """Canonical copy of candidate fields, with numeric experience
+
+        Adds ``experience_min_years`` and ``experience_max_years`` (None when
+        the text has no number) and applies the PII policy.
+        """
+        record = dict(info)
+        if record.get("email"):
+            record["email"] = normalize_email(record["email"])
+        if record.get("phone"):
+            record["phone"] = self.phone(record["phone"]) or record["phone"]
+        if record.get("current_location"):
+            record["current_location"] = canonical_location(record["current_location"])
+        experience = parse_experience(record.get("experience_years") or "")
+        record["experience_min_years"], record["experience_max_years"] = experience or (None, None)
+        return self.pii.apply(record)
+
+    def export_record(self, record: Dict) -> Dict:
+        """Normalize a bulk export record, or a batch screening profile record"""
+        if "candidate_info" not in record:
+            record = self.candidate(record)
+            if "technical_answers" in record and not self.pii.clear:
+                record["technical_answers"] = [self.pii.scrub(answer) for answer in record["technical_answers"]]
+            return record
+        record = dict(record, candidate_info=self.candidate(record["candidate_info"]))
+        if not self.pii.clear:
+            record["technical_qa"] = [dict(entry, answer=self.pii.scrub(entry["answer"]))
+                                      for entry in record.get("technical_qa", [])]
+        return record
+
+    def records(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        for record in records:
+            yield self.export_record(record)
+
+
+def normalize_file(source: IO[str], out: IO[str], normalizer: Normalizer) -> int:
+    """Normalize NDJSON records from ``source`` into ``out``, returning how many were written"""
+    count = 0
+    loads, dumps, write = json.loads, json.dumps, out.write
+    for line in source:
+        if not line.strip():
+            continue
+        write(dumps(normalizer.export_record(loads(line)), ensure_ascii=False))
+        write("\n")
+        count += 1
+    return count
+
+
+def pii_policy_from_env(mode: Optional[str] = None) -> PIIPolicy:
+    """PII policy from TALENTSCOUT_PII_MODE (or ``mode``) and TALENTSCOUT_PII_HASH_KEY"""
+    key = os.environ.get(PII_HASH_KEY_ENV)
+    return PIIPolicy(mode or os.environ.get(PII_MODE_ENV, "clear"), key.encode("utf-8") if key else None)
+
+
+def normalizer_from_env(pii_mode: Optional[str] = None) -> Normalizer:
+    """Normalizer with the PII policy and default country code from the environment"""
+    return Normalizer(pii_policy_from_env(pii_mode), os.environ.get(COUNTRY_CODE_ENV, DEFAULT_COUNTRY_CODE))
+
+
+@lru_cache(maxsize=None)
+def get_normalizer() -> Normalizer:
+    """Return the process-wide normalizer, configured from the environment"""
+    return normalizer_from_env()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse  # the engine imports this module; only the CLI needs argparse
+
+    parser = argparse.ArgumentParser(description="Normalize candidate records in an NDJSON file")
+    parser.add_argument("input", help="NDJSON input, or - for stdin")
+    parser.add_argument("output", help="NDJSON output, or - for stdout")
+    parser.add_argument("--pii", choices=PII_MODES, help=f"PII handling (default: ${PII_MODE_ENV} or clear)")
+    parser.add_argument("--country-code", default=os.environ.get(COUNTRY_CODE_ENV, DEFAULT_COUNTRY_CODE),
+                        help="country code for phone numbers written without one")
+    args = parser.parse_args(argv)
+
+    try:
+        normalizer = Normalizer(pii_policy_from_env(args.pii), args.country_code)
+    except ValueError as exc:
+        parser.error(str(exc))
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        count = normalize_file(source, out, normalizer)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"Normalized {count} records", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
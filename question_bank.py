@@ -0,0 +1,199 @@
+"""Packed, memory-mapped question bank.
+
+A bank file is laid out as (all integers little-endian)::
+
+    header      magic b"TSQB", u16 version, u16 flags,
+                u32 tech count, u32 question count, u32 names blob length
+    tech table  per technology, sorted by name:
+                u32 name offset, u32 name length, u32 first question id, u32 question count
+    offsets     u32 per question plus one end sentinel, into the question blob
+    names blob  UTF-8 technology names
+    questions   UTF-8 question texts, back to back
+
+Opening a bank maps the file read-only, so processes serving the same bank
+share its pages through the OS page cache. Only the technology table is
+decoded up front; a question's text is decoded when it is actually asked.
+
+Build a bank from a JSON file shaped like ``QUESTION_TEMPLATES``::
+
+    python question_bank.py build templates.json questions.qbank
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from questions import QUESTION_TEMPLATES, TECH_ALIASES, TECH_CATEGORIES
+from tech_matcher import TechMatcher
+
+MAGIC = b"TSQB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIII")
+_TECH_ENTRY = struct.Struct("<IIII")
+_OFFSET = struct.Struct("<I")
+
+# Environment variable pointing the app at a prebuilt bank file
+QUESTION_BANK_ENV = "TALENTSCOUT_QUESTION_BANK"
+
+
+class QuestionBankError(ValueError):
+    """Raised when a bank file is malformed or of an unsupported version"""
+
+
+def pack_question_bank(templates: Mapping[str, Sequence[str]]) -> bytes:
+    """Serialize a technology -> questions mapping into the bank format"""
+    names = bytearray()
+    tech_table = bytearray()
+    offsets = bytearray()
+    blob = bytearray()
+    question_id = 0
+
+    for tech in sorted(templates):
+        encoded_name = tech.encode("utf-8")
+        questions = templates[tech]
+        tech_table += _TECH_ENTRY.pack(len(names), len(encoded_name), question_id, len(questions))
+        names += encoded_name
+        for question in questions:
+            offsets += _OFFSET.pack(len(blob))
+            blob += question.encode("utf-8")
+        question_id += len(questions)
+
+    offsets += _OFFSET.pack(len(blob))
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(templates), question_id, len(names))
+    return b"".join((header, tech_table, offsets, names, blob))
+
+
+def build_question_bank(templates: Mapping[str, Sequence[str]], path: str) -> None:
+    """Write a bank file, replacing any existing file atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(pack_question_bank(templates))
+    os.replace(tmp_path, path)
+
+
+class QuestionBank:
+    """Read-only view over a packed question bank"""
+
+    def __init__(self, buffer, mapped: Optional[mmap.mmap] = None):
+        self._buffer = buffer
+        self._mmap = mapped
+
+        if len(buffer) < _HEADER.size:
+            raise QuestionBankError("Question bank is truncated")
+        magic, version, _flags, tech_count, question_count, names_len = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise QuestionBankError("Not a question bank file")
+        if version != VERSION:
+            raise QuestionBankError(f"Unsupported question bank version {version}")
+
+        self._question_count = question_count
+        self._offsets_start = _HEADER.size + tech_count * _TECH_ENTRY.size
+        names_start = self._offsets_start + (question_count + 1) * _OFFSET.size
+        self._blob_start = names_start + names_len
+
+        self._techs: Dict[str, Tuple[int, int]] = {}
+        for i in range(tech_count):
+            name_offset, name_len, first_id, count = _TECH_ENTRY.unpack_from(
+                buffer, _HEADER.size + i * _TECH_ENTRY.size
+            )
+            start = names_start + name_offset
+            name = buffer[start:start + name_len].decode("utf-8")
+            self._techs[name] = (first_id, count)
+        self._matcher: Optional[TechMatcher] = None
+
+    @classmethod
+    def open(cls, path: str) -> "QuestionBank":
+        """Memory-map a bank file"""
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, mapped)
+
+    @classmethod
+    def from_templates(cls, templates: Mapping[str, Sequence[str]]) -> "QuestionBank":
+        """Build an in-memory bank, used when no bank file is configured"""
+        return cls(pack_question_bank(templates))
+
+    def close(self) -> None:
+        """Release the underlying mapping"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __len__(self) -> int:
+        return self._question_count
+
+    def __contains__(self, tech: str) -> bool:
+        return tech in self._techs
+
+    def technologies(self) -> List[str]:
+        """Return every technology the bank has questions for"""
+        return list(self._techs)
+
+    def count(self, tech: str) -> int:
+        """Return the number of questions stored for a technology"""
+        return self._techs.get(tech, (0, 0))[1]
+
+    def question_ids(self, tech: str) -> range:
+        """Return the ids of a technology's questions"""
+        first_id, count = self._techs.get(tech, (0, 0))
+        return range(first_id, first_id + count)
+
+    def text(self, question_id: int) -> str:
+        """Decode a single question"""
+        if not 0 <= question_id < self._question_count:
+            raise IndexError(f"Question id {question_id} out of range")
+        start, = _OFFSET.unpack_from(self._buffer, self._offsets_start + question_id * _OFFSET.size)
+        end, = _OFFSET.unpack_from(self._buffer, self._offsets_start + (question_id + 1) * _OFFSET.size)
+        return self._buffer[self._blob_start + start:self._blob_start + end].decode("utf-8")
+
+    def questions(self, tech: str, limit: Optional[int] = None) -> List[str]:
+        """Decode the first ``limit`` questions of a technology"""
+        ids = self.question_ids(tech)
+        if limit is not None:
+            ids = ids[:limit]
+        return [self.text(question_id) for question_id in ids]
+
+    @property
+    def matcher(self) -> TechMatcher:
+        """Tech stack matcher covering the bank's technologies, built on first use"""
+        if self._matcher is None:
+            self._matcher = TechMatcher.from_catalog(self._techs, TECH_CATEGORIES, TECH_ALIASES)
+        return self._matcher
+
+
+@lru_cache(maxsize=None)
+def get_question_bank() -> QuestionBank:
+    """Return the process-wide bank, from TALENTSCOUT_QUESTION_BANK or the built-in templates"""
+    path = os.environ.get(QUESTION_BANK_ENV)
+    if path:
+        return QuestionBank.open(path)
+    return QuestionBank.from_templates(QUESTION_TEMPLATES)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point for building and inspecting bank files"""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 3 and argv[0] == "build":
+        with open(argv[1], encoding="utf-8") as handle:
+            templates = json.load(handle)
+        build_question_bank(templates, argv[2])
+        print(f"Wrote {sum(len(q) for q in templates.values())} questions "
+              f"for {len(templates)} technologies to {argv[2]}")
+        return 0
+    if len(argv) == 2 and argv[0] == "info":
+        bank = QuestionBank.open(argv[1])
+        print(f"{len(bank.technologies())} technologies, {len(bank)} questions")
+        bank.close()
+        return 0
+    print("Usage: python question_bank.py build <templates.json> <out.qbank>\n"
+          "       python question_bank.py info <bank.qbank>", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""Seeded, de-duplicated question sampling with cohort exposure balancing.
+
+``QuestionSampler.sample`` turns a ``QuestionPlan`` (see role_profiles.py)
+into the question ids asked to one candidate:
+
+* each technology's quota is drawn without replacement from its question
+  pool by a lazy Fisher-Yates shuffle seeded per candidate (the session id),
+  so a draw costs O(1) however large the pool is and a session can always
+  be replayed
+* a question already drawn for the candidate, by id or by normalized text,
+  is skipped, so overlapping technologies never repeat a question
+* each quota is oversampled (two draws per slot by default), and the
+  drawn questions the cohort has seen least are kept, using exposure
+  counters in a shared ``ExposureStore``
+
+Per candidate that is one ``counts`` and one ``increment`` call on the
+store, plus O(k) draws and text decodes for k questions, independent of
+bank size. The counters need not be exact: under concurrent selection two
+candidates may read the same counts, which only delays the balancing. They
+are keyed by a hash of the question text (``question_key``) rather than the
+bank position, so they carry over when the bank is rebuilt or replaced.
+
+Cohorts default to ``"<role>:<seniority>"``; pass another key, such as a
+job requisition, to balance exposure per hiring round instead::
+
+    TALENTSCOUT_EXPOSURE_STORE=sqlite:///exposure.db streamlit run app.py
+"""
+
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from question_bank import QuestionBank, get_question_bank
+
+# Environment variable holding the exposure store URL shared by app processes
+EXPOSURE_STORE_ENV = "TALENTSCOUT_EXPOSURE_STORE"
+
+_MASK64 = (1 << 64) - 1
+
+
+def question_key(text: str) -> int:
+    """Stable 63-bit key of a question's normalized text, used by exposure counters"""
+    normalized = " ".join(text.lower().split())
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "little") >> 1
+
+
+class ExposureStore:
+    """Interface shared by question exposure counters"""
+
+    def counts(self, cohort: str, question_keys: Sequence[int]) -> List[int]:
+        """Times each question (by ``question_key``) has been selected in the cohort"""
+        raise NotImplementedError
+
+    def increment(self, cohort: str, question_keys: Sequence[int]) -> None:
+        """Record one more selection of each question (by ``question_key``) in the cohort"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryExposureStore(ExposureStore):
+    """Process-local exposure counters"""
+
+    def __init__(self):
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def counts(self, cohort: str, question_keys: Sequence[int]) -> List[int]:
+        get = self._counts.get
+        return [get((cohort, question), 0) for question in question_keys]
+
+    def increment(self, cohort: str, question_keys: Sequence[int]) -> None:
+        with self._lock:
+            for question in question_keys:
+                key = (cohort, question)
+                self._counts[key] = self._counts.get(key, 0) + 1
+
+    def snapshot(self, cohort: str) -> Dict[int, int]:
+        """Exposure count per question key of a cohort"""
+        with self._lock:
+            return {question: count for (key, question), count in self._counts.items() if key == cohort}
+
+
+class FrozenExposureStore(ExposureStore):
+    """Exposure counters that always read zero, for replays that must not depend on history
+
+    With every count equal, the sampler keeps the first draws of each quota,
+    so the questions depend on the seed alone.
+    """
+
+    def counts(self, cohort: str, question_keys: Sequence[int]) -> List[int]:
+        return [0] * len(question_keys)
+
+    def increment(self, cohort: str, question_keys: Sequence[int]) -> None:
+        pass
+
+
+class SQLiteExposureStore(ExposureStore):
+    """Exposure counters in an SQLite database, shared by processes on one host"""
+
+    def __init__(self, path: str):
+        import sqlite3  # only shared deployments pay for loading it
+
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # Counters were once keyed by bank position in an "exposure" table;
+            # those cannot be mapped to questions and are left unused
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS question_exposure ("
+                " cohort TEXT NOT NULL,"
+                " question_key INTEGER NOT NULL,"
+                " count INTEGER NOT NULL,"
+                " PRIMARY KEY (cohort, question_key)) WITHOUT ROWID"
+            )
+
+    def counts(self, cohort: str, question_keys: Sequence[int]) -> List[int]:
+        if not question_keys:
+            return []
+        placeholders = ",".join("?" * len(question_keys))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT question_key, count FROM question_exposure"
+                f" WHERE cohort = ? AND question_key IN ({placeholders})",
+                (cohort, *question_keys),
+            ).fetchall()
+        found = dict(rows)
+        return [found.get(question, 0) for question in question_keys]
+
+    def increment(self, cohort: str, question_keys: Sequence[int]) -> None:
+        if not question_keys:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO question_exposure (cohort, question_key, count) VALUES (?, ?, 1)"
+                " ON CONFLICT(cohort, question_key) DO UPDATE SET count = count + 1",
+                [(cohort, question) for question in question_keys],
+            )
+
+    def snapshot(self, cohort: str) -> Dict[int, int]:
+        with self._lock:
+            return dict(self._conn.execute(
+                "SELECT question_key, count FROM question_exposure WHERE cohort = ?", (cohort,)).fetchall())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_exposure_store(url: str) -> ExposureStore:
+    """Open an exposure store from a ``memory://`` or ``sqlite:///`` URL"""
+    if url.startswith("memory://"):
+        return InMemoryExposureStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteExposureStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported exposure store URL: {url!r}")
+
+
+def _seed_state(seed: Optional[Hashable]) -> int:
+    """64-bit generator state for a seed, stable across processes (unlike ``hash``)"""
+    if seed is None:
+        return int.from_bytes(os.urandom(8), "little")
+    return int.from_bytes(hashlib.blake2b(repr(seed).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _splitmix64(state: int) -> Iterator[int]:
+    """Stream of 64-bit pseudo-random integers
+
+    Seeding a ``random.Random`` costs several microseconds per candidate,
+    more than all of their draws together; splitmix64 needs no set-up.
+    """
+    while True:
+        state = (state + 0x9E3779B97F4A7C15) & _MASK64
+        z = state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        yield z ^ (z >> 31)
+
+
+def _draws(pool: Sequence[int], bits: Iterator[int]) -> Iterator[int]:
+    """Items of ``pool`` in random order, shuffling lazily: O(1) time and space per draw"""
+    # Positions swapped so far; untouched positions hold their own index
+    swapped: Dict[int, int] = {}
+    size = len(pool)
+    for position in range(size):
+        # Multiply-shift maps 64 random bits onto [position, size)
+        other = position + ((next(bits) * (size - position)) >> 64)
+        picked = swapped.get(other, other)
+        swapped[other] = swapped.get(position, position)
+        yield pool[picked]
+
+
+class QuestionSampler:
+    """Draws a candidate's questions from a plan, balancing exposure per cohort"""
+
+    def __init__(self, bank: Optional[QuestionBank] = None, exposure: Optional[ExposureStore] = None,
+                 oversample: int = 2, text_cache_size: int = 65536):
+        self.bank = bank or get_question_bank()
+        self.exposure = exposure if exposure is not None else InMemoryExposureStore()
+        # Draws per slot; the least exposed of them are asked
+        self.oversample = max(1, oversample)
+        # Stable keys of recently drawn questions, for de-duplication and exposure counters
+        self._key = lru_cache(maxsize=text_cache_size)(self._question_key)
+
+    def _question_key(self, question_id: int) -> int:
+        return question_key(self.bank.text(question_id))
+
+    def sample(self, plan, seed: Optional[Hashable] = None, cohort: Optional[str] = None) -> List[int]:
+        """Question ids for one candidate, highest-weight technology first
+
+        The same ``seed`` and exposure counts always give the same questions.
+        """
+        bits = _splitmix64(_seed_state(seed))
+        cohort = cohort or f"{plan.role}:{plan.seniority}"
+
+        seen_ids: Set[int] = set()
+        seen_keys: Set[int] = set()
+        drawn: List[List[int]] = []
+        for pool, quota in zip(plan.pools, plan.quotas):
+            candidates: List[int] = []
+            if quota:
+                for question_id in _draws(pool, bits):
+                    if question_id in seen_ids:
+                        continue
+                    key = self._key(question_id)
+                    if key in seen_keys:
+                        continue
+                    seen_ids.add(question_id)
+                    seen_keys.add(key)
+                    candidates.append(question_id)
+                    if len(candidates) == quota * self.oversample:
+                        break
+            drawn.append(candidates)
+
+        flat = [question_id for candidates in drawn for question_id in candidates]
+        exposure = dict(zip(flat, self.exposure.counts(cohort, [self._key(question_id) for question_id in flat])))
+
+        chosen: List[int] = []
+        spare: List[int] = []
+        for candidates, quota in zip(drawn, plan.quotas):
+            # Least exposed first; the random draw order breaks ties
+            ranked = sorted(candidates, key=exposure.__getitem__)
+            chosen.extend(ranked[:quota])
+            spare.extend(ranked[quota:])
+        # Technologies short of unique questions leave their slots to the others
+        shortfall = sum(plan.quotas) - len(chosen)
+        if shortfall > 0:
+            chosen.extend(sorted(spare, key=exposure.__getitem__)[:shortfall])
+
+        self.exposure.increment(cohort, [self._key(question_id) for question_id in chosen])
+        return chosen
+
+
+@lru_cache(maxsize=None)
+def get_question_sampler() -> QuestionSampler:
+    """Return the process-wide sampler, sharing counters via TALENTSCOUT_EXPOSURE_STORE when set"""
+    url = os.environ.get(EXPOSURE_STORE_ENV)
+    return QuestionSampler(exposure=open_exposure_store(url) if url else None)
@@ -0,0 +1,471 @@
+"""Technology catalog used for technical question generation.
+
+Everything here is plain data, built once at import and shared by every
+session, so lookups never reallocate the catalog per request.
+"""
+
+from typing import Dict, List
+
+QUESTION_TEMPLATES: Dict[str, List[str]] = {
+    "python": [
+        "Explain the difference between list and tuple in Python and when you would use each.",
+        "What are Python decorators and can you provide a simple example?",
+        "How do you handle exceptions in Python? Explain try-except blocks.",
+        "What is the difference between '==' and 'is' operators in Python?",
+        "Explain list comprehensions in Python and provide an example.",
+        "What are Python generators and when would you use them?"
+    ],
+    "r": [
+        "What is the difference between data.frame and matrix in R?",
+        "Explain the concept of vectorization in R with an example.",
+        "How do you handle missing values (NA) in R?",
+        "What are R packages and how do you install them?",
+        "Explain the apply family of functions in R."
+    ],
+    "java": [
+        "Explain the concept of Object-Oriented Programming in Java.",
+        "What is the difference between ArrayList and LinkedList in Java?",
+        "Explain the concept of inheritance and polymorphism in Java.",
+        "What are Java interfaces and when would you use them?"
+    ],
+    "javascript": [
+        "Explain the difference between 'var', 'let', and 'const' in JavaScript.",
+        "What are JavaScript promises and how do they work?",
+        "Explain the concept of closures in JavaScript with an example.",
+        "What is the difference between '==' and '===' in JavaScript?"
+    ],
+    "react": [
+        "What are React hooks and why are they useful?",
+        "Explain the difference between state and props in React.",
+        "What is the virtual DOM and how does it improve performance?",
+        "How do you handle forms in React applications?"
+    ],
+    "django": [
+        "Explain the MVC pattern in Django and how it's implemented.",
+        "What are Django models and how do you define relationships between them?",
+        "How do you handle user authentication in Django?",
+        "What is Django ORM and how does it work?"
+    ],
+    "sql": [
+        "Explain the difference between INNER JOIN and LEFT JOIN.",
+        "What are database indexes and when should you use them?",
+        "How do you optimize a slow SQL query?",
+        "Explain the concept of database normalization.",
+        "What is the difference between WHERE and HAVING clauses?",
+        "How do you handle NULL values in SQL queries?"
+    ],
+    "mysql": [
+        "What are the different storage engines in MySQL?",
+        "Explain the difference between MyISAM and InnoDB.",
+        "How do you optimize MySQL queries for better performance?",
+        "What is database replication in MySQL?"
+    ],
+    "postgresql": [
+        "What are the advantages of PostgreSQL over other databases?",
+        "Explain ACID properties in PostgreSQL.",
+        "What are PostgreSQL indexes and how do they work?",
+        "How do you handle concurrent transactions in PostgreSQL?"
+    ],
+    "aws": [
+        "What are the main differences between EC2, ECS, and Lambda?",
+        "Explain the concept of S3 bucket policies and IAM roles.",
+        "How do you ensure high availability in AWS architecture?",
+        "What is the difference between RDS and DynamoDB?"
+    ],
+    "pandas": [
+        "What is the difference between DataFrame and Series in pandas?",
+        "How do you handle missing data in pandas?",
+        "Explain groupby operations in pandas with an example.",
+        "What are pandas indexes and how do you use them?"
+    ],
+    "numpy": [
+        "What is the difference between NumPy arrays and Python lists?",
+        "Explain broadcasting in NumPy with an example.",
+        "How do you perform matrix operations in NumPy?",
+        "What are NumPy universal functions (ufuncs)?"
+    ],
+    "machine learning": [
+        "Explain the difference between supervised and unsupervised learning.",
+        "What is overfitting and how do you prevent it?",
+        "Explain the bias-variance tradeoff in machine learning.",
+        "What are the different types of cross-validation techniques?"
+    ],
+    "data science": [
+        "What is the typical data science workflow?",
+        "How do you handle outliers in your data?",
+        "Explain the difference between correlation and causation.",
+        "What are the key steps in exploratory data analysis?"
+    ]
+}
+
+# Tech stack categories for better question generation
+TECH_CATEGORIES: Dict[str, List[str]] = {
+    "programming_languages": ["python", "java", "javascript", "c++", "c#", "go", "rust", "php", "ruby", "swift", "kotlin"],
+    "web_frameworks": ["django", "flask", "fastapi", "react", "angular", "vue", "nodejs", "express", "spring", "laravel"],
+    "databases": ["mysql", "postgresql", "mongodb", "redis", "sqlite", "oracle", "cassandra", "elasticsearch"],
+    "cloud_platforms": ["aws", "azure", "gcp", "docker", "kubernetes", "terraform"],
+    "data_science": ["pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "matplotlib", "seaborn"],
+    "mobile": ["react native", "flutter", "android", "ios", "xamarin"]
+}
+
+# Alternative spellings mapped to their canonical technology name
+TECH_ALIASES: Dict[str, str] = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "reactjs": "react",
+    "react.js": "react",
+    "node": "nodejs",
+    "node.js": "nodejs",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "spring boot": "spring",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "golang": "go",
+    "cpp": "c++",
+    "csharp": "c#",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "tf": "tensorflow",
+    "torch": "pytorch",
+    "ml": "machine learning",
+    "deep learning": "machine learning",
+    "rstats": "r",
+    "sql server": "sql",
+    "mssql": "sql",
+    "data analysis": "data science",
+}
+
+# Terms that pull in the data science / machine learning questions
+DATA_SCIENCE_KEYWORDS: List[str] = ["data", "analytics", "statistics", "ml", "ai", "analysis"]
+
+# Reference key points a good answer covers, keyed by question text; used by answer_scoring.py
+QUESTION_KEY_POINTS: Dict[str, List[str]] = {
+    # python
+    "Explain the difference between list and tuple in Python and when you would use each.": [
+        "lists are mutable and can be changed in place",
+        "tuples are immutable and hashable so they can be dictionary keys",
+        "use tuples for fixed records and lists for collections that grow",
+    ],
+    "What are Python decorators and can you provide a simple example?": [
+        "a decorator is a function that wraps another function",
+        "adds behaviour without modifying the original function",
+        "applied with the @ syntax, for example logging or timing",
+    ],
+    "How do you handle exceptions in Python? Explain try-except blocks.": [
+        "code that may fail goes in the try block",
+        "except catches specific exception types",
+        "finally always runs for cleanup and else runs when no exception is raised",
+    ],
+    "What is the difference between '==' and 'is' operators in Python?": [
+        "== compares values for equality",
+        "is compares object identity, whether both names refer to the same object",
+        "use is for None checks",
+    ],
+    "Explain list comprehensions in Python and provide an example.": [
+        "concise syntax to build a list from an iterable",
+        "expression followed by a for clause and an optional if filter",
+        "for example squares = [x * x for x in range(10)]",
+    ],
+    "What are Python generators and when would you use them?": [
+        "generators produce values lazily with yield",
+        "they keep state between calls and are memory efficient",
+        "useful for large or infinite sequences and streaming data",
+    ],
+    # r
+    "What is the difference between data.frame and matrix in R?": [
+        "a matrix holds a single data type",
+        "a data frame columns can have different types",
+        "data frames are used for tabular datasets",
+    ],
+    "Explain the concept of vectorization in R with an example.": [
+        "operations apply to whole vectors at once instead of loops",
+        "vectorized code is faster and more concise",
+        "for example adding two vectors element wise with x + y",
+    ],
+    "How do you handle missing values (NA) in R?": [
+        "detect missing values with is.na",
+        "remove them with na.omit or na.rm = TRUE",
+        "impute missing values with the mean, median or a model",
+    ],
+    "What are R packages and how do you install them?": [
+        "packages bundle reusable functions, data and documentation",
+        "install with install.packages from CRAN",
+        "load with library",
+    ],
+    "Explain the apply family of functions in R.": [
+        "apply works over matrix rows or columns",
+        "lapply returns a list and sapply simplifies the result",
+        "they replace explicit loops over elements",
+    ],
+    # java
+    "Explain the concept of Object-Oriented Programming in Java.": [
+        "classes and objects model data and behaviour",
+        "encapsulation, inheritance, polymorphism and abstraction",
+        "access modifiers hide implementation details",
+    ],
+    "What is the difference between ArrayList and LinkedList in Java?": [
+        "ArrayList is backed by a dynamic array with fast random access",
+        "LinkedList is a doubly linked list with fast insertion and removal",
+        "ArrayList is usually the better default",
+    ],
+    "Explain the concept of inheritance and polymorphism in Java.": [
+        "inheritance lets a subclass extend a parent class and reuse its code",
+        "polymorphism lets a parent type reference call overridden methods",
+        "method overriding at runtime and overloading at compile time",
+    ],
+    "What are Java interfaces and when would you use them?": [
+        "an interface defines a contract of abstract methods",
+        "a class can implement multiple interfaces",
+        "use them to decouple code and support multiple implementations",
+    ],
+    # javascript
+    "Explain the difference between 'var', 'let', and 'const' in JavaScript.": [
+        "var is function scoped and hoisted",
+        "let and const are block scoped",
+        "const cannot be reassigned",
+    ],
+    "What are JavaScript promises and how do they work?": [
+        "a promise represents the eventual result of an asynchronous operation",
+        "states are pending, fulfilled and rejected",
+        "handled with then and catch or async await",
+    ],
+    "Explain the concept of closures in JavaScript with an example.": [
+        "a closure is a function that remembers variables from its outer scope",
+        "the inner function keeps access after the outer function returns",
+        "used for private state, for example a counter function",
+    ],
+    "What is the difference between '==' and '===' in JavaScript?": [
+        "== compares after type coercion",
+        "=== compares value and type without coercion",
+        "prefer strict equality === to avoid surprises",
+    ],
+    # react
+    "What are React hooks and why are they useful?": [
+        "hooks let function components use state and lifecycle features",
+        "useState for state and useEffect for side effects",
+        "reuse stateful logic with custom hooks instead of classes",
+    ],
+    "Explain the difference between state and props in React.": [
+        "props are passed from parent to child and are read only",
+        "state is managed inside the component and can change",
+        "changing state triggers a re render",
+    ],
+    "What is the virtual DOM and how does it improve performance?": [
+        "the virtual DOM is an in memory representation of the real DOM",
+        "React diffs the new virtual tree against the previous one",
+        "only the changed parts of the real DOM are updated",
+    ],
+    "How do you handle forms in React applications?": [
+        "controlled components keep input values in state",
+        "onChange handlers update state and onSubmit handles submission",
+        "validation, uncontrolled inputs with refs or libraries like Formik",
+    ],
+    # django
+    "Explain the MVC pattern in Django and how it's implemented.": [
+        "Django follows model view template MVT",
+        "models define data, views handle request logic, templates render HTML",
+        "URL routing maps requests to views",
+    ],
+    "What are Django models and how do you define relationships between them?": [
+        "models are Python classes mapped to database tables",
+        "ForeignKey for one to many relationships",
+        "ManyToManyField and OneToOneField for other relationships",
+    ],
+    "How do you handle user authentication in Django?": [
+        "built in django.contrib.auth with the User model",
+        "login, logout and authenticate functions and session middleware",
+        "login_required decorator and permissions to protect views",
+    ],
+    "What is Django ORM and how does it work?": [
+        "the ORM maps models to tables and queries to SQL",
+        "QuerySets are lazy and chainable with filter and exclude",
+        "select_related and prefetch_related avoid extra queries",
+    ],
+    # sql
+    "Explain the difference between INNER JOIN and LEFT JOIN.": [
+        "INNER JOIN returns only rows that match in both tables",
+        "LEFT JOIN returns all rows from the left table",
+        "unmatched right side columns are NULL in a LEFT JOIN",
+    ],
+    "What are database indexes and when should you use them?": [
+        "an index is a data structure such as a B-tree that speeds up lookups",
+        "use on columns in WHERE, JOIN and ORDER BY clauses",
+        "indexes slow down writes and use extra storage",
+    ],
+    "How do you optimize a slow SQL query?": [
+        "inspect the execution plan with EXPLAIN",
+        "add appropriate indexes and avoid full table scans",
+        "select only needed columns and rewrite joins or subqueries",
+    ],
+    "Explain the concept of database normalization.": [
+        "organize tables to reduce redundancy and update anomalies",
+        "normal forms such as 1NF, 2NF and 3NF",
+        "split data into related tables linked by keys",
+    ],
+    "What is the difference between WHERE and HAVING clauses?": [
+        "WHERE filters rows before grouping",
+        "HAVING filters groups after GROUP BY",
+        "HAVING can use aggregate functions",
+    ],
+    "How do you handle NULL values in SQL queries?": [
+        "test with IS NULL and IS NOT NULL instead of equals",
+        "COALESCE or IFNULL replace NULL with a default",
+        "NULL propagates through expressions and is ignored by aggregates",
+    ],
+    # mysql
+    "What are the different storage engines in MySQL?": [
+        "InnoDB is the default transactional engine",
+        "MyISAM, MEMORY, CSV and ARCHIVE engines",
+        "engines differ in locking, transactions and durability",
+    ],
+    "Explain the difference between MyISAM and InnoDB.": [
+        "InnoDB supports transactions and foreign keys",
+        "InnoDB uses row level locking, MyISAM uses table level locking",
+        "InnoDB has crash recovery",
+    ],
+    "How do you optimize MySQL queries for better performance?": [
+        "use EXPLAIN to analyze the query plan",
+        "add indexes and avoid SELECT *",
+        "use the slow query log and tune buffer pool settings",
+    ],
+    "What is database replication in MySQL?": [
+        "copies data from a primary server to replica servers",
+        "based on the binary log",
+        "used for read scaling, backups and high availability",
+    ],
+    # postgresql
+    "What are the advantages of PostgreSQL over other databases?": [
+        "standards compliant and extensible open source database",
+        "rich data types such as JSONB, arrays and full text search",
+        "MVCC concurrency and strong ACID guarantees",
+    ],
+    "Explain ACID properties in PostgreSQL.": [
+        "atomicity means a transaction is all or nothing",
+        "consistency keeps constraints valid and isolation separates concurrent transactions",
+        "durability through the write ahead log",
+    ],
+    "What are PostgreSQL indexes and how do they work?": [
+        "B-tree is the default index type",
+        "GIN, GiST, BRIN and hash indexes for other workloads",
+        "partial and expression indexes, checked with EXPLAIN",
+    ],
+    "How do you handle concurrent transactions in PostgreSQL?": [
+        "MVCC gives each transaction a snapshot so readers do not block writers",
+        "isolation levels read committed, repeatable read and serializable",
+        "row locks with SELECT FOR UPDATE and handling deadlocks",
+    ],
+    # aws
+    "What are the main differences between EC2, ECS, and Lambda?": [
+        "EC2 provides virtual machines you manage",
+        "ECS runs and orchestrates containers",
+        "Lambda runs serverless functions triggered by events and billed per invocation",
+    ],
+    "Explain the concept of S3 bucket policies and IAM roles.": [
+        "bucket policies are resource based JSON policies attached to a bucket",
+        "IAM roles grant temporary credentials to services or users",
+        "follow least privilege with allow and deny statements",
+    ],
+    "How do you ensure high availability in AWS architecture?": [
+        "deploy across multiple availability zones",
+        "load balancers and auto scaling groups",
+        "multi AZ databases, backups and health checks",
+    ],
+    "What is the difference between RDS and DynamoDB?": [
+        "RDS is a managed relational SQL database",
+        "DynamoDB is a managed NoSQL key value store",
+        "DynamoDB scales horizontally with predictable latency",
+    ],
+    # pandas
+    "What is the difference between DataFrame and Series in pandas?": [
+        "a Series is a one dimensional labeled array",
+        "a DataFrame is a two dimensional table of columns",
+        "each DataFrame column is a Series",
+    ],
+    "How do you handle missing data in pandas?": [
+        "detect missing values with isna or isnull",
+        "drop them with dropna",
+        "fill them with fillna or interpolate",
+    ],
+    "Explain groupby operations in pandas with an example.": [
+        "split apply combine pattern",
+        "group rows by one or more columns",
+        "aggregate with sum, mean or agg, for example df.groupby('city').mean()",
+    ],
+    "What are pandas indexes and how do you use them?": [
+        "the index labels rows for alignment and lookup",
+        "set_index and reset_index change the index",
+        "select with loc by label and iloc by position",
+    ],
+    # numpy
+    "What is the difference between NumPy arrays and Python lists?": [
+        "arrays store a single data type in contiguous memory",
+        "vectorized operations are much faster than loops over lists",
+        "lists can hold mixed types and grow dynamically",
+    ],
+    "Explain broadcasting in NumPy with an example.": [
+        "broadcasting applies operations to arrays of different shapes",
+        "smaller dimensions are stretched to match without copying",
+        "for example adding a scalar or a row vector to a matrix",
+    ],
+    "How do you perform matrix operations in NumPy?": [
+        "matrix multiplication with the @ operator or np.dot",
+        "transpose with .T and element wise operations",
+        "np.linalg for inverse, determinant and eigenvalues",
+    ],
+    "What are NumPy universal functions (ufuncs)?": [
+        "ufuncs are vectorized functions that operate element wise",
+        "implemented in C for speed, such as np.add, np.exp and np.sqrt",
+        "support broadcasting and methods like reduce and accumulate",
+    ],
+    # machine learning
+    "Explain the difference between supervised and unsupervised learning.": [
+        "supervised learning trains on labeled data",
+        "unsupervised learning finds structure in unlabeled data",
+        "classification and regression versus clustering and dimensionality reduction",
+    ],
+    "What is overfitting and how do you prevent it?": [
+        "the model fits noise in the training data and generalizes poorly",
+        "regularization, dropout and simpler models",
+        "cross validation, early stopping and more training data",
+    ],
+    "Explain the bias-variance tradeoff in machine learning.": [
+        "bias is error from overly simple assumptions and causes underfitting",
+        "variance is sensitivity to the training data and causes overfitting",
+        "balance model complexity to minimize total error",
+    ],
+    "What are the different types of cross-validation techniques?": [
+        "k fold cross validation",
+        "stratified k fold keeps class proportions",
+        "leave one out and time series split",
+    ],
+    # data science
+    "What is the typical data science workflow?": [
+        "define the problem and collect data",
+        "clean the data and explore it",
+        "build, evaluate and deploy models and communicate results",
+    ],
+    "How do you handle outliers in your data?": [
+        "detect outliers with z scores, IQR or box plots",
+        "investigate whether they are errors or real values",
+        "remove, cap or transform them, or use robust methods",
+    ],
+    "Explain the difference between correlation and causation.": [
+        "correlation is a statistical association between variables",
+        "causation means one variable directly affects another",
+        "confounding variables; establish causation with controlled experiments",
+    ],
+    "What are the key steps in exploratory data analysis?": [
+        "summary statistics and data types",
+        "visualize distributions and relationships",
+        "check missing values, outliers and correlations",
+    ],
+}
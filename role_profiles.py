@@ -0,0 +1,319 @@
+"""Job-role profiles and precompiled technical question plans.
+
+A role profile weights technologies for a kind of position, so a Data
+Scientist with "Python, SQL, AWS" is asked mostly about Python and SQL
+while a DevOps engineer with the same stack gets AWS first. The candidate's
+seniority picks which of a technology's questions are asked: bank questions
+are ordered from introductory to advanced, juniors start at the front and
+seniors at the back.
+
+When a ``RoleProfiles`` is built, each (role, seniority) pair is compiled
+into lookup tables of per-technology weights and question id pools over the
+whole question bank. A plan for a candidate is then a few dict lookups plus
+a small allocation. Plans are cached by (role, normalized stack, seniority),
+where the normalized stack is the sorted tuple of canonical technologies.
+Candidates who only differ in how they spelled or ordered their stack share
+one cached plan::
+
+    profiles = get_role_profiles()
+    plan = profiles.plan_for("Senior Backend Engineer", "Python, Django, Postgres", "7 years")
+    plan.role, plan.seniority, plan.question_ids
+
+Deployments can replace the built-in profiles with a JSON file shaped like
+``DEFAULT_ROLE_PROFILES`` (``ROLE_PROFILES_ENV``), and give single tenants
+files of their own (``TENANT_ROLE_PROFILES_ENV``)::
+
+    TALENTSCOUT_TENANT_ROLE_PROFILES=acme=/etc/talentscout/acme.json streamlit run app.py
+
+``get_role_profiles(session.tenant)`` then plans each screening from its
+tenant's profiles, and tenants without a file share the default ones.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from normalization import parse_experience
+from question_bank import QuestionBank, get_question_bank
+from questions import TECH_CATEGORIES
+from tech_matcher import DATA_SCIENCE_MATCHER
+
+# Environment variable pointing the app at a JSON file of role profiles
+ROLE_PROFILES_ENV = "TALENTSCOUT_ROLE_PROFILES"
+# Environment variable mapping tenants to their own profile files: "acme=/path/acme.json,..."
+TENANT_ROLE_PROFILES_ENV = "TALENTSCOUT_TENANT_ROLE_PROFILES"
+
+# Profile used when the desired position matches no role
+GENERAL_ROLE = "general"
+
+SENIORITIES = ("junior", "mid", "senior")
+
+# Share of a technology's questions, from the front or back of its list, asked at each seniority
+_SENIORITY_WINDOWS = {"junior": (0.0, 0.6), "mid": (0.0, 1.0), "senior": (0.4, 1.0)}
+
+_SENIORITY_TITLES = {
+    "junior": re.compile(r"\b(?:junior|jr\.?|intern|trainee|graduate|entry[- ]level|associate)\b"),
+    "senior": re.compile(r"\b(?:senior|sr\.?|lead|staff|principal|head|architect)\b"),
+}
+
+# Topics asked about when a stack mentions data work, whatever the role
+DATA_SCIENCE_TOPICS = ("data science", "machine learning")
+
+DEFAULT_QUESTION_COUNT = 5
+
+DEFAULT_ROLE_PROFILES: Dict[str, Dict] = {
+    "backend engineer": {
+        "aliases": ["backend", "back-end", "back end", "server side", "api developer", "python developer",
+                    "java developer"],
+        "category_weights": {"programming_languages": 1.5, "web_frameworks": 1.2, "databases": 1.5,
+                             "cloud_platforms": 1.0, "data_science": 0.3, "mobile": 0.2},
+        "tech_weights": {"sql": 1.5, "django": 1.5, "react": 0.4, "javascript": 0.6},
+    },
+    "frontend engineer": {
+        "aliases": ["frontend", "front-end", "front end", "ui developer", "ui engineer", "web developer",
+                    "react developer"],
+        "category_weights": {"programming_languages": 0.8, "web_frameworks": 1.5, "databases": 0.3,
+                             "cloud_platforms": 0.3, "data_science": 0.2, "mobile": 0.8},
+        "tech_weights": {"javascript": 2.0, "react": 2.0, "django": 0.5, "sql": 0.3},
+    },
+    "full stack developer": {
+        "aliases": ["full stack", "full-stack", "fullstack"],
+        "category_weights": {"programming_languages": 1.2, "web_frameworks": 1.5, "databases": 1.2,
+                             "cloud_platforms": 0.8, "data_science": 0.3, "mobile": 0.5},
+        "tech_weights": {"javascript": 1.5, "sql": 1.2},
+    },
+    "data scientist": {
+        "aliases": ["data scientist", "data science", "machine learning", "ml engineer", "ai engineer",
+                    "data analyst", "research scientist"],
+        "category_weights": {"programming_languages": 1.0, "web_frameworks": 0.2, "databases": 0.6,
+                             "cloud_platforms": 0.4, "data_science": 2.0, "mobile": 0.1},
+        "tech_weights": {"python": 1.5, "r": 1.5, "sql": 1.2, "machine learning": 2.0, "data science": 2.0},
+        "core_topics": ["machine learning", "data science"],
+    },
+    "data engineer": {
+        "aliases": ["data engineer", "etl", "analytics engineer", "big data"],
+        "category_weights": {"programming_languages": 1.2, "web_frameworks": 0.3, "databases": 2.0,
+                             "cloud_platforms": 1.5, "data_science": 1.0, "mobile": 0.1},
+        "tech_weights": {"sql": 2.0, "python": 1.5, "machine learning": 0.5},
+    },
+    "devops engineer": {
+        "aliases": ["devops", "sre", "site reliability", "platform engineer", "cloud engineer",
+                    "infrastructure"],
+        "category_weights": {"programming_languages": 0.8, "web_frameworks": 0.3, "databases": 0.8,
+                             "cloud_platforms": 2.5, "data_science": 0.1, "mobile": 0.1},
+    },
+    "mobile developer": {
+        "aliases": ["mobile", "android", "ios", "flutter", "react native"],
+        "category_weights": {"programming_languages": 1.2, "web_frameworks": 0.8, "databases": 0.5,
+                             "cloud_platforms": 0.4, "data_science": 0.1, "mobile": 2.5},
+        "tech_weights": {"javascript": 1.2, "react": 1.2},
+    },
+    GENERAL_ROLE: {
+        "aliases": [],
+        "category_weights": {},
+    },
+}
+
+
+@dataclass(frozen=True)
+class RoleProfile:
+    """Technology weights for one kind of position"""
+    name: str
+    aliases: Tuple[str, ...] = ()
+    category_weights: Mapping[str, float] = field(default_factory=dict)
+    tech_weights: Mapping[str, float] = field(default_factory=dict)
+    # Topics planned for every candidate in the role, whatever their stack
+    core_topics: Tuple[str, ...] = ()
+    default_weight: float = 1.0
+    question_count: int = DEFAULT_QUESTION_COUNT
+
+    @classmethod
+    def from_dict(cls, name: str, data: Mapping) -> "RoleProfile":
+        return cls(
+            name=name,
+            aliases=tuple(alias.lower() for alias in data.get("aliases", ())),
+            category_weights=dict(data.get("category_weights", {})),
+            tech_weights=dict(data.get("tech_weights", {})),
+            core_topics=tuple(data.get("core_topics", ())),
+            default_weight=float(data.get("default_weight", 1.0)),
+            question_count=int(data.get("question_count", DEFAULT_QUESTION_COUNT)),
+        )
+
+
+@dataclass(frozen=True)
+class QuestionPlan:
+    """Technical questions planned for one (role, stack, seniority)
+
+    ``pools`` holds every question id eligible for each planned technology,
+    in the order they would be asked (as ranges, so large banks cost no
+    memory per plan), and ``quotas`` how many to take from
+    each; ``question_ids`` is the default selection, highest weight first.
+    """
+    role: str
+    seniority: str
+    technologies: Tuple[str, ...]
+    weights: Tuple[float, ...]
+    pools: Tuple[Sequence[int], ...]
+    quotas: Tuple[int, ...]
+    question_ids: Tuple[int, ...]
+
+
+class RoleProfiles:
+    """A tenant's role profiles with their precompiled question tables
+
+    Plans are cached per instance, so tenants with different profiles never
+    share cache entries.
+    """
+
+    def __init__(self, profiles: Mapping[str, Mapping] = DEFAULT_ROLE_PROFILES,
+                 bank: Optional[QuestionBank] = None, cache_size: int = 4096):
+        self.bank = bank or get_question_bank()
+        self.profiles: Dict[str, RoleProfile] = {
+            name.lower(): RoleProfile.from_dict(name.lower(), data) for name, data in profiles.items()
+        }
+        self.profiles.setdefault(GENERAL_ROLE, RoleProfile(GENERAL_ROLE))
+
+        # Role names and aliases in one alternation, longest first so "data
+        # engineer" wins over "engineer"-style shorter aliases
+        aliases = {name: name for name in self.profiles if name != GENERAL_ROLE}
+        for profile in self.profiles.values():
+            aliases.update((alias, profile.name) for alias in profile.aliases)
+        self._role_of_alias = aliases
+        ordered = sorted(aliases, key=len, reverse=True)
+        self._role_re = re.compile(r"\b(?:" + "|".join(map(re.escape, ordered)) + r")\b") if ordered else None
+
+        # Per (role, seniority) lookup tables over every technology in the bank
+        category_of = {tech: category for category, techs in TECH_CATEGORIES.items() for tech in techs}
+        self._weights: Dict[str, Dict[str, float]] = {}
+        self._pools: Dict[Tuple[str, str], Dict[str, range]] = {}
+        technologies = self.bank.technologies()
+        for profile in self.profiles.values():
+            self._weights[profile.name] = {
+                tech: float(profile.tech_weights.get(
+                    tech, profile.category_weights.get(category_of.get(tech), profile.default_weight)))
+                for tech in technologies
+            }
+            for seniority in SENIORITIES:
+                self._pools[profile.name, seniority] = {
+                    tech: self._seniority_pool(self.bank.question_ids(tech), seniority) for tech in technologies
+                }
+
+        self.plan = lru_cache(maxsize=cache_size)(self._compile_plan)
+
+    @classmethod
+    def load(cls, path: str, bank: Optional[QuestionBank] = None) -> "RoleProfiles":
+        """Read profiles from a JSON file shaped like ``DEFAULT_ROLE_PROFILES``"""
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle), bank)
+
+    @staticmethod
+    def _seniority_pool(ids: range, seniority: str) -> range:
+        low, high = _SENIORITY_WINDOWS[seniority]
+        count = len(ids)
+        start, stop = int(count * low), max(int(count * low) + 1, round(count * high))
+        window = ids[start:min(stop, count)]
+        # Seniors are asked the most advanced questions first
+        return window[::-1] if seniority == "senior" else window
+
+    def roles(self) -> List[str]:
+        """Names of the configured profiles"""
+        return list(self.profiles)
+
+    def role_for(self, desired_positions: str) -> str:
+        """Profile name for a free-text position, the first recognised title winning"""
+        if self._role_re is not None:
+            match = self._role_re.search(desired_positions.lower())
+            if match:
+                return self._role_of_alias[match.group(0)]
+        return GENERAL_ROLE
+
+    @staticmethod
+    def seniority_for(experience_years: str = "", desired_positions: str = "") -> str:
+        """Seniority from a title hint ("Senior ...", "Junior ..."), else from years of experience"""
+        title = desired_positions.lower()
+        for seniority, pattern in _SENIORITY_TITLES.items():
+            if pattern.search(title):
+                return seniority
+        experience = parse_experience(experience_years) if experience_years else None
+        if experience is None:
+            return "mid"
+        years = experience[0]
+        return "junior" if years < 2 else "senior" if years >= 5 else "mid"
+
+    def normalize_stack(self, tech_stack: str) -> Tuple[str, ...]:
+        """Sorted canonical technologies of a stack, plus data topics when it mentions data work"""
+        lowered = tech_stack.lower()
+        techs = set(self.bank.matcher.find(lowered))
+        if DATA_SCIENCE_MATCHER.matches_any(lowered):
+            techs.update(DATA_SCIENCE_TOPICS)
+        return tuple(sorted(techs))
+
+    def plan_for(self, desired_positions: str, tech_stack: str, experience_years: str = "") -> QuestionPlan:
+        """Question plan for a candidate, served from the plan cache when possible"""
+        return self.plan(self.role_for(desired_positions), self.normalize_stack(tech_stack),
+                         self.seniority_for(experience_years, desired_positions))
+
+    def _compile_plan(self, role: str, technologies: Tuple[str, ...], seniority: str) -> QuestionPlan:
+        profile = self.profiles.get(role) or self.profiles[GENERAL_ROLE]
+        weights = self._weights[profile.name]
+        pools = self._pools[profile.name, seniority]
+
+        planned: Dict[str, float] = {}
+        for tech in (*technologies, *profile.core_topics):
+            pool = pools.get(tech)
+            weight = weights.get(tech, 0.0)
+            if pool and weight > 0:
+                planned[tech] = weight
+        # Highest weight first; ties keep the normalized (alphabetical) order
+        order = sorted(planned, key=lambda tech: -planned[tech])
+
+        # Share the questions out by weight (highest averages), capped by pool size
+        quotas = dict.fromkeys(order, 0)
+        asked: List[int] = []
+        for _ in range(profile.question_count):
+            open_techs = [tech for tech in order if quotas[tech] < len(pools[tech])]
+            if not open_techs:
+                break
+            tech = max(open_techs, key=lambda t: planned[t] / (quotas[t] + 1))
+            asked.append(pools[tech][quotas[tech]])
+            quotas[tech] += 1
+
+        return QuestionPlan(
+            role=profile.name,
+            seniority=seniority,
+            technologies=tuple(order),
+            weights=tuple(planned[tech] for tech in order),
+            pools=tuple(pools[tech] for tech in order),
+            quotas=tuple(quotas[tech] for tech in order),
+            question_ids=tuple(asked),
+        )
+
+
+def tenant_profile_paths() -> Dict[str, str]:
+    """Profile file of each tenant listed in TALENTSCOUT_TENANT_ROLE_PROFILES"""
+    paths = {}
+    for item in filter(None, (part.strip() for part in os.environ.get(TENANT_ROLE_PROFILES_ENV, "").split(","))):
+        tenant, _, path = item.partition("=")
+        if not tenant.strip() or not path.strip():
+            raise ValueError(f"Invalid tenant role profiles {item!r}, expected tenant=path")
+        paths[tenant.strip()] = path.strip()
+    return paths
+
+
+@lru_cache(maxsize=None)
+def get_role_profiles(tenant: Optional[str] = None) -> RoleProfiles:
+    """Return a tenant's profiles, or the shared ones when it has no file of its own
+
+    The shared profiles come from TALENTSCOUT_ROLE_PROFILES or the built-in
+    defaults and are one instance, so tenants using them share a plan cache.
+    """
+    if tenant is not None:
+        path = tenant_profile_paths().get(tenant)
+        return RoleProfiles.load(path) if path else get_role_profiles()
+    path = os.environ.get(ROLE_PROFILES_ENV)
+    if path:
+        return RoleProfiles.load(path)
+    return RoleProfiles()
@@ -0,0 +1,341 @@
+"""Bounded scheduling of model calls and export work.
+
+A ``WorkScheduler`` runs blocking work (chat model calls, answer scoring for
+exports) on a fixed pool of worker threads, so a traffic spike queues work
+instead of opening unbounded connections to the model provider:
+
+* model calls draw from their tenant's token bucket, refilled at
+  ``tenant_rate`` per second up to ``tenant_burst``; calls beyond it are
+  refused at once. The tenant is the screening session's; API clients
+  pick one of the tenants configured in ``tenant_limits`` with the
+  ``X-TalentScout-Tenant`` header. Local work such as exports passes
+  ``tenant=None`` and is bounded by the queue alone
+* queued work is served by priority, so interactive chat (``INTERACTIVE``)
+  always goes ahead of exports (``BATCH``), and exports never hold the last
+  worker
+* the queue is bounded; when it is full, new work displaces queued work of
+  a lower priority, or is refused
+* work carries a deadline and is dropped if it is still queued when the
+  deadline passes
+
+Refused and dropped work raises ``Overloaded``, which callers turn into a
+cheaper answer: the engine asks template questions instead of generated
+ones and sends the static acknowledgement instead of a streamed one. Batch
+callers pass ``block=True`` to wait for capacity instead. Queue depth,
+wait time and shed work are exported as metrics.
+
+Configure the process-wide scheduler with environment variables::
+
+    TALENTSCOUT_SCHEDULER_WORKERS=4 TALENTSCOUT_SCHEDULER_QUEUE=32 \\
+    TALENTSCOUT_TENANT_RATE=5 TALENTSCOUT_TENANT_BURST=10 \\
+    TALENTSCOUT_TENANT_LIMITS=acme=20:40,globex=2 streamlit run app.py
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from metrics import SCHEDULER_QUEUE_DEPTH, SCHEDULER_SHED, SCHEDULER_WAIT_SECONDS
+
+SCHEDULER_WORKERS_ENV = "TALENTSCOUT_SCHEDULER_WORKERS"
+SCHEDULER_QUEUE_ENV = "TALENTSCOUT_SCHEDULER_QUEUE"
+TENANT_RATE_ENV = "TALENTSCOUT_TENANT_RATE"
+TENANT_BURST_ENV = "TALENTSCOUT_TENANT_BURST"
+TENANT_LIMITS_ENV = "TALENTSCOUT_TENANT_LIMITS"
+
+# Priorities, served lowest first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+DEFAULT_TENANT = "default"
+
+
+class Overloaded(RuntimeError):
+    """Work refused or dropped by the scheduler
+
+    ``reason`` is one of ``rate_limited``, ``queue_full``, ``expired``,
+    ``timeout`` or ``shutdown``.
+    """
+
+    def __init__(self, reason: str, kind: str = "work"):
+        super().__init__(f"{kind} shed: {reason}")
+        self.reason = reason
+        self.kind = kind
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, at most ``burst`` saved up"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_take(self, tokens: float = 1.0) -> bool:
+        """Take ``tokens`` if available, without waiting"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` will be available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            missing = tokens - self._tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+
+class _Work:
+    __slots__ = ("fn", "args", "future", "kind", "priority", "enqueued", "deadline")
+
+    def __init__(self, fn: Callable, args: Tuple, kind: str, priority: int, deadline: Optional[float]):
+        self.fn = fn
+        self.args = args
+        self.future: Future = Future()
+        self.kind = kind
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.deadline = deadline
+
+
+class WorkScheduler:
+    """Fixed pool of worker threads serving a bounded priority queue"""
+
+    def __init__(self, workers: int = 4, max_queue: int = 32, tenant_rate: float = 5.0,
+                 tenant_burst: float = 10.0, tenant_limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 batch_workers: Optional[int] = None, max_tenants: int = 4096):
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        # Workers that may run batch work at once; the rest stay free for chat
+        self.batch_workers = batch_workers if batch_workers is not None else max(1, self.workers - 1)
+        self.tenant_rate = tenant_rate
+        self.tenant_burst = tenant_burst
+        # Per-tenant (rate, burst) overriding the defaults
+        self.tenant_limits = dict(tenant_limits or {})
+        # Buckets kept before idle (full) ones are dropped; a full bucket equals a new one
+        self.max_tenants = max_tenants
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._queue: List[Tuple[int, int, _Work]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._batch_running = 0
+        self._closed = False
+        self._depth = {priority: SCHEDULER_QUEUE_DEPTH.labels(name) for priority, name in PRIORITY_NAMES.items()}
+
+    def knows_tenant(self, tenant: str) -> bool:
+        """Whether ``tenant`` is the default one or has configured limits"""
+        return tenant == DEFAULT_TENANT or tenant in self.tenant_limits
+
+    def bucket(self, tenant: str) -> TokenBucket:
+        """The token bucket of a tenant, created on first use"""
+        with self._cond:
+            bucket = self._buckets.get(tenant)
+            if bucket is None:
+                if len(self._buckets) >= self.max_tenants:
+                    self._drop_idle_buckets()
+                rate, burst = self.tenant_limits.get(tenant, (self.tenant_rate, self.tenant_burst))
+                bucket = self._buckets[tenant] = TokenBucket(rate, burst)
+            return bucket
+
+    def _drop_idle_buckets(self) -> None:
+        """Forget full buckets; caller holds the lock"""
+        for tenant, bucket in list(self._buckets.items()):
+            if bucket.wait_time(bucket.burst) == 0.0:
+                self._buckets.pop(tenant, None)
+
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def submit(self, fn: Callable, *args, kind: str = "work", tenant: Optional[str] = DEFAULT_TENANT,
+               priority: int = INTERACTIVE, timeout: Optional[float] = None, block: bool = False) -> Future:
+        """Queue ``fn(*args)`` and return a future for its result
+
+        Work not started within ``timeout`` seconds fails with ``Overloaded``.
+        Unless ``block`` is set, work over the tenant's rate or beyond the
+        queue bound is refused immediately with ``Overloaded``; with it the
+        call waits for a token and a queue slot instead. ``tenant=None``
+        skips the rate limit.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        bucket = self.bucket(tenant) if tenant is not None else None
+        while bucket is not None and not bucket.try_take():
+            if not block:
+                raise self._shed(kind, "rate_limited")
+            delay = bucket.wait_time()
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise self._shed(kind, "rate_limited")
+            time.sleep(delay)
+
+        work = _Work(fn, args, kind, priority, deadline)
+        with self._cond:
+            if not self._threads:
+                self._start()
+            while True:
+                if self._closed:
+                    raise self._shed(kind, "shutdown")
+                if len(self._queue) >= self.max_queue:
+                    self._drop_expired()
+                if len(self._queue) < self.max_queue:
+                    break
+                if not block:
+                    # Displace the newest queued work of the lowest priority below this one
+                    lowest = max(self._queue)
+                    if lowest[0] <= priority:
+                        raise self._shed(kind, "queue_full")
+                    self._queue.remove(lowest)
+                    heapq.heapify(self._queue)
+                    self._depth[lowest[0]].dec()
+                    self._fail(lowest[2], "queue_full")
+                    break
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise self._shed(kind, "queue_full")
+                self._cond.wait(remaining)
+            heapq.heappush(self._queue, (priority, next(self._sequence), work))
+            self._depth[priority].inc()
+            self._cond.notify()
+        return work.future
+
+    def run(self, fn: Callable, *args, kind: str = "work", tenant: Optional[str] = DEFAULT_TENANT,
+            priority: int = INTERACTIVE, timeout: Optional[float] = None, block: bool = False):
+        """Run ``fn(*args)`` on a worker and wait at most ``timeout`` seconds for the result
+
+        When the wait times out the work keeps running if it has started,
+        so a slow model call can still fill its cache for later requests.
+        """
+        future = self.submit(fn, *args, kind=kind, tenant=tenant, priority=priority, timeout=timeout, block=block)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise self._shed(kind, "timeout") from None
+
+    def close(self, wait: bool = True) -> None:
+        """Stop the workers; queued work fails with ``Overloaded``"""
+        with self._cond:
+            self._closed = True
+            queued, self._queue = self._queue, []
+            self._cond.notify_all()
+        for priority, _, work in queued:
+            self._depth[priority].dec()
+            self._fail(work, "shutdown")
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    @staticmethod
+    def _shed(kind: str, reason: str) -> Overloaded:
+        SCHEDULER_SHED.inc(kind, reason)
+        return Overloaded(reason, kind)
+
+    def _fail(self, work: _Work, reason: str) -> None:
+        # Work its caller gave up on is dropped without counting it as shed
+        if work.future.set_running_or_notify_cancel():
+            work.future.set_exception(self._shed(work.kind, reason))
+
+    def _drop_expired(self) -> None:
+        """Drop queued work that was cancelled or whose deadline has passed, freeing its slots"""
+        now = time.monotonic()
+        kept = []
+        for entry in self._queue:
+            work = entry[2]
+            if work.future.cancelled() or (work.deadline is not None and work.deadline < now):
+                self._depth[entry[0]].dec()
+                self._fail(work, "expired")
+            else:
+                kept.append(entry)
+        if len(kept) < len(self._queue):
+            self._queue = kept
+            heapq.heapify(self._queue)
+
+    def _start(self) -> None:
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._serve, name=f"talentscout-scheduler-{number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next(self) -> Optional[_Work]:
+        """Wait for the next runnable work, or None once closed"""
+        with self._cond:
+            while not self._closed:
+                if self._queue and (self._queue[0][0] != BATCH or self._batch_running < self.batch_workers):
+                    priority, _, work = heapq.heappop(self._queue)
+                    self._depth[priority].dec()
+                    if priority == BATCH:
+                        self._batch_running += 1
+                    # A freed queue slot may admit a blocked submitter
+                    self._cond.notify_all()
+                    return work
+                self._cond.wait()
+            return None
+
+    def _serve(self) -> None:
+        while True:
+            work = self._next()
+            if work is None:
+                return
+            try:
+                now = time.monotonic()
+                if work.deadline is not None and now > work.deadline:
+                    self._fail(work, "expired")
+                    continue
+                if not work.future.set_running_or_notify_cancel():
+                    continue
+                SCHEDULER_WAIT_SECONDS.observe(now - work.enqueued, work.kind)
+                try:
+                    result = work.fn(*work.args)
+                except BaseException as exc:
+                    work.future.set_exception(exc)
+                else:
+                    work.future.set_result(result)
+            finally:
+                if work.priority == BATCH:
+                    with self._cond:
+                        self._batch_running -= 1
+                        self._cond.notify_all()
+
+
+def parse_tenant_limits(text: str, default_burst: float = 10.0) -> Dict[str, Tuple[float, float]]:
+    """Parse ``"acme=20:40,globex=2"`` into per-tenant (rate, burst) pairs
+
+    A tenant without a burst gets ``default_burst``.
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        tenant, _, limit = item.partition("=")
+        rate, _, burst = limit.partition(":")
+        if not tenant.strip() or not rate.strip():
+            raise ValueError(f"Invalid tenant limit {item!r}, expected tenant=rate[:burst]")
+        limits[tenant.strip()] = (float(rate), float(burst) if burst.strip() else default_burst)
+    return limits
+
+
+@lru_cache(maxsize=None)
+def get_scheduler() -> WorkScheduler:
+    """Return the process-wide scheduler, configured from the environment"""
+    tenant_burst = float(os.environ.get(TENANT_BURST_ENV, "10"))
+    return WorkScheduler(
+        workers=int(os.environ.get(SCHEDULER_WORKERS_ENV, "4")),
+        max_queue=int(os.environ.get(SCHEDULER_QUEUE_ENV, "32")),
+        tenant_rate=float(os.environ.get(TENANT_RATE_ENV, "5")),
+        tenant_burst=tenant_burst,
+        tenant_limits=parse_tenant_limits(os.environ.get(TENANT_LIMITS_ENV, ""), tenant_burst),
+    )
@@ -0,0 +1,437 @@
+"""Session stores for screening sessions.
+
+Every store implements the same small interface (``get``, ``put``,
+``delete``, ``close``):
+
+* ``InMemorySessionStore``: in-process with idle-time eviction
+* ``SQLiteSessionStore``: embedded SQLite database in WAL mode
+* ``FileSessionStore``: one JSON document per session in a directory
+* ``WriteBehindStore``: wraps a durable store and batches writes on a
+  background thread, so disk I/O stays off the request path
+
+``open_session_store`` builds a write-behind durable store from a URL.
+SQLite URLs follow SQLAlchemy: ``sqlite:///sessions.db`` is relative to the
+working directory and ``sqlite:////var/lib/talentscout/sessions.db``
+absolute. File URLs follow RFC 8089:
+``file:///var/lib/talentscout/sessions`` is absolute and ``file:sessions``
+relative.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+from engine import ScreeningSession
+
+logger = logging.getLogger(__name__)
+
+# Environment variable holding the session store URL used by the Streamlit app
+SESSION_STORE_ENV = "TALENTSCOUT_SESSION_STORE"
+
+# Position in a store's change order: (change sequence number or mtime, session_id)
+Cursor = Tuple[Union[int, float], str]
+
+
+class SessionStore:
+    """Interface shared by all session stores"""
+
+    def get(self, session_id: str) -> Optional[ScreeningSession]:
+        """Return a session, or None if it is unknown"""
+        raise NotImplementedError
+
+    def put(self, session: ScreeningSession) -> None:
+        """Insert or replace a session"""
+        self.put_many([session])
+
+    def put_many(self, sessions: Iterable[ScreeningSession]) -> None:
+        """Insert or replace several sessions at once"""
+        for session in sessions:
+            self.put(session)
+
+    def delete(self, session_id: str) -> None:
+        """Drop a session if present"""
+        raise NotImplementedError
+
+    def iter_snapshots(self, since: Optional[Cursor] = None,
+                       completed_only: bool = True) -> Iterator[Tuple[Cursor, Dict]]:
+        """Yield (cursor, to_dict() snapshot) pairs in change order, after ``since``"""
+        raise NotImplementedError(f"{type(self).__name__} does not support iteration")
+
+    def close(self) -> None:
+        """Flush pending work and release resources"""
+
+
+class InMemorySessionStore(SessionStore):
+    """In-process session store with idle-time (TTL) eviction
+
+    Sessions are kept in access order, so expired entries always sit at the
+    front and eviction stops at the first live session.
+    """
+
+    def __init__(self, ttl_seconds: float = 1800.0):
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def get(self, session_id: str) -> Optional[ScreeningSession]:
+        """Return a live session and refresh its TTL, or None"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if now - entry[0] > self.ttl_seconds:
+                del self._sessions[session_id]
+                return None
+            self._sessions[session_id] = (now, entry[1])
+            self._sessions.move_to_end(session_id)
+            return entry[1]
+
+    def put(self, session: ScreeningSession) -> None:
+        """Insert or refresh a session"""
+        with self._lock:
+            self._sessions[session.session_id] = (time.monotonic(), session)
+            self._sessions.move_to_end(session.session_id)
+
+    def delete(self, session_id: str) -> None:
+        """Drop a session if present"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def session_ids(self) -> List[str]:
+        """Ids of every held session, least recently used first"""
+        with self._lock:
+            return list(self._sessions)
+
+    def evict_expired(self) -> int:
+        """Remove sessions idle for longer than the TTL and return how many were removed"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        evicted = 0
+        with self._lock:
+            while self._sessions:
+                session_id, (last_seen, _) = next(iter(self._sessions.items()))
+                if last_seen > cutoff:
+                    break
+                del self._sessions[session_id]
+                evicted += 1
+        return evicted
+
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions persisted as JSON rows in an SQLite database running in WAL mode
+
+    Every write gives its rows the next numbers of a change sequence,
+    assigned inside the write transaction. SQLite commits one writer at a
+    time, so a row never commits behind a sequence number a reader has
+    already seen, whatever the clocks of the writing processes say. The
+    sequence, not ``updated_at``, is the ``iter_snapshots`` cursor.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3  # only durable deployments pay for loading it
+
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY,"
+                " updated_at REAL NOT NULL,"
+                " stage INTEGER NOT NULL,"
+                " completed INTEGER NOT NULL,"
+                " data TEXT NOT NULL,"
+                " seq INTEGER)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sessions)")}
+            if "seq" not in columns:
+                self._add_sequence()
+            self._conn.execute("DROP INDEX IF EXISTS sessions_by_change")
+            self._conn.execute("DROP INDEX IF EXISTS completed_by_change")
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS sessions_by_seq ON sessions (seq)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS completed_by_seq ON sessions (completed, seq)")
+
+    def _add_sequence(self) -> None:
+        """Number the rows of a database written before the change sequence, in updated_at order"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute("ALTER TABLE sessions ADD COLUMN seq INTEGER")
+            ids = self._conn.execute("SELECT session_id FROM sessions ORDER BY updated_at, session_id").fetchall()
+            self._conn.executemany("UPDATE sessions SET seq = ? WHERE session_id = ?",
+                                   [(number, session_id) for number, (session_id,) in enumerate(ids, 1)])
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def get(self, session_id: str) -> Optional[ScreeningSession]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return ScreeningSession.from_dict(json.loads(row[0])) if row else None
+
+    def put_many(self, sessions: Iterable[ScreeningSession]) -> None:
+        self.write_snapshots(session.to_dict() for session in sessions)
+
+    def write_snapshots(self, snapshots: Iterable[Dict]) -> None:
+        """Upsert to_dict() snapshots in a single transaction"""
+        now = time.time()
+        # Repeated snapshots of a session in one batch keep the last
+        latest = {snapshot["session_id"]: snapshot for snapshot in snapshots}
+        if not latest:
+            return
+        with self._lock:
+            # IMMEDIATE takes the write lock first, so no other writer can
+            # commit between reading the last sequence number and using it
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (last,) = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sessions").fetchone()
+                self._conn.executemany(
+                    "INSERT INTO sessions (session_id, updated_at, stage, completed, data, seq)"
+                    " VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(session_id) DO UPDATE SET updated_at = excluded.updated_at,"
+                    " stage = excluded.stage, completed = excluded.completed, data = excluded.data,"
+                    " seq = excluded.seq",
+                    [(session_id, now, snapshot["current_stage"], int(snapshot["current_stage"] == 9),
+                      json.dumps(snapshot), number)
+                     for number, (session_id, snapshot) in enumerate(latest.items(), last + 1)],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def iter_snapshots(self, since: Optional[Cursor] = None, completed_only: bool = True,
+                       batch_size: int = 1000) -> Iterator[Tuple[Cursor, Dict]]:
+        """Page through sessions in change sequence order so memory stays constant"""
+        cursor = since or (0, "")
+        query = (
+            "SELECT seq, session_id, data FROM sessions"
+            f" WHERE {'completed = 1 AND ' if completed_only else ''}seq > ?"
+            " ORDER BY seq LIMIT ?"
+        )
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, (cursor[0], batch_size)).fetchall()
+            for seq, session_id, data in rows:
+                cursor = (seq, session_id)
+                yield cursor, json.loads(data)
+            if len(rows) < batch_size:
+                return
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FileSessionStore(SessionStore):
+    """Sessions persisted as one JSON file each under a directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        # Session ids are uuid4 hex strings; refuse anything that could escape the directory
+        if not session_id.isalnum():
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def get(self, session_id: str) -> Optional[ScreeningSession]:
+        try:
+            with open(self._path(session_id), encoding="utf-8") as handle:
+                return ScreeningSession.from_dict(json.load(handle))
+        except FileNotFoundError:
+            return None
+
+    def put_many(self, sessions: Iterable[ScreeningSession]) -> None:
+        self.write_snapshots(session.to_dict() for session in sessions)
+
+    def write_snapshots(self, snapshots: Iterable[Dict]) -> None:
+        """Atomically replace each session's file with its to_dict() snapshot"""
+        for snapshot in snapshots:
+            path = self._path(snapshot["session_id"])
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(snapshot, handle)
+            os.replace(tmp_path, path)
+
+    def delete(self, session_id: str) -> None:
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def iter_snapshots(self, since: Optional[Cursor] = None,
+                       completed_only: bool = True) -> Iterator[Tuple[Cursor, Dict]]:
+        """Yield sessions in modification-time order
+
+        Only (mtime, id) pairs are held in memory; documents are read one at a
+        time. The cursor is the file mtime, so it is only safe to resume from
+        while one host with a steady clock writes the directory.
+        """
+        since = since or (0.0, "")
+        changed = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                cursor = (entry.stat().st_mtime, entry.name[:-len(".json")])
+                if cursor > since:
+                    changed.append(cursor)
+        changed.sort()
+        for cursor in changed:
+            snapshot = self.get(cursor[1])
+            if snapshot is None or (completed_only and snapshot.current_stage != 9):
+                continue
+            yield cursor, snapshot.to_dict()
+
+
+class WriteBehindStore(SessionStore):
+    """Batches writes to a durable store on a background thread
+
+    ``put`` only records a snapshot of the session in memory; repeated writes
+    to the same session between flushes collapse into one. A flush happens
+    every ``flush_interval`` seconds, or sooner once ``max_batch`` sessions are
+    pending, and always on ``close`` and at interpreter exit.
+    """
+
+    def __init__(self, backend: SessionStore, flush_interval: float = 1.0, max_batch: int = 500):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: Dict[str, Dict] = {}
+        self._deleted: set = set()
+        # The batch being written, still served by get() until the backend has it
+        self._inflight: Dict[str, Dict] = {}
+        self._inflight_deleted: set = set()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="session-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def get(self, session_id: str) -> Optional[ScreeningSession]:
+        with self._cond:
+            if session_id in self._deleted:
+                return None
+            snapshot = self._pending.get(session_id)
+            if snapshot is None:
+                if session_id in self._inflight_deleted:
+                    return None
+                snapshot = self._inflight.get(session_id)
+        if snapshot is not None:
+            return ScreeningSession.from_dict(snapshot)
+        return self.backend.get(session_id)
+
+    def put(self, session: ScreeningSession) -> None:
+        snapshot = session.to_dict()
+        with self._cond:
+            self._deleted.discard(session.session_id)
+            self._pending[session.session_id] = snapshot
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+    def delete(self, session_id: str) -> None:
+        with self._cond:
+            self._pending.pop(session_id, None)
+            self._deleted.add(session_id)
+
+    def flush(self) -> None:
+        """Write every pending snapshot to the backend now
+
+        Until the backend write returns, get() still sees the batch. If the
+        backend fails, the batch is queued again (behind any newer write of
+        the same session) and the error is raised.
+        """
+        with self._flush_lock:
+            with self._cond:
+                pending, self._pending = self._pending, {}
+                deleted, self._deleted = self._deleted, set()
+                self._inflight, self._inflight_deleted = pending, deleted
+            try:
+                if pending:
+                    write = getattr(self.backend, "write_snapshots", None)
+                    if write is not None:
+                        write(pending.values())
+                    else:
+                        self.backend.put_many(ScreeningSession.from_dict(s) for s in pending.values())
+                for session_id in deleted:
+                    self.backend.delete(session_id)
+            except BaseException:
+                with self._cond:
+                    self._inflight, self._inflight_deleted = {}, set()
+                    for session_id, snapshot in pending.items():
+                        if session_id not in self._pending and session_id not in self._deleted:
+                            self._pending[session_id] = snapshot
+                    self._deleted.update(session_id for session_id in deleted if session_id not in self._pending)
+                raise
+            with self._cond:
+                self._inflight, self._inflight_deleted = {}, set()
+
+    def _run(self) -> None:
+        failed = False
+        while True:
+            with self._cond:
+                # After a failed write, wait out the interval even if the batch is full
+                if not self._closed and (failed or len(self._pending) < self.max_batch):
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            try:
+                self.flush()
+                failed = False
+            except Exception:
+                failed = True
+                if closed:
+                    logger.exception("Session store write failed at close; %d sessions not saved",
+                                     len(self._pending) + len(self._deleted))
+                else:
+                    logger.exception("Session store write failed; retrying in %.1fs", self.flush_interval)
+            if closed:
+                return
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.backend.close()
+        atexit.unregister(self.close)
+
+
+def open_backend(url: str) -> SessionStore:
+    """Open a durable store directly from a ``sqlite:///`` or ``file:`` URL"""
+    if url.startswith("sqlite:///"):
+        return SQLiteSessionStore(url[len("sqlite:///"):])
+    parts = urlsplit(url)
+    if parts.scheme == "file" and parts.netloc in ("", "localhost") and parts.path:
+        return FileSessionStore(url2pathname(parts.path))
+    raise ValueError(f"Unsupported session store URL: {url!r}")
+
+
+def open_session_store(url: str, flush_interval: float = 1.0) -> WriteBehindStore:
+    """Open a write-behind durable store from a ``sqlite:///`` or ``file:`` URL"""
+    return WriteBehindStore(open_backend(url), flush_interval=flush_interval)
@@ -0,0 +1,96 @@
+"""Precompiled technology matcher for free-text tech stacks.
+
+Known technology names and their aliases are tokenized once into a token
+trie. Resolving a tech stack is then a single left-to-right pass over the
+input tokens with greedy longest-match, so the cost is linear in the input
+and independent of how many technologies the catalog holds.
+"""
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from questions import DATA_SCIENCE_KEYWORDS, QUESTION_TEMPLATES, TECH_ALIASES, TECH_CATEGORIES
+
+# Keep '+', '#' and inner dots so "c++", "c#" and "node.js" stay single tokens
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+
+# Trie key under which a node stores the canonical name of the phrase ending there
+_END = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase matcher tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class TechMatcher:
+    """Token trie mapping technology phrases to canonical names"""
+
+    def __init__(self, phrases: Mapping[str, str]):
+        self._root: Dict[str, dict] = {}
+        self.max_phrase_tokens = 0
+        for phrase, canonical in phrases.items():
+            self.add(phrase, canonical)
+
+    @classmethod
+    def from_catalog(cls, templates: Mapping[str, Iterable[str]],
+                     categories: Mapping[str, Iterable[str]],
+                     aliases: Mapping[str, str]) -> "TechMatcher":
+        """Build a matcher over every templated, categorized and aliased technology"""
+        phrases = {tech: tech for tech in templates}
+        for techs in categories.values():
+            phrases.update((tech, tech) for tech in techs)
+        phrases.update(aliases)
+        return cls(phrases)
+
+    def add(self, phrase: str, canonical: str) -> None:
+        """Register a phrase; later registrations of the same phrase win"""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[_END] = canonical
+        self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+
+    def find(self, text: str) -> List[str]:
+        """Return canonical technologies mentioned in text, in order of first mention"""
+        tokens = tokenize(text)
+        found: Dict[str, None] = {}
+        i, n = 0, len(tokens)
+        while i < n:
+            node = self._root
+            match, match_end = None, i
+            j = i
+            while j < n:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match, match_end = node[_END], j
+            if match is None:
+                i += 1
+            else:
+                found.setdefault(match, None)
+                i = match_end
+        return list(found)
+
+    def lookup(self, text: str) -> Optional[str]:
+        """Canonical name of text if all of it is one known phrase, otherwise None"""
+        node = self._root
+        for token in tokenize(text):
+            node = node.get(token)
+            if node is None:
+                return None
+        return node.get(_END) if node is not self._root else None
+
+    def matches_any(self, text: str) -> bool:
+        """Check whether text mentions at least one known phrase"""
+        return bool(self.find(text))
+
+
+# Built once at import and shared by every session
+TECH_MATCHER = TechMatcher.from_catalog(QUESTION_TEMPLATES, TECH_CATEGORIES, TECH_ALIASES)
+DATA_SCIENCE_MATCHER = TechMatcher({keyword: keyword for keyword in DATA_SCIENCE_KEYWORDS})
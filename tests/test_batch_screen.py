@@ -0,0 +1,46 @@
+import io
+import json
+
+from batch_screen import run_batch
+
+STACKS = ["Python, Django", "Python, Flask, PostgreSQL", "JavaScript, React", "Java, Spring",
+          "Go, Kubernetes, Docker", "Python, React, AWS"]
+
+# Fields that record when the replay ran rather than what it produced
+CLOCK_FIELDS = ("session_start", "timestamp", "export_timestamp")
+
+
+def _records(count):
+    for number in range(count):
+        yield json.dumps({
+            "candidate_id": f"c-{number}",
+            "full_name": "Jane Doe",
+            "email": f"jane{number}@example.com",
+            "phone": "+14155550123",
+            "experience_years": f"{number % 12} years",
+            "desired_positions": "Backend Engineer",
+            "current_location": "Berlin",
+            "tech_stack": STACKS[number % len(STACKS)],
+            "technical_answers": ["I built services with it."] * 5,
+        }) + "\n"
+
+
+def _without_clock(value):
+    if isinstance(value, dict):
+        return {key: _without_clock(item) for key, item in value.items() if key not in CLOCK_FIELDS}
+    if isinstance(value, list):
+        return [_without_clock(item) for item in value]
+    return value
+
+
+def _run(workers, chunk_size, count=240):
+    out = io.StringIO()
+    assert run_batch(_records(count), out, workers=workers, chunk_size=chunk_size) == count
+    return [json.dumps(_without_clock(json.loads(line)), sort_keys=True) for line in out.getvalue().splitlines()]
+
+
+def test_rerun_is_identical_across_worker_counts():
+    first = _run(workers=1, chunk_size=240)
+    second = _run(workers=3, chunk_size=7)
+    assert first == second
+    assert all(json.loads(line)["technical_questions"] for line in first)
@@ -0,0 +1,68 @@
+import json
+import sqlite3
+
+import session_store
+from bulk_export import run_export
+from engine import HiringAssistant, ScreeningSession
+from session_store import FileSessionStore, SQLiteSessionStore, open_backend
+
+
+def _completed(name):
+    session = ScreeningSession()
+    session.candidate_info.full_name = name
+    session.current_stage = 9
+    return session
+
+
+def _export(store, tmp_path, cursor_file):
+    output = tmp_path / "out.ndjson"
+    run_export(store, str(output), cursor_file=str(cursor_file), assistant=HiringAssistant())
+    return [json.loads(line)["candidate_info"]["full_name"] for line in output.read_text().splitlines()]
+
+
+def test_cursor_does_not_skip_a_write_with_an_earlier_clock(tmp_path, monkeypatch):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    cursor_file = tmp_path / "export.cursor"
+    store.put(_completed("Ada"))
+    assert _export(store, tmp_path, cursor_file) == ["Ada"]
+
+    # A second writer whose clock runs an hour behind commits after the export
+    monkeypatch.setattr(session_store.time, "time", lambda: 0.0)
+    store.put(_completed("Grace"))
+    assert _export(store, tmp_path, cursor_file) == ["Grace"]
+    assert _export(store, tmp_path, cursor_file) == []
+
+
+def test_updated_session_is_exported_again(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    cursor_file = tmp_path / "export.cursor"
+    ada, grace = _completed("Ada"), _completed("Grace")
+    store.put_many([ada, grace])
+    assert sorted(_export(store, tmp_path, cursor_file)) == ["Ada", "Grace"]
+    store.put(ada)
+    assert _export(store, tmp_path, cursor_file) == ["Ada"]
+
+
+def test_databases_without_a_sequence_are_numbered_in_change_order(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE sessions (session_id TEXT PRIMARY KEY, updated_at REAL NOT NULL,"
+                 " stage INTEGER NOT NULL, completed INTEGER NOT NULL, data TEXT NOT NULL)")
+    for updated_at, name in [(20.0, "Grace"), (10.0, "Ada")]:
+        snapshot = _completed(name).to_dict()
+        conn.execute("INSERT INTO sessions VALUES (?, ?, 9, 1, ?)",
+                     (snapshot["session_id"], updated_at, json.dumps(snapshot)))
+    conn.commit()
+    conn.close()
+
+    store = SQLiteSessionStore(path)
+    names = [snapshot["candidate_info"]["full_name"] for _, snapshot in store.iter_snapshots()]
+    assert names == ["Ada", "Grace"]
+    store.put(_completed("Linus"))
+    assert [cursor[0] for cursor, _ in store.iter_snapshots()] == [1, 2, 3]
+
+
+def test_file_urls_keep_absolute_paths(tmp_path):
+    store = open_backend(f"file://{tmp_path}/sessions")
+    assert isinstance(store, FileSessionStore)
+    assert store.directory == f"{tmp_path}/sessions"
@@ -0,0 +1,25 @@
+import pytest
+
+from candidate_index import CandidateIndex
+
+
+@pytest.fixture
+def index():
+    index = CandidateIndex()
+    index.add("a", {"tech_stack": "Python, Django", "experience_years": "5", "current_location": "New York, USA"})
+    index.add("b", {"tech_stack": "Python, Machine Learning", "experience_years": "2", "current_location": "Berlin"})
+    index.add("c", {"tech_stack": "React Native", "experience_years": "1", "current_location": "San Francisco"})
+    return index
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("python django", ["a"]),
+    ("python berlin", ["b"]),
+    ("python machine learning", ["b"]),
+    ("machine learning", ["b"]),
+    ("new york", ["a"]),
+    ("react native, san francisco", ["c"]),
+    ("python AND NOT django", ["b"]),
+])
+def test_adjacent_words(index, query, expected):
+    assert index.search(query).session_ids == expected
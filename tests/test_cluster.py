@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import time
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from cluster import create_router_app, create_worker_app
+from engine import ConversationEngine
+
+
+class SlowStreamEngine(ConversationEngine):
+    """Engine whose replies stream forever, one chunk every 10 ms, until closed"""
+
+    def __init__(self):
+        super().__init__()
+        self.pulled = 0
+        self.closed = threading.Event()
+
+    def step_stream(self, session, text):
+        try:
+            while True:
+                time.sleep(0.01)
+                self.pulled += 1
+                yield "chunk "
+        finally:
+            self.closed.set()
+
+
+def test_worker_stops_streaming_when_the_client_goes_away():
+    engine = SlowStreamEngine()
+
+    async def run():
+        async with TestClient(TestServer(create_worker_app(engine))) as client:
+            response = await client.post("/_cluster/sessions", json={"session_id": "a" * 32})
+            assert response.status == 201
+            response = await client.post(f"/_cluster/sessions/{'a' * 32}/stream", json={"text": "hi"})
+            await response.content.readline()
+            response.close()
+            for _ in range(100):
+                if engine.closed.is_set():
+                    break
+                await asyncio.sleep(0.02)
+
+    asyncio.run(run())
+    assert engine.closed.is_set()
+    pulled = engine.pulled
+    time.sleep(0.1)
+    assert engine.pulled == pulled
+
+
+def test_router_without_workers_answers_503():
+    async def run():
+        async with TestClient(TestServer(create_router_app(workers=0))) as client:
+            response = await client.post("/sessions")
+            return response.status, await response.json()
+
+    status, body = asyncio.run(run())
+    assert status == 503
+    assert body == {"error": "no workers in the cluster"}
@@ -0,0 +1,110 @@
+import builtins
+
+import pytest
+
+import event_log
+from engine import ScreeningSession
+from event_log import EventLog, list_segments
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = EventLog(str(tmp_path), segment_bytes=512, snapshot_every=1000, compact_every=0,
+                   flush_interval=3600)
+    yield log
+    log.close()
+
+
+def _step(log, session, **changes):
+    mark = log.mark(session)
+    for name, value in changes.items():
+        setattr(session.candidate_info, name, value)
+    session.current_stage += 1
+    log.record(session, mark)
+
+
+def _steps(log, session):
+    _step(log, session, full_name="Ada Lovelace")
+    _step(log, session, email="ada@example.com")
+    _step(log, session, phone="+442071234567")
+    _step(log, session, experience_years="7")
+
+
+def _same(restored, session):
+    assert restored is not None
+    assert restored.to_dict() == session.to_dict()
+
+
+def test_restore_after_compaction(log):
+    sessions = [ScreeningSession() for _ in range(6)]
+    for session in sessions:
+        _steps(log, session)
+    log.flush()
+    assert len(list_segments(log.directory)) > 1
+
+    checkpoint = log.compact(prune=True)
+
+    assert list_segments(log.directory)[0] == checkpoint
+    for session in sessions:
+        _same(log.restore(session.session_id), session)
+    _step(log, sessions[0], desired_positions="Engineer")
+    _same(log.restore(sessions[0].session_id), sessions[0])
+
+
+def test_restore_after_compaction_and_reopen(tmp_path, log):
+    sessions = [ScreeningSession() for _ in range(6)]
+    for session in sessions:
+        _steps(log, session)
+    log.compact(prune=True)
+    log.close()
+
+    reopened = EventLog(str(tmp_path), compact_every=0, flush_interval=3600)
+    try:
+        for session in sessions:
+            _same(reopened.restore(session.session_id), session)
+    finally:
+        reopened.close()
+
+
+class FailingWrites:
+    """Segment file that accepts ``budget`` writes, then fails with a full disk"""
+
+    def __init__(self, handle, budget):
+        self._handle, self._budget = handle, budget
+
+    def write(self, data):
+        if self._budget <= 0:
+            raise OSError(28, "No space left on device")
+        self._budget -= 1
+        return self._handle.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._handle, name)
+
+
+def test_restore_after_a_failed_write(tmp_path, log, monkeypatch):
+    first, second = ScreeningSession(), ScreeningSession()
+    _steps(log, first)
+    log.flush()
+    _steps(log, second)
+    _step(log, first, desired_positions="Engineer")
+
+    def failing_open(path, mode="r", *args, **kwargs):
+        handle = builtins.open(path, mode, *args, **kwargs)
+        return FailingWrites(handle, 2) if mode == "ab" else handle
+
+    monkeypatch.setattr(event_log, "open", failing_open, raising=False)
+    with pytest.raises(OSError):
+        log.flush()
+    monkeypatch.undo()
+
+    _same(log.restore(first.session_id), first)
+    _same(log.restore(second.session_id), second)
+    log.close()
+
+    reopened = EventLog(str(tmp_path), compact_every=0, flush_interval=3600)
+    try:
+        _same(reopened.restore(first.session_id), first)
+        _same(reopened.restore(second.session_id), second)
+    finally:
+        reopened.close()
@@ -0,0 +1,20 @@
+import pytest
+
+from normalization import Normalizer
+
+
+@pytest.mark.parametrize("phone, expected", [
+    ("9876543210", "9876543210"),
+    ("(415) 555-0123", "4155550123"),
+    ("+91 98765 43210", "+919876543210"),
+    ("+1 (415) 555-0123", "+14155550123"),
+    ("12345", None),
+])
+def test_phone_without_a_configured_country(phone, expected):
+    assert Normalizer().phone(phone) == expected
+
+
+def test_phone_with_a_configured_country():
+    normalizer = Normalizer(default_country_code="1")
+    assert normalizer.phone("(415) 555-0123") == "+14155550123"
+    assert normalizer.phone("+91 98765 43210") == "+919876543210"
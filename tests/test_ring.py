@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+from aiohttp.test_utils import TestServer
+
+from cluster import HashRing, Router, create_worker_app
+
+KEYS = [f"{number:032x}" for number in range(2000)]
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.node_for(key) for key in KEYS}
+    ring.add("d")
+    moved = [key for key in KEYS if ring.node_for(key) != before[key]]
+
+    assert all(ring.node_for(key) == "d" for key in moved)
+    assert 0.15 < len(moved) / len(KEYS) < 0.35
+
+
+def test_removing_a_node_only_moves_its_keys():
+    ring = HashRing(["a", "b", "c", "d"])
+    before = {key: ring.node_for(key) for key in KEYS}
+    ring.remove("b")
+
+    for key in KEYS:
+        if before[key] != "b":
+            assert ring.node_for(key) == before[key]
+        else:
+            assert ring.node_for(key) in ("a", "c", "d")
+
+
+def test_sessions_follow_the_ring_when_workers_join_and_leave():
+    async def owners(router, urls):
+        found = {}
+        for name, url in urls.items():
+            async with router.client.get(f"{url}/_cluster/sessions") as response:
+                for session_id in (await response.json())["session_ids"]:
+                    found[session_id] = name
+        return found
+
+    async def run():
+        servers = {name: TestServer(create_worker_app()) for name in ("w1", "w2", "w3")}
+        for server in servers.values():
+            await server.start_server()
+        urls = {name: str(server.make_url("")).rstrip("/") for name, server in servers.items()}
+        router = Router()
+        await router.start()
+        try:
+            await router.join("w1", urls["w1"])
+            session_ids = [uuid.uuid4().hex for _ in range(60)]
+            for session_id in session_ids:
+                async with router.client.post(f"{urls['w1']}/_cluster/sessions",
+                                              json={"session_id": session_id}) as response:
+                    assert response.status == 201
+
+            joined = await router.join("w2", urls["w2"])
+            joined += await router.join("w3", urls["w3"])
+            after_join = await owners(router, urls)
+            assert all(owner == router.ring.node_for(sid) for sid, owner in after_join.items())
+
+            left = await router.leave("w2")
+            after_leave = await owners(router, urls)
+            return session_ids, joined, after_join, left, after_leave, router.ring
+        finally:
+            await router.close()
+            for server in servers.values():
+                await server.close()
+
+    session_ids, joined, after_join, left, after_leave, ring = asyncio.run(run())
+
+    assert joined > 0
+    assert sorted(after_join) == sorted(session_ids)
+    assert sorted(after_leave) == sorted(session_ids)
+    assert left == sum(owner == "w2" for owner in after_join.values())
+    assert all(owner == ring.node_for(session_id) for session_id, owner in after_leave.items())
+    assert "w2" not in after_leave.values()
@@ -0,0 +1,28 @@
+import json
+
+import pytest
+
+from engine import HiringAssistant
+from role_profiles import TENANT_ROLE_PROFILES_ENV, get_role_profiles
+
+
+@pytest.fixture
+def acme_profiles(tmp_path, monkeypatch):
+    path = tmp_path / "acme.json"
+    path.write_text(json.dumps({"backend engineer": {"tech_weights": {"java": 9}, "question_count": 3}}))
+    monkeypatch.setenv(TENANT_ROLE_PROFILES_ENV, f"acme={path}")
+    get_role_profiles.cache_clear()
+    yield
+    get_role_profiles.cache_clear()
+
+
+def test_questions_follow_the_tenant_profiles(acme_profiles):
+    assistant = HiringAssistant()
+    args = ("Python, Java", "Backend Engineer", "5 years")
+    assert len(assistant.select_technical_questions(*args, seed="s", tenant="acme")) == 3
+    assert len(assistant.select_technical_questions(*args, seed="s", tenant="globex")) == 5
+
+
+def test_tenants_without_a_file_share_the_default_profiles(acme_profiles):
+    assert get_role_profiles("globex") is get_role_profiles()
+    assert get_role_profiles("acme") is not get_role_profiles()
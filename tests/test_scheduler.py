@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from api_server import TENANT_HEADER, create_app
+from engine import ConversationEngine, HiringAssistant
+from scheduler import WorkScheduler, parse_tenant_limits
+
+
+def test_parse_tenant_limits():
+    assert parse_tenant_limits("acme=20:40, globex=2", default_burst=10) == {
+        "acme": (20.0, 40.0), "globex": (2.0, 10.0)}
+    assert parse_tenant_limits("") == {}
+    with pytest.raises(ValueError):
+        parse_tenant_limits("acme")
+
+
+def test_buckets_use_configured_limits():
+    scheduler = WorkScheduler(tenant_rate=1, tenant_burst=2, tenant_limits={"acme": (5, 8)})
+    assert scheduler.knows_tenant("acme") and scheduler.knows_tenant("default")
+    assert not scheduler.knows_tenant("globex")
+    assert scheduler.bucket("acme").burst == 8
+    assert scheduler.bucket("default").burst == 2
+
+
+def _start_session(headers):
+    async def run():
+        scheduler = WorkScheduler(tenant_limits={"acme": (5, 8)})
+        engine = ConversationEngine(HiringAssistant(scheduler=scheduler))
+        async with TestClient(TestServer(create_app(engine))) as client:
+            response = await client.post("/sessions", headers=headers)
+            return response.status
+    return asyncio.run(run())
+
+
+def test_header_accepts_only_configured_tenants():
+    status = _start_session({TENANT_HEADER: "acme"})
+    assert status == 201
+    status = _start_session({TENANT_HEADER: "made-up-tenant"})
+    assert status == 400
+    status = _start_session({})
+    assert status == 201
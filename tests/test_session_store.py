@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from engine import ScreeningSession
+from session_store import InMemorySessionStore, WriteBehindStore
+
+
+class BlockingStore(InMemorySessionStore):
+    """Backend whose writes wait until released, and fail while ``failing`` is set"""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.failing = False
+
+    def put_many(self, sessions):
+        sessions = list(sessions)
+        self.started.set()
+        self.release.wait(5)
+        if self.failing:
+            raise OSError("backend unavailable")
+        super().put_many(sessions)
+
+
+@pytest.fixture
+def store():
+    backend = BlockingStore()
+    store = WriteBehindStore(backend, flush_interval=3600)
+    yield store
+    backend.failing = False
+    backend.release.set()
+    store.close()
+
+
+def _session(stage):
+    session = ScreeningSession()
+    session.current_stage = stage
+    return session
+
+
+def _flush_in_background(store):
+    thread = threading.Thread(target=store.flush)
+    thread.start()
+    assert store.backend.started.wait(5)
+    return thread
+
+
+def test_get_sees_a_batch_while_it_is_written(store):
+    session = _session(3)
+    store.put(session)
+    flushing = _flush_in_background(store)
+
+    assert store.backend.get(session.session_id) is None
+    assert store.get(session.session_id).current_stage == 3
+
+    store.backend.release.set()
+    flushing.join(5)
+    assert store.backend.get(session.session_id).current_stage == 3
+    assert store.get(session.session_id).current_stage == 3
+
+
+def test_get_prefers_a_newer_put_over_the_batch_in_flight(store):
+    session = _session(3)
+    store.put(session)
+    flushing = _flush_in_background(store)
+    session.current_stage = 4
+    store.put(session)
+    assert store.get(session.session_id).current_stage == 4
+    store.backend.release.set()
+    flushing.join(5)
+    assert store.get(session.session_id).current_stage == 4
+
+
+def test_get_does_not_return_a_session_deleted_during_the_write(store):
+    session = _session(3)
+    store.put(session)
+    flushing = _flush_in_background(store)
+    store.delete(session.session_id)
+    assert store.get(session.session_id) is None
+    store.backend.release.set()
+    flushing.join(5)
+
+
+def test_failed_write_is_queued_again(store):
+    session = _session(5)
+    store.put(session)
+    store.backend.failing = True
+    store.backend.release.set()
+    with pytest.raises(OSError):
+        store.flush()
+    assert store.get(session.session_id).current_stage == 5
+
+    store.backend.failing = False
+    store.flush()
+    assert store.backend.get(session.session_id).current_stage == 5
@@ -0,0 +1,178 @@
+"""End-to-end check of the screening cluster with local worker processes.
+
+Starts ``cluster.py router`` with two workers and drives many screenings
+through it while the membership changes. A third worker joins while the
+screenings move into the technical questions, and the first worker leaves
+while they answer the rest. The check passes when every screening
+completes with its answers intact, and the candidate search finds all of
+them::
+
+    python tools/cluster_check.py --sessions 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import aiohttp
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE = ["Jane Doe", "jane@example.com", "+14155550123", "5 years", "Backend Engineer", "Berlin, Germany"]
+STACK = "Python, Django, PostgreSQL, AWS"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_healthy(client: aiohttp.ClientSession, url: str, workers: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with client.get(f"{url}/health") as response:
+                if response.status == 200 and (await response.json())["workers"] >= workers:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("router did not become healthy")
+
+
+async def send(client: aiohttp.ClientSession, url: str, session_id: str, text: str) -> Dict:
+    async with client.post(f"{url}/sessions/{session_id}/messages", json={"text": text}) as response:
+        if response.status != 200:
+            raise RuntimeError(f"{session_id}: HTTP {response.status} {await response.text()}")
+        return await response.json()
+
+
+async def send_ws(client: aiohttp.ClientSession, url: str, session_id: str, texts: List[str]) -> Dict:
+    """Send the remaining answers over the WebSocket, streaming the first one"""
+    payload: Dict = {}
+    async with client.ws_connect(f"{url}/sessions/{session_id}/ws") as ws:
+        for i, text in enumerate(texts):
+            await ws.send_str(json.dumps({"text": text, "stream": i == 0}))
+            while True:
+                frame = await ws.receive_json()
+                if frame.get("type") != "chunk":
+                    break
+            payload = frame
+            if "error" in payload:
+                raise RuntimeError(f"{session_id}: {payload['error']}")
+    return payload
+
+
+async def gather_limited(limit: int, coroutines) -> list:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines))
+
+
+async def check(url: str, sessions: int, concurrency: int) -> int:
+    async with aiohttp.ClientSession() as client:
+        await wait_healthy(client, url, 2)
+
+        async def start() -> str:
+            async with client.post(f"{url}/sessions") as response:
+                return (await response.json())["session_id"]
+
+        session_ids = await gather_limited(concurrency, (start() for _ in range(sessions)))
+        names = {session_id: f"Candidate {i}" for i, session_id in enumerate(session_ids)}
+
+        async def profile(session_id: str) -> None:
+            for text in [names[session_id]] + PROFILE[1:]:
+                await send(client, url, session_id, text)
+
+        await gather_limited(concurrency, (profile(session_id) for session_id in session_ids))
+
+        async def join() -> None:
+            async with client.post(f"{url}/cluster/workers") as response:
+                joined = await response.json()
+            print(f"joined {joined['worker']}: {joined['migrated']} sessions migrated")
+
+        async def leave() -> None:
+            async with client.get(f"{url}/cluster") as response:
+                leaving = next(iter((await response.json())["workers"]))
+            await asyncio.sleep(0.2)
+            async with client.delete(f"{url}/cluster/workers/{leaving}") as response:
+                left = await response.json()
+            print(f"removed {leaving}: {left['migrated']} sessions migrated")
+
+        async def first_answers(session_id: str) -> int:
+            reply = await send(client, url, session_id, STACK)
+            assert reply["stage"] == 8, reply
+            await send(client, url, session_id, "First answer about the technology.")
+            await send(client, url, session_id, "Second answer about the technology.")
+            return 2
+
+        # Membership changes while requests are in flight
+        await asyncio.gather(gather_limited(concurrency, (first_answers(sid) for sid in session_ids)), join())
+
+        async def finish(index: int, session_id: str) -> Dict:
+            answers = [f"Answer {n} about the technology." for n in range(3, 8)]
+            if index % 2:
+                return await send_ws(client, url, session_id, answers)
+            reply: Dict = {}
+            for text in answers:
+                reply = await send(client, url, session_id, text)
+                if reply["completed"]:
+                    break
+            return reply
+
+        replies, _ = await asyncio.gather(
+            gather_limited(concurrency, (finish(i, sid) for i, sid in enumerate(session_ids))), leave())
+
+        failures = 0
+        for session_id, reply in zip(session_ids, replies):
+            async with client.get(f"{url}/sessions/{session_id}/export") as response:
+                data = await response.json()
+            answers = [entry["answer"] for entry in data["technical_qa"]]
+            intact = (reply.get("completed") and data["session_completed"]
+                      and data["candidate_info"]["full_name"] == names[session_id]
+                      and data["candidate_info"]["tech_stack"] == STACK
+                      and answers[:2] == ["First answer about the technology.",
+                                          "Second answer about the technology."]
+                      and len(answers) >= 3)
+            if not intact:
+                failures += 1
+                print(f"FAILED {session_id}: {reply} {data}", file=sys.stderr)
+
+        async with client.get(f"{url}/candidates", params={"q": "python, 3+ years", "limit": "0"}) as response:
+            found = (await response.json())["count"]
+        async with client.get(f"{url}/cluster") as response:
+            status = await response.json()
+        print("sessions per worker:", {name: worker["sessions"] for name, worker in status["workers"].items()})
+        print(f"{sessions - failures}/{sessions} screenings completed intact, {found} found by search")
+        return 0 if failures == 0 and found == sessions else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    port = free_port()
+    router = subprocess.Popen([sys.executable, os.path.join(REPO_ROOT, "cluster.py"), "router",
+                               "--port", str(port), "--workers", "2"], cwd=REPO_ROOT)
+    try:
+        return asyncio.run(check(f"http://127.0.0.1:{port}", args.sessions, args.concurrency))
+    finally:
+        router.terminate()
+        router.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""Import-time report for a cold start of the Streamlit app.
+
+Runs the imports at the top of ``app.py`` in a fresh interpreter under
+``python -X importtime``, prints where the time goes, and exits non-zero
+when the application's own imports (everything after ``streamlit``) take
+longer than ``--budget-ms`` or pull in a dependency that should only load
+on first use (numpy, pyarrow, openai, ...)::
+
+    python tools/startup_report.py                    # fail above the default 25 ms
+    python tools/startup_report.py --budget-ms 0      # report only
+    python tools/startup_report.py --first-run        # also time the first page render
+
+Timings are best of ``--repeat`` runs. Modules whose bytecode is missing or
+older than the source are listed too: with ``PYTHONDONTWRITEBYTECODE`` set,
+as in most container images, they are compiled on every cold start unless
+the image runs ``python -m compileall`` at build time.
+"""
+
+import argparse
+import ast
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+# Application import budget a new replica is held to, in milliseconds
+DEFAULT_BUDGET_MS = 25.0
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(REPO_ROOT, "app.py")
+
+# Imported before the application modules and reported separately
+FRAMEWORK_MODULES = ("streamlit",)
+
+# Dependencies that must only load on first use, never while importing the app
+LAZY_MODULES = ("numpy", "pandas", "pyarrow", "zstandard", "openai", "aiohttp", "sqlite3", "http.server")
+
+_MARKER = "-- application imports --"
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+_FIRST_RUN = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app!r}, default_timeout=60)
+app.run()
+elapsed = time.perf_counter() - start
+if app.exception:
+    raise SystemExit(app.exception[0].message)
+print(elapsed)
+"""
+
+
+@dataclass
+class ImportEntry:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+    # Top-level import this module was loaded under
+    root: str = ""
+
+
+@dataclass
+class ImportProfile:
+    interpreter_us: int
+    framework_us: int
+    application_us: int
+    application: List[ImportEntry]
+
+
+def app_imports(path: str = APP) -> List[str]:
+    """Module-level import statements of the app, in source order"""
+    with open(path, encoding="utf-8") as handle:
+        tree = ast.parse(handle.read(), path)
+    statements = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            statements.extend(f"import {alias.name}" for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            statements.append(f"import {node.module}")
+    return list(dict.fromkeys(statements))
+
+
+def import_script(statements: Sequence[str]) -> str:
+    """Framework imports, a marker on stderr, then the application imports"""
+    framework = [s for s in statements if s.split()[1].split(".")[0] in FRAMEWORK_MODULES]
+    application = [s for s in statements if s not in framework]
+    return "\n".join(framework + ["import sys", f"sys.stderr.write({_MARKER!r} + '\\n')"] + application)
+
+
+def parse_importtime(stderr: str) -> ImportProfile:
+    """Split ``-X importtime`` output into interpreter, framework and application imports"""
+    interpreter_us = framework_us = application_us = 0
+    application: List[ImportEntry] = []
+    pending: List[ImportEntry] = []
+    after_marker = False
+    for line in stderr.splitlines():
+        if line == _MARKER:
+            after_marker = True
+            continue
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        entry = ImportEntry(match.group(4), int(match.group(1)), int(match.group(2)),
+                            (len(match.group(3)) - 1) // 2)
+        pending.append(entry)
+        if entry.depth:
+            continue
+        # A top-level entry closes the subtree logged just before it
+        for child in pending:
+            child.root = entry.name
+        if after_marker:
+            application_us += entry.cumulative_us
+            application.extend(pending)
+        elif entry.name.split(".")[0] in FRAMEWORK_MODULES:
+            framework_us += entry.cumulative_us
+        else:
+            interpreter_us += entry.cumulative_us
+        pending = []
+    return ImportProfile(interpreter_us, framework_us, application_us, application)
+
+
+def profile_imports(statements: Sequence[str]) -> ImportProfile:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", import_script(statements)],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode:
+        raise SystemExit(f"importing the app failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def lazy_violations(profile: ImportProfile) -> Dict[str, str]:
+    """Lazy-only modules loaded by the application imports, mapped to the import that loaded them"""
+    found = {}
+    for entry in profile.application:
+        for module in LAZY_MODULES:
+            if entry.name == module or entry.name.startswith(module + "."):
+                found.setdefault(module, entry.root)
+    return found
+
+
+def stale_bytecode(profile: ImportProfile) -> List[str]:
+    """Repository modules imported by the app whose bytecode would be compiled at import"""
+    stale = []
+    for entry in profile.application:
+        source = os.path.join(REPO_ROOT, *entry.name.split(".")) + ".py"
+        if not os.path.exists(source):
+            continue
+        cached = importlib.util.cache_from_source(source)
+        if not os.path.exists(cached) or os.stat(cached).st_mtime < os.stat(source).st_mtime:
+            stale.append(entry.name)
+    return stale
+
+
+def first_run_seconds() -> float:
+    """Seconds from a fresh interpreter to the first completed script run of the app"""
+    result = subprocess.run([sys.executable, "-c", _FIRST_RUN.format(app=APP)],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode:
+        raise SystemExit(f"first run of the app failed:\n{(result.stderr or result.stdout)[-2000:]}")
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _ms(microseconds: float) -> str:
+    return f"{microseconds / 1000:8.1f} ms"
+
+
+def print_report(profile: ImportProfile, top: int) -> None:
+    print(f"{'interpreter startup':<36}{_ms(profile.interpreter_us)}")
+    print(f"{'framework (' + ', '.join(FRAMEWORK_MODULES) + ')':<36}{_ms(profile.framework_us)}")
+    print(f"{'application imports':<36}{_ms(profile.application_us)}")
+
+    roots = [entry for entry in profile.application if entry.depth == 0]
+    if roots:
+        print("\napplication imports by top-level module (cumulative)")
+        for entry in sorted(roots, key=lambda e: -e.cumulative_us):
+            print(f"  {entry.name:<34}{_ms(entry.cumulative_us)}")
+
+        print(f"\nslowest modules loaded by the application (self time, top {top})")
+        for entry in sorted(profile.application, key=lambda e: -e.self_us)[:top]:
+            print(f"  {entry.name:<34}{_ms(entry.self_us)}   via {entry.root}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="fail when application imports take longer than this; 0 disables "
+                             f"(default: {DEFAULT_BUDGET_MS:g})")
+    parser.add_argument("--repeat", type=int, default=3, help="import runs; the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list")
+    parser.add_argument("--first-run", action="store_true",
+                        help="also time a fresh process up to the first rendered page (AppTest)")
+    parser.add_argument("--first-run-budget-ms", type=float, help="fail when the first page render is slower")
+    args = parser.parse_args(argv)
+
+    statements = app_imports()
+    profiles = [profile_imports(statements) for _ in range(max(args.repeat, 1))]
+    profile = min(profiles, key=lambda p: p.application_us)
+    print_report(profile, args.top)
+
+    failures: List[str] = []
+    violations = lazy_violations(profile)
+    if violations:
+        print("\nlazy-only dependencies loaded at startup")
+        for module, root in sorted(violations.items()):
+            print(f"  {module:<34}via {root}")
+        failures.append("lazy-only dependencies imported at startup: " + ", ".join(sorted(violations)))
+
+    stale = stale_bytecode(profile)
+    if stale:
+        dont_write = " (PYTHONDONTWRITEBYTECODE is set)" if os.environ.get("PYTHONDONTWRITEBYTECODE") else ""
+        print(f"\ncompiled from source on import{dont_write}: {', '.join(stale)}")
+        print("  precompile with `python -m compileall -q .` when building the image")
+
+    if args.budget_ms and profile.application_us / 1000 > args.budget_ms:
+        failures.append(f"application imports took {profile.application_us / 1000:.1f} ms, "
+                        f"budget {args.budget_ms:g} ms")
+
+    if args.first_run or args.first_run_budget_ms is not None:
+        seconds = first_run_seconds()
+        print(f"\n{'first page render (fresh process)':<36}{_ms(seconds * 1e6)}")
+        if args.first_run_budget_ms is not None and seconds * 1000 > args.first_run_budget_ms:
+            failures.append(f"first page render took {seconds * 1000:.0f} ms, "
+                            f"budget {args.first_run_budget_ms:g} ms")
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Local stand-in for the OpenAI chat completions API.
+
+Answers ``POST /v1/chat/completions`` with deterministic questions derived
+from the prompt, after an optional artificial delay, and counts requests so
+cache hits and request coalescing can be checked via ``GET /stats``.
+Requests with ``"stream": true`` get server-sent event chunks, one word at a
+time, ``--token-delay`` seconds apart::
+
+    python tools/stub_llm_server.py --port 8799 --delay 0.5 --token-delay 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8799/v1 OPENAI_API_KEY=stub \\
+        TALENTSCOUT_LLM_QUESTIONS=1 streamlit run app.py
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_STACK_RE = re.compile(r"tech stack is: (.*?)\.")
+
+ACKNOWLEDGEMENT = "Thanks for that answer, you explained the core idea clearly and concisely."
+
+
+class StubState:
+    def __init__(self, delay: float, token_delay: float = 0.0):
+        self.delay = delay
+        self.token_delay = token_delay
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def fake_questions(prompt: str) -> str:
+    """Deterministic question list for the stack named in a generation prompt"""
+    match = _STACK_RE.search(prompt)
+    techs = match.group(1).split(", ") if match else ["your stack"]
+    return "\n".join(
+        f"{i + 1}. How would you use {techs[i % len(techs)]} to solve problem #{i + 1}?"
+        for i in range(5)
+    )
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, payload) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _write_chunk(self, data: bytes) -> None:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        def _stream(self, model: str, content: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            words = content.split(" ")
+            for i, word in enumerate(words):
+                delta = word if i == 0 else " " + word
+                event = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}],
+                }
+                self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                time.sleep(state.token_delay)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                self._send_json(200, {"requests": state.requests})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if not self.path.endswith("/chat/completions"):
+                self._send_json(404, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            with state.lock:
+                state.requests += 1
+            time.sleep(state.delay)
+
+            messages = request.get("messages", [{}])
+            prompt = messages[-1].get("content", "")
+            if "thank the candidate" in messages[0].get("content", ""):
+                content = ACKNOWLEDGEMENT
+            else:
+                content = fake_questions(prompt)
+            if request.get("stream"):
+                self._stream(request.get("model", "stub"), content)
+                return
+            self._send_json(200, {
+                "id": f"chatcmpl-stub-{state.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+
+    return Handler
+
+
+def serve(host: str = "127.0.0.1", port: int = 8799, delay: float = 0.0,
+          token_delay: float = 0.0) -> ThreadingHTTPServer:
+    """Start the stub on a background thread and return the server"""
+    server = ThreadingHTTPServer((host, port), make_handler(StubState(delay, token_delay)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stub OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed words")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubState(args.delay, args.token_delay)))
+    print(f"Stub LLM listening on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()